@@ -6,3 +6,4 @@ from .import_set import router as import_set_router
 from .report import *
 from .organization import *
 from .user import *
+from .object_cache_controller import router as object_cache_router
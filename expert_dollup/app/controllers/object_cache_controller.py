@@ -0,0 +1,20 @@
+from typing import Dict
+from fastapi import APIRouter, Depends
+from expert_dollup.app.dtos import ObjectCacheStatsDto
+from expert_dollup.infra.storages.object_cache import ObjectCache
+from expert_dollup.shared.automapping import Mapper
+from expert_dollup.shared.starlette_injection import Inject, CanPerformRequired
+
+router = APIRouter()
+
+
+@router.get("/cache/stats")
+async def get_object_cache_stats(
+    object_cache=Depends(Inject(ObjectCache)),
+    mapper=Depends(Inject(Mapper)),
+    user=Depends(CanPerformRequired(["ressource:imports"])),
+) -> Dict[str, ObjectCacheStatsDto]:
+    return {
+        namespace: mapper.map(stats, ObjectCacheStatsDto)
+        for namespace, stats in object_cache.all_stats().items()
+    }
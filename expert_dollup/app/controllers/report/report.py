@@ -43,3 +43,24 @@ async def get_project_report(
             out_dto=MinimalReportDto,
         ),
     )
+
+
+@router.get("/projects/{project_id}/report/{report_definition_id}/stream")
+async def stream_project_report(
+    project_id: UUID,
+    report_definition_id: UUID,
+    usecase: ReportUseCase = Depends(Inject(ReportUseCase)),
+    handler=Depends(Inject(RequestHandler)),
+):
+    return await handler.forward_stream(
+        usecase.stream_report,
+        dict(project_id=project_id, report_definition_id=report_definition_id),
+        MappingChain(
+            out_dto={
+                ReportStageHeader: ReportStageHeaderDto,
+                ReportRow: ReportStreamRowDto,
+                ReportStageSummary: ReportStageSummaryDto,
+                ReportStreamSummary: ReportStreamSummaryDto,
+            },
+        ),
+    )
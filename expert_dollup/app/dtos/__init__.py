@@ -91,6 +91,10 @@ from .report_dto import (
     MinimalReportStageDto,
     MinimalReportRowDto,
     ComputedValueDto,
+    ReportStageHeaderDto,
+    ReportStreamRowDto,
+    ReportStageSummaryDto,
+    ReportStreamSummaryDto,
 )
 from .report_definition_dto import (
     ReportDefinitionDto,
@@ -114,3 +118,4 @@ from .organization_dto import (
     OrganizationLimitsDto,
 )
 from .page_dto import PageDto, bind_page_dto
+from .object_cache_dto import ObjectCacheStatsDto
@@ -0,0 +1,11 @@
+from expert_dollup.shared.starlette_injection import CamelModel
+
+
+class ObjectCacheStatsDto(CamelModel):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    entries: int
+    size_bytes: int
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Literal
 from uuid import UUID
 from datetime import datetime
 from expert_dollup.shared.starlette_injection import CamelModel
@@ -60,3 +60,26 @@ class MinimalReportDto(CamelModel):
     name: str
     stages: List[MinimalReportStageDto]
     summaries: List[ComputedValueDto]
+
+
+class ReportStageHeaderDto(CamelModel):
+    kind: Literal["stage"] = "stage"
+    label: str
+    columns: List[StageColumnDto]
+
+
+class ReportStreamRowDto(MinimalReportRowDto):
+    kind: Literal["row"] = "row"
+
+
+class ReportStageSummaryDto(CamelModel):
+    kind: Literal["stageSummary"] = "stageSummary"
+    summary: ComputedValueDto
+
+
+class ReportStreamSummaryDto(CamelModel):
+    kind: Literal["report"] = "report"
+    name: str
+    datasheet_id: UUID
+    summaries: List[ComputedValueDto]
+    creation_date_utc: datetime
@@ -7,6 +7,7 @@ from expert_dollup.shared.database_services import Page
 from expert_dollup.app.dtos import *
 from expert_dollup.core.domains import *
 from expert_dollup.core.units.node_value_validation import make_schema
+from expert_dollup.infra.storages.object_cache import ObjectCacheStats
 
 primitive_with_none_union_dto_mappings = RevervibleUnionMapping(
     PrimitiveWithNoneUnionDto,
@@ -1137,6 +1138,36 @@ def map_minimal_report_row_dto(src: ReportRow, mapper: Mapper) -> MinimalReportR
     )
 
 
+def map_report_stage_header_to_dto(
+    src: ReportStageHeader, mapper: Mapper
+) -> ReportStageHeaderDto:
+    return ReportStageHeaderDto(
+        label=src.label,
+        columns=mapper.map_many(src.columns, StageColumnDto),
+    )
+
+
+def map_report_stream_row_to_dto(src: ReportRow, mapper: Mapper) -> ReportStreamRowDto:
+    return ReportStreamRowDto.construct(**dict(mapper.map(src, MinimalReportRowDto)))
+
+
+def map_report_stage_summary_to_dto(
+    src: ReportStageSummary, mapper: Mapper
+) -> ReportStageSummaryDto:
+    return ReportStageSummaryDto(summary=mapper.map(src.summary, ComputedValueDto))
+
+
+def map_report_stream_summary_to_dto(
+    src: ReportStreamSummary, mapper: Mapper
+) -> ReportStreamSummaryDto:
+    return ReportStreamSummaryDto(
+        name=src.name,
+        datasheet_id=src.datasheet_id,
+        summaries=mapper.map_many(src.summaries, ComputedValueDto),
+        creation_date_utc=src.creation_date_utc,
+    )
+
+
 def map_user_to_dto(src: User, mapper: Mapper) -> UserDto:
     return UserDto(
         oauth_id=src.oauth_id,
@@ -1228,3 +1259,17 @@ def map_new_definition_dto(src: NewDefinitionDto, mapper: Mapper) -> ProjectDefi
         name=src.name,
         properties={},
     )
+
+
+def map_object_cache_stats_to_dto(
+    src: ObjectCacheStats, mapper: Mapper
+) -> ObjectCacheStatsDto:
+    return ObjectCacheStatsDto(
+        hits=src.hits,
+        misses=src.misses,
+        evictions=src.evictions,
+        expirations=src.expirations,
+        invalidations=src.invalidations,
+        entries=src.entries,
+        size_bytes=src.size_bytes,
+    )
@@ -1,10 +1,34 @@
 import expert_dollup.core.usecases as usecases
 import expert_dollup.core.units as units
 import expert_dollup.core.builders as builders
+from expert_dollup.core.logits import FormulaCompiler, UnitDependencyIndexCache
+from expert_dollup.core.units.report_plan import ReportPlanCache
+from expert_dollup.core.units.report_linking import ReportLinkingCache
+from expert_dollup.core.units.report_refresh_scheduler import ReportRefreshScheduler
+from expert_dollup.core.units.single_flight import SingleFlight, FileLease
+from expert_dollup.app.settings import get_config
 from expert_dollup.shared.starlette_injection import *
 
 
 def bind_core_modules(builder: InjectorBuilder) -> None:
+    builder.add_singleton(FormulaCompiler, FormulaCompiler)
+    builder.add_singleton(UnitDependencyIndexCache, UnitDependencyIndexCache)
+    builder.add_singleton(ReportPlanCache, ReportPlanCache)
+    builder.add_singleton(ReportLinkingCache, ReportLinkingCache)
+    builder.add_singleton(
+        ReportRefreshScheduler,
+        ReportRefreshScheduler,
+        **get_annotations(ReportRefreshScheduler),
+    )
+
+    cache_lock_directory = get_config("CACHE_LOCK_DIRECTORY", required=False)
+    builder.add_singleton(
+        SingleFlight,
+        lambda: SingleFlight(
+            None if cache_lock_directory is None else FileLease(cache_lock_directory)
+        ),
+    )
+
     for class_type in [
         *get_classes(builders),
         *get_classes(units),
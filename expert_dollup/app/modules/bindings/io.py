@@ -13,8 +13,10 @@ from expert_dollup.infra.ressource_engine import RessourceEngine
 from expert_dollup.core.utils import authorization_factory
 from expert_dollup.core.domains import *
 from expert_dollup.core.exceptions import RessourceNotFound
-from expert_dollup.app.settings import load_app_settings
+from expert_dollup.app.settings import load_app_settings, get_config
 import expert_dollup.infra.storages as storages
+from expert_dollup.infra.storages.memory_cached_storage import MemoryCachedStorage
+from expert_dollup.infra.storages.object_cache import ObjectCache
 from expert_dollup.infra.repositories import *
 from expert_dollup.core.repositories import *
 from ..definitions import auth_metadatas, expert_dollup_metadatas, paginations
@@ -39,7 +41,10 @@ def bind_ressource_engines(builder: InjectorBuilder) -> None:
 
 
 def bind_database_expert_dollup(builder: InjectorBuilder) -> None:
-    expert_dollup_db = create_connection(environ["EXPERT_DOLLUP_DB_URL"])
+    expert_dollup_db = create_connection(
+        environ["EXPERT_DOLLUP_DB_URL"],
+        copy_threshold=get_config("DB_COPY_THRESHOLD", int, default="1000"),
+    )
     expert_dollup_db.load_metadatas(expert_dollup_metadatas)
     builder.add_object(ExpertDollupDatabase, expert_dollup_db)
 
@@ -180,6 +185,29 @@ def bind_storages(builder: InjectorBuilder) -> None:
         core_class_type = get_base(class_type)
         builder.add_factory(core_class_type, class_type, **get_annotations(class_type))
 
+    builder.add_singleton(
+        ObjectCache,
+        lambda: ObjectCache(
+            max_bytes=int(
+                get_config("OBJECT_CACHE_MAX_BYTES", default=str(256 * 1024 * 1024))
+            ),
+            ttl_seconds=float(get_config("OBJECT_CACHE_TTL_SECONDS", default="60")),
+        ),
+    )
+
+    for class_type, namespace in [
+        (storages.StagedFormulaCache, "staged_formulas"),
+        (storages.ReportDefinitionRowCacheCloudObject, "report_rows"),
+    ]:
+        builder.add_factory(class_type, class_type, **get_annotations(class_type))
+        builder.add_singleton(
+            get_base(class_type),
+            MemoryCachedStorage,
+            storage=class_type,
+            object_cache=ObjectCache,
+            namespace=InjectorBuilder.forward(namespace),
+        )
+
 
 def bind_providers(builder: InjectorBuilder) -> None:
     with open("./assets/corncob_lowercase.txt") as f:
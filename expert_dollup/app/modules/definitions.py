@@ -15,6 +15,7 @@ expert_dollup_metadatas = [
     RepositoryMetadata(dao=DistributableItemDao, domain=DistributableItem),
     RepositoryMetadata(dao=ProjectDefinitionFormulaDao, domain=Formula),
     RepositoryMetadata(dao=MeasureUnitDao, domain=MeasureUnit),
+    RepositoryMetadata(dao=DataRevisionDao, domain=DataRevision),
     RepositoryMetadata(dao=ProjectDefinitionNodeDao, domain=ProjectDefinitionNode),
     RepositoryMetadata(
         dao=Union[ProjectDefinitionNodeDao, ProjectDefinitionFormulaDao],
@@ -35,7 +35,7 @@ def get_config(
 
         return None
 
-    return decoder(environ[name])
+    return decoder(value)
 
 
 def load_app_settings() -> AppSettings:
@@ -1,5 +1,5 @@
-from typing import List, Dict
-from uuid import UUID, uuid4
+from typing import List, Dict, AsyncIterator
+from uuid import UUID, uuid4, uuid5
 from collections import defaultdict, OrderedDict
 from expert_dollup.core.utils.ressource_permissions import authorization_factory
 from expert_dollup.shared.starlette_injection import Clock
@@ -106,42 +106,37 @@ class ProjectBuilder:
         )
 
         ressource = authorization_factory.allow_access_to(cloned_project, user)
-        cloned_nodes = await self._clone_project_nodes(
-            project_details.id, cloned_project
-        )
-
         cloned_metas = await self._clone_metas(project_details.id, cloned_project)
 
         return Project(
             details=cloned_project,
-            nodes=cloned_nodes,
+            nodes=[],
             metas=cloned_metas,
             ressource=ressource,
         )
 
-    async def _clone_project_nodes(
+    async def clone_project_nodes(
         self, project_id: UUID, cloned_project: ProjectDetails
-    ) -> List[ProjectNode]:
-        original_nodes = await self.project_node_service.find_by(
-            ProjectNodeFilter(project_id=project_id)
-        )
+    ) -> AsyncIterator[List[ProjectNode]]:
+        def map_id(node_id: UUID) -> UUID:
+            return uuid5(cloned_project.id, str(node_id))
 
-        id_mapping: Dict[UUID, UUID] = defaultdict(uuid4)
-        cloned_nodes = [
-            ProjectNode(
-                id=id_mapping[node.id],
-                project_id=cloned_project.id,
-                type_id=node.type_id,
-                type_name=node.type_name,
-                type_path=node.type_path,
-                path=[id_mapping[node_id] for node_id in node.path],
-                value=node.value,
-                label=node.label,
-            )
-            for node in original_nodes
-        ]
-
-        return cloned_nodes
+        async for original_nodes in self.project_node_service.stream_by(
+            ProjectNodeFilter(project_id=project_id)
+        ):
+            yield [
+                ProjectNode(
+                    id=map_id(node.id),
+                    project_id=cloned_project.id,
+                    type_id=node.type_id,
+                    type_name=node.type_name,
+                    type_path=node.type_path,
+                    path=[map_id(node_id) for node_id in node.path],
+                    value=node.value,
+                    label=node.label,
+                )
+                for node in original_nodes
+            ]
 
     async def _clone_metas(
         self, project_id: UUID, cloned_project: ProjectDetails
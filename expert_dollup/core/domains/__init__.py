@@ -68,6 +68,7 @@ from .formula import (
     UnitInstance,
     UnitInstanceCacheKey,
     UnitInstanceCache,
+    UnitInstanceView,
     FormulaFilter,
     FormulaPluckFilter,
     FormulaCachePluckFilter,
@@ -136,8 +137,13 @@ from .report import (
     Report,
     ReportKey,
     ComputedValue,
+    ReportStageHeader,
+    ReportStageSummary,
+    ReportStreamSummary,
+    ReportStreamItem,
 )
 from .measure_unit import MeasureUnit
+from .data_revision import DataRevision
 from .values_union import (
     PrimitiveUnion,
     PrimitiveWithNoneUnion,
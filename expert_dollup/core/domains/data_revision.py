@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+
+@dataclass
+class DataRevision:
+    id: str
+    revision: UUID
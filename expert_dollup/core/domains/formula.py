@@ -1,8 +1,19 @@
+import sys
+from array import array
 from decimal import Decimal
 from uuid import UUID
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
-from typing import List, Optional, Dict, Union
+from typing import (
+    List,
+    Optional,
+    Dict,
+    Union,
+    Iterable,
+    Iterator,
+    Any,
+    Tuple,
+)
 from expert_dollup.shared.database_services import QueryFilter
 from .values_union import PrimitiveWithNoneUnion
 
@@ -98,7 +109,7 @@ class UnitInstance:
     node_id: UUID
     path: List[UUID]
     name: str
-    calculation_details: str
+    calculation_details: Optional[str]
     result: PrimitiveWithNoneUnion
 
     @property
@@ -115,7 +126,206 @@ class UnitInstanceElement:
     datasheet_element_reference: UUID
 
 
-UnitInstanceCache = List[UnitInstance]
+NULL_UUID_BYTES = bytes(16)
+
+
+class UnitInstanceView:
+    __slots__ = ("_cache", "_index")
+
+    def __init__(self, cache: "UnitInstanceCache", index: int):
+        self._cache = cache
+        self._index = index
+
+    @property
+    def formula_id(self) -> Optional[UUID]:
+        return self._cache.get_formula_id(self._index)
+
+    @property
+    def node_id(self) -> UUID:
+        return self._cache.get_node_id(self._index)
+
+    @property
+    def path(self) -> List[UUID]:
+        return self._cache.get_path(self._index)
+
+    @property
+    def name(self) -> str:
+        return self._cache.get_name(self._index)
+
+    @property
+    def calculation_details(self) -> Optional[str]:
+        return self._cache.get_calculation_details(self._index)
+
+    @property
+    def result(self) -> PrimitiveWithNoneUnion:
+        return self._cache.results[self._index]
+
+    @property
+    def report_dict(self) -> dict:
+        return self.materialize().report_dict
+
+    def materialize(self) -> UnitInstance:
+        return UnitInstance(
+            formula_id=self.formula_id,
+            node_id=self.node_id,
+            path=self.path,
+            name=self.name,
+            calculation_details=self.calculation_details,
+            result=self.result,
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (UnitInstance, UnitInstanceView)):
+            return self.materialize() == other
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+
+class UnitInstanceCache:
+    def __init__(self, unit_instances: Iterable[UnitInstance] = ()):
+        self._formula_ids = bytearray()
+        self._node_ids = bytearray()
+        self._path_ids = bytearray()
+        self._path_offsets = array("Q", [0])
+        self._name_indexes = array("L")
+        self._names: List[str] = []
+        self._name_index_by_name: Dict[str, int] = {}
+        self._calculation_details: List[Optional[str]] = []
+        self.results: List[PrimitiveWithNoneUnion] = []
+        self.extend(unit_instances)
+
+    def append(self, unit_instance: Union[UnitInstance, UnitInstanceView]) -> None:
+        formula_id = unit_instance.formula_id
+        self.append_packed(
+            NULL_UUID_BYTES if formula_id is None else formula_id.bytes,
+            unit_instance.node_id.bytes,
+            b"".join(item.bytes for item in unit_instance.path),
+            unit_instance.name,
+            unit_instance.calculation_details,
+            unit_instance.result,
+        )
+
+    def append_packed(
+        self,
+        formula_id: bytes,
+        node_id: bytes,
+        path_ids: bytes,
+        name: str,
+        calculation_details: Optional[str],
+        result: PrimitiveWithNoneUnion,
+    ) -> None:
+        self._formula_ids += formula_id
+        self._node_ids += node_id
+        self._path_ids += path_ids
+        self._path_offsets.append(len(self._path_ids) // 16)
+        self._name_indexes.append(self._intern_name(name))
+        self._calculation_details.append(calculation_details)
+        self.results.append(result)
+
+    def extend(
+        self, unit_instances: Iterable[Union[UnitInstance, UnitInstanceView]]
+    ) -> None:
+        for unit_instance in unit_instances:
+            self.append(unit_instance)
+
+    def get_formula_id(self, index: int) -> Optional[UUID]:
+        offset = index * 16
+        formula_id = bytes(self._formula_ids[offset : offset + 16])
+
+        if formula_id == NULL_UUID_BYTES:
+            return None
+
+        return UUID(bytes=formula_id)
+
+    def has_formula(self, index: int) -> bool:
+        offset = index * 16
+        return self._formula_ids[offset : offset + 16] != NULL_UUID_BYTES
+
+    def get_node_id(self, index: int) -> UUID:
+        offset = index * 16
+        return UUID(bytes=bytes(self._node_ids[offset : offset + 16]))
+
+    def get_path(self, index: int) -> List[UUID]:
+        path_ids = self._path_ids
+        return [
+            UUID(bytes=bytes(path_ids[offset * 16 : offset * 16 + 16]))
+            for offset in range(
+                self._path_offsets[index], self._path_offsets[index + 1]
+            )
+        ]
+
+    def get_packed_ids(self, index: int) -> Tuple[bytes, bytes, bytes]:
+        offset = index * 16
+        return (
+            bytes(self._formula_ids[offset : offset + 16]),
+            bytes(self._node_ids[offset : offset + 16]),
+            bytes(
+                self._path_ids[
+                    self._path_offsets[index] * 16 : self._path_offsets[index + 1] * 16
+                ]
+            ),
+        )
+
+    def get_name(self, index: int) -> str:
+        return self._names[self._name_indexes[index]]
+
+    def get_calculation_details(self, index: int) -> Optional[str]:
+        return self._calculation_details[index]
+
+    def set_result(
+        self,
+        index: int,
+        result: PrimitiveWithNoneUnion,
+        calculation_details: Optional[str],
+    ) -> None:
+        self.results[index] = result
+        self._calculation_details[index] = calculation_details
+
+    def view(self, index: int) -> UnitInstanceView:
+        return UnitInstanceView(self, index)
+
+    def materialize(self) -> List[UnitInstance]:
+        return [view.materialize() for view in self]
+
+    def _intern_name(self, name: str) -> int:
+        name_index = self._name_index_by_name.get(name)
+
+        if name_index is None:
+            name_index = len(self._names)
+            self._names.append(sys.intern(name))
+            self._name_index_by_name[name] = name_index
+
+        return name_index
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, index: int) -> UnitInstanceView:
+        if index < 0:
+            index = index + len(self)
+
+        if index < 0 or index >= len(self):
+            raise IndexError(index)
+
+        return UnitInstanceView(self, index)
+
+    def __iter__(self) -> Iterator[UnitInstanceView]:
+        for index in range(len(self)):
+            yield UnitInstanceView(self, index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (UnitInstanceCache, list, tuple)):
+            return len(self) == len(other) and all(
+                view == unit_instance for view, unit_instance in zip(self, other)
+            )
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"UnitInstanceCache({self.materialize()!r})"
 
 
 @dataclass
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from expert_dollup.shared.database_services import QueryFilter
 from .report_definition import ReportRowDict
@@ -56,6 +56,31 @@ class Report:
     stages: List[ReportStage]
     summaries: List[ComputedValue]
     creation_date_utc: datetime
+    revision: Optional[str] = None
+
+
+@dataclass
+class ReportStageHeader:
+    label: str
+    columns: List[StageColumn]
+
+
+@dataclass
+class ReportStageSummary:
+    summary: ComputedValue
+
+
+@dataclass
+class ReportStreamSummary:
+    name: str
+    datasheet_id: UUID
+    summaries: List[ComputedValue]
+    creation_date_utc: datetime
+
+
+ReportStreamItem = Union[
+    ReportStageHeader, ReportRow, ReportStageSummary, ReportStreamSummary
+]
 
 
 @dataclass
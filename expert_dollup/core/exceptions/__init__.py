@@ -3,6 +3,7 @@ from .invalid_object import InvalidObject
 from .validation_error import ValidationError
 from .factory_seed_missing import FactorySeedMissing
 from .invalid_usage_error import InvalidUsageError
+from .formula_cycle_error import FormulaCycleError
 
 
 from expert_dollup.shared.starlette_injection import DetailedError
@@ -0,0 +1,9 @@
+from typing import List
+
+
+class FormulaCycleError(Exception):
+    def __init__(self, formula_names: List[str]):
+        Exception.__init__(
+            self, f"Formula dependency cycle detected: {' -> '.join(formula_names)}"
+        )
+        self.formula_names = formula_names
@@ -1,5 +1,7 @@
 from .formula_visitor import FormulaVisitor
-from .formula_processor import serialize_post_processed_expression
+from .formula_processor import serialize_post_processed_expression, CompiledFormula
+from .formula_compiler import FormulaCompiler
+from .formula_scheduler import FormulaScheduler
 from .formula_injector import (
     FormulaInjector,
     FieldUnit,
@@ -7,3 +9,4 @@ from .formula_injector import (
     FrozenUnit,
     UnitRef,
 )
+from .unit_dependency_index import UnitDependencyIndex, UnitDependencyIndexCache
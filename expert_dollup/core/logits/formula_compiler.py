@@ -0,0 +1,31 @@
+from typing import Dict, Tuple, Iterable, OrderedDict
+from uuid import UUID
+from expert_dollup.core.domains import StagedFormula
+from .formula_processor import CompiledFormula, compile_flat_ast
+
+
+class FormulaCompiler:
+    def __init__(self, max_size: int = 20000):
+        self.max_size = max_size
+        self._compiled_by_id: OrderedDict[
+            UUID, Tuple[str, CompiledFormula]
+        ] = OrderedDict()
+
+    def compile(self, formula: StagedFormula) -> CompiledFormula:
+        entry = self._compiled_by_id.get(formula.id)
+
+        if entry is None or entry[0] != formula.expression:
+            entry = (formula.expression, compile_flat_ast(formula.final_ast))
+            self._compiled_by_id[formula.id] = entry
+
+        self._compiled_by_id.move_to_end(formula.id)
+
+        while len(self._compiled_by_id) > self.max_size:
+            self._compiled_by_id.popitem(last=False)
+
+        return entry[1]
+
+    def compile_many(
+        self, formulas: Iterable[StagedFormula]
+    ) -> Dict[UUID, CompiledFormula]:
+        return {formula.id: self.compile(formula) for formula in formulas}
@@ -1,5 +1,6 @@
+import sys
 from decimal import Decimal
-from typing import List, Dict, Protocol, Iterable, Optional
+from typing import List, Dict, Protocol, Iterable, Optional, Tuple
 from uuid import UUID
 from collections import defaultdict
 from dataclasses import dataclass
@@ -7,6 +8,7 @@ from functools import cached_property
 from expert_dollup.core.domains.project_node import ProjectNode
 from expert_dollup.core.domains import UnitInstance, PrimitiveWithNoneUnion, ProjectNode
 import expert_dollup.core.logits.formula_processor as formula_processor
+from .formula_scheduler import FormulaScheduler
 
 
 @dataclass
@@ -38,6 +40,16 @@ class UnitLike(Protocol):
         pass
 
 
+def as_uuid(value) -> UUID:
+    if isinstance(value, UUID):
+        return value
+
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return value
+
+
 def wrap_units(units: List[UnitLike]):
     return [
         formula_processor.ComputationUnit(
@@ -48,25 +60,75 @@ def wrap_units(units: List[UnitLike]):
 
 
 class FormulaInjector:
-    def __init__(self):
-        self.unit_map: Dict[str, List[UnitLike]] = defaultdict(list)
+    def __init__(self, trace_details: bool = True):
+        self.trace_details = trace_details
+        self.units_by_scope: Dict[Tuple[UUID, str], List[UnitLike]] = defaultdict(list)
+        self.units_by_name: Dict[str, List[UnitLike]] = defaultdict(list)
         self.units: List[UnitLike] = []
+        self.formula_units_by_dependency: Dict[
+            str, List["FormulaUnit"]
+        ] = defaultdict(list)
+        self._resolved_units: Dict[Tuple[UUID, str], List[UnitLike]] = {}
 
     def precompute(self) -> None:
-        for unit in self.units:
-            unit.computed
+        for level in self.schedule():
+            for unit in level:
+                unit.computed
+
+    def schedule(
+        self, units: Optional[Iterable["FormulaUnit"]] = None
+    ) -> List[List["FormulaUnit"]]:
+        if units is None:
+            units = (unit for unit in self.units if isinstance(unit, FormulaUnit))
+
+        return FormulaScheduler(units, self.get_unit_dependencies).build_levels()
+
+    def get_unit_dependencies(self, unit: "FormulaUnit") -> Iterable[UnitLike]:
+        for name in unit.dependencies:
+            yield from self.get_unit(unit.node_id, unit.path, name)
+
+    def find_dependents(self, units: Iterable[UnitLike]) -> List["FormulaUnit"]:
+        formula_units_by_dependency = self.formula_units_by_dependency
+        dependents: Dict[int, FormulaUnit] = {}
+        pending = list(units)
+
+        while len(pending) > 0:
+            unit = pending.pop()
+
+            for candidate in formula_units_by_dependency.get(unit.name, []):
+                if id(candidate) in dependents:
+                    continue
+
+                if any(
+                    dependency is unit
+                    for dependency in self.get_unit(
+                        candidate.node_id, candidate.path, unit.name
+                    )
+                ):
+                    dependents[id(candidate)] = candidate
+                    pending.append(candidate)
+
+        return list(dependents.values())
 
     @property
     def unit_instances(self) -> List[UnitInstance]:
         return [unit.computed for unit in self.units]
 
     def add_unit(self, unit: UnitLike) -> None:
+        name = sys.intern(unit.name)
+
         for item in unit.path:
-            self.unit_map[f"{item}.{unit.name}"].append(unit)
+            self.units_by_scope[(as_uuid(item), name)].append(unit)
 
-        self.unit_map[unit.name].append(unit)
-        self.unit_map[f"{unit.node_id}.{unit.name}"].append(unit)
+        self.units_by_name[name].append(unit)
+        self.units_by_scope[(as_uuid(unit.node_id), name)].append(unit)
         self.units.append(unit)
+        self._resolved_units.clear()
+
+        if isinstance(unit, FormulaUnit):
+            for dependency in unit.dependencies:
+                dependency = sys.intern(dependency)
+                self.formula_units_by_dependency[dependency].append(unit)
 
     def add_units(self, units: Iterable[UnitLike]) -> "FormulaInjector":
         for unit in units:
@@ -75,27 +137,37 @@ class FormulaInjector:
         return self
 
     def get_unit(self, node_id: UUID, path: List[UUID], name: str) -> List[UnitLike]:
-        unit_id = f"{node_id}.{name}"
+        if not isinstance(node_id, UUID):
+            node_id = as_uuid(node_id)
 
-        if unit_id in self.unit_map:
-            return self.unit_map[unit_id]
+        key = (node_id, name)
+        units = self._resolved_units.get(key)
 
-        for id in reversed(path):
-            unit_id = f"{id}.{name}"
+        if units is None:
+            units = self._resolve_unit(node_id, path, name)
+            self._resolved_units[key] = units
 
-            if unit_id in self.unit_map:
-                return self.unit_map[unit_id]
+        return units
 
-        if name in self.unit_map:
-            return self.unit_map[name]
+    def _resolve_unit(
+        self, node_id: UUID, path: List[UUID], name: str
+    ) -> List[UnitLike]:
+        units_by_scope = self.units_by_scope
+        units = units_by_scope.get((node_id, name))
 
-        return []
+        if not units is None:
+            return units
 
-    def get_unit_by_name(self, name: str):
-        if name in self.unit_map:
-            return self.unit_map[name]
+        for id in reversed(path):
+            units = units_by_scope.get((as_uuid(id), name))
+
+            if not units is None:
+                return units
 
-        return []
+        return self.units_by_name.get(name, [])
+
+    def get_unit_by_name(self, name: str):
+        return self.units_by_name.get(name, [])
 
     def get_one_value(self, node_id: UUID, path: List[UUID], name: str, default):
         units = self.get_unit(node_id, path, name)
@@ -151,12 +223,12 @@ class FormulaUnit:
         self,
         formula_instance: UnitInstance,
         formula_dependencies: List[str],
-        final_ast: dict,
+        compiled_formula: formula_processor.CompiledFormula,
         formula_injector: FormulaInjector,
     ):
         self._formula_instance = formula_instance
         self._formula_dependencies = formula_dependencies
-        self._final_ast = final_ast
+        self._compiled_formula = compiled_formula
         self._formula_injector = formula_injector
         self._touched: bool = False
 
@@ -182,21 +254,31 @@ class FormulaUnit:
 
     @cached_property
     def computed(self) -> UnitInstance:
-        result, calculation_details = formula_processor.compute(
-            self._final_ast,
-            formula_processor.ComputationUnit(
-                name=self.name,
-                node_id=self.node_id,
-                value=None,
-                units={
-                    name: wrap_units(
-                        self._formula_injector.get_unit(self.node_id, self.path, name)
-                    )
-                    for name in self.dependencies
-                },
-            ),
+        computation_unit = formula_processor.ComputationUnit(
+            name=self.name,
+            node_id=self.node_id,
+            value=None,
+            units={
+                name: wrap_units(
+                    self._formula_injector.get_unit(self.node_id, self.path, name)
+                )
+                for name in self.dependencies
+            },
         )
 
+        if not self._formula_injector.trace_details:
+            result = self._compiled_formula.evaluate(computation_unit)
+
+            if result != self._formula_instance.result:
+                self._formula_instance.result = result
+                self._touched = True
+
+            self._formula_instance.calculation_details = None
+
+            return self._formula_instance
+
+        result, calculation_details = self._compiled_formula(computation_unit)
+
         if result != self._formula_instance.result:
             self._formula_instance.result = result
             self._touched = True
@@ -207,6 +289,9 @@ class FormulaUnit:
 
         return self._formula_instance
 
+    def mark_computed(self) -> None:
+        self.__dict__["computed"] = self._formula_instance
+
     @property
     def touched(self) -> bool:
         if not self._touched:
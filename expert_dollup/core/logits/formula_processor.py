@@ -1,13 +1,14 @@
 import ast
 from uuid import UUID
 from ast import AST
-from typing import Callable, Dict, Union, List, Any, Tuple
+from typing import Callable, Dict, Union, List, Any, Tuple, Optional
 from expert_dollup.core.domains import (
     AstNode,
     AstNodeValue,
     FlatAst,
     PrimitiveWithNoneUnion,
 )
+import operator
 from decimal import Decimal
 from dataclasses import dataclass
 
@@ -202,20 +203,66 @@ class Calculation:
         self.details = f"{self.details}\n{temp_name} = {details}"
 
 
-@dataclass
-class ComputationScope:
-    unit: ComputationUnit
-    calc: Calculation
-    nodes: List[dict]
+Result = Tuple[Any, str]
+CompiledNode = Callable[[ComputationUnit, Calculation], Result]
+EvaluatedNode = Callable[[ComputationUnit], Any]
 
-    def get_property(self, node: dict, name: str) -> dict:
-        return self.nodes[node["properties"][name]]
 
-    def get_children(self, node, name) -> list:
-        return [self.nodes[c] for c in node["children"][name]]
+class FlatAstCompiler:
+    def __init__(self, nodes: List[dict], trace: bool = True):
+        self.nodes = nodes
+        self.trace = trace
 
+    def compile(self, node: dict) -> Union[CompiledNode, EvaluatedNode]:
+        compile_node = AST_NODE_COMPILER.get(node["kind"])
 
-Result = Tuple[Any, str]
+        if compile_node is None:
+            raise Exception(f"Unsupported node {node['kind']}")
+
+        return compile_node(node, self)
+
+    def compile_property(
+        self, node: dict, name: str
+    ) -> Union[CompiledNode, EvaluatedNode]:
+        return self.compile(self.nodes[node["properties"][name]])
+
+    def compile_children(
+        self, node: dict, name: str
+    ) -> List[Union[CompiledNode, EvaluatedNode]]:
+        return [self.compile(self.nodes[c]) for c in node["children"][name]]
+
+
+class CompiledFormula:
+    def __init__(self, nodes: List[dict], root: dict):
+        self.nodes = nodes
+        self.root_node = root
+        self._root: Optional[CompiledNode] = None
+        self._evaluate_root: Optional[EvaluatedNode] = None
+
+    @property
+    def root(self) -> CompiledNode:
+        if self._root is None:
+            self._root = FlatAstCompiler(self.nodes).compile(self.root_node)
+
+        return self._root
+
+    @property
+    def evaluate_root(self) -> EvaluatedNode:
+        if self._evaluate_root is None:
+            self._evaluate_root = FlatAstCompiler(self.nodes, trace=False).compile(
+                self.root_node
+            )
+
+        return self._evaluate_root
+
+    def __call__(self, unit: ComputationUnit) -> Result:
+        calc = Calculation()
+        result, details = self.root(unit, calc)
+        calc.add_final(result, details)
+        return result, calc.details
+
+    def evaluate(self, unit: ComputationUnit) -> Any:
+        return self.evaluate_root(unit)
 
 
 def coerce_decimal(value: PrimitiveWithNoneUnion) -> Decimal:
@@ -231,49 +278,45 @@ def coerce_decimal(value: PrimitiveWithNoneUnion) -> Decimal:
     return value
 
 
-def process_module_node(node: dict, scope: ComputationScope):
-    return dispatch(scope.get_property(node, "body"), scope)
+def compile_module_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
+    return compiler.compile_property(node, "body")
 
 
-def process_expr_node(node: dict, scope: ComputationScope):
-    return dispatch(scope.get_property(node, "value"), scope)
+def compile_expr_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
+    return compiler.compile_property(node, "value")
 
 
-def process_name_node(node: dict, scope: ComputationScope):
+def compile_name_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
     name = node["values"]["id"]
-    assert (
-        name in scope.unit.units
-    ), f"{name} not part of formula {scope.unit.name} which contains {scope.unit.units.keys()}"
-    values = scope.unit.units[name]
 
-    if len(values) == 1:
-        return values[0].value, f"<{name}[{values[0].node_id}], {values[0].value}>"
+    def get_values(unit: ComputationUnit) -> List[ComputationUnit]:
+        assert (
+            name in unit.units
+        ), f"{name} not part of formula {unit.name} which contains {unit.units.keys()}"
+        return unit.units[name]
 
-    sum_result = sum(coerce_decimal(unit.value) for unit in scope.unit.units[name])
+    def evaluate_name(unit: ComputationUnit, calc: Calculation) -> Result:
+        values = get_values(unit)
 
-    return sum_result, scope.calc.add(sum_result, f"sum({name})")
+        if len(values) == 1:
+            return values[0].value, f"<{name}[{values[0].node_id}], {values[0].value}>"
 
+        sum_result = sum(coerce_decimal(value.value) for value in values)
 
-def process_constant_node(node: dict, scope: ComputationScope):
-    value = node["values"]["value"]
-    text = value["text"]
-    enabled = value["enabled"]
-    numeric = value["number"]
+        return sum_result, calc.add(sum_result, f"sum({name})")
 
-    if not numeric is None:
-        real_value = Decimal(numeric)
-    elif not enabled is None:
-        real_value = enabled
-    elif not text is None:
-        real_value = text
-    else:
-        raise Exception("None is not supproted")
+    def evaluate_name_value(unit: ComputationUnit) -> Any:
+        values = get_values(unit)
+
+        if len(values) == 1:
+            return values[0].value
+
+        return sum(coerce_decimal(value.value) for value in values)
 
-    return real_value, f"{real_value}"
+    return evaluate_name if compiler.trace else evaluate_name_value
 
 
-def process_num_node(node: dict, scope: ComputationScope):
-    value = node["values"]["n"]
+def compile_literal(value: dict, compiler: FlatAstCompiler) -> CompiledNode:
     text = value["text"]
     enabled = value["enabled"]
     numeric = value["number"]
@@ -287,25 +330,27 @@ def process_num_node(node: dict, scope: ComputationScope):
     else:
         raise Exception("None is not supproted")
 
-    return real_value, f"{real_value}"
+    details = f"{real_value}"
 
+    def evaluate_literal(unit: ComputationUnit, calc: Calculation) -> Result:
+        return real_value, details
 
-def process_str_node(node: dict, scope: ComputationScope):
-    value = node["values"]["a"]
-    text = value["text"]
-    enabled = value["enabled"]
-    numeric = value["number"]
+    def evaluate_literal_value(unit: ComputationUnit) -> Any:
+        return real_value
 
-    if not numeric is None:
-        real_value = Decimal(numeric)
-    elif not enabled is None:
-        real_value = enabled
-    elif not text is None:
-        real_value = text
-    else:
-        raise Exception("None is not supproted")
+    return evaluate_literal if compiler.trace else evaluate_literal_value
 
-    return real_value, f"{real_value}"
+
+def compile_constant_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
+    return compile_literal(node["values"]["value"], compiler)
+
+
+def compile_num_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
+    return compile_literal(node["values"]["n"], compiler)
+
+
+def compile_str_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
+    return compile_literal(node["values"]["s"], compiler)
 
 
 UNARY_OP_DISPATCH = {
@@ -314,17 +359,30 @@ UNARY_OP_DISPATCH = {
     "Not": lambda operand, operand_details: (not operand, f"!{operand_details}"),
 }
 
+UNARY_OP_VALUE_DISPATCH = {
+    "UAdd": operator.pos,
+    "USub": operator.neg,
+    "Not": operator.not_,
+}
+
 
-def process_unary_op_node(node: dict, scope: ComputationScope):
-    operand, operand_details = dispatch(scope.get_property(node, "operand"), scope)
-    op = node["values"]["op"]
-    compute = UNARY_OP_DISPATCH.get(op)
+def compile_unary_op_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
+    compute_operand = compiler.compile_property(node, "operand")
+    compute = UNARY_OP_DISPATCH.get(node["values"]["op"])
+    compute_value = UNARY_OP_VALUE_DISPATCH.get(node["values"]["op"])
 
     if compute is None:
         raise Exception("Unsupported unary op")
 
-    result, details = compute(operand, operand_details)
-    return result, scope.calc.add(result, details)
+    def evaluate_unary_op(unit: ComputationUnit, calc: Calculation) -> Result:
+        operand, operand_details = compute_operand(unit, calc)
+        result, details = compute(operand, operand_details)
+        return result, calc.add(result, details)
+
+    def evaluate_unary_op_value(unit: ComputationUnit) -> Any:
+        return compute_value(compute_operand(unit))
+
+    return evaluate_unary_op if compiler.trace else evaluate_unary_op_value
 
 
 BiNARY_OP_DISPATCH = {
@@ -346,19 +404,34 @@ BiNARY_OP_DISPATCH = {
     ),
 }
 
+BINARY_OP_VALUE_DISPATCH = {
+    "Add": operator.add,
+    "Sub": operator.sub,
+    "Mult": operator.mul,
+    "Div": lambda left, right: safe_div(left, right),
+}
 
-def process_bin_op_node(node: dict, scope: ComputationScope):
-    left, left_details = dispatch(scope.get_property(node, "left"), scope)
-    right, right_details = dispatch(scope.get_property(node, "right"), scope)
-    op = node["values"]["op"]
-    compute = BiNARY_OP_DISPATCH.get(op)
+
+def compile_bin_op_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
+    compute_left = compiler.compile_property(node, "left")
+    compute_right = compiler.compile_property(node, "right")
+    compute = BiNARY_OP_DISPATCH.get(node["values"]["op"])
+    compute_value = BINARY_OP_VALUE_DISPATCH.get(node["values"]["op"])
 
     if compute is None:
         raise Exception("Unsupported binary op")
 
-    result, details = compute(left, left_details, right, right_details)
+    def evaluate_bin_op(unit: ComputationUnit, calc: Calculation) -> Result:
+        left, left_details = compute_left(unit, calc)
+        right, right_details = compute_right(unit, calc)
+        result, details = compute(left, left_details, right, right_details)
+
+        return result, calc.add(result, details)
+
+    def evaluate_bin_op_value(unit: ComputationUnit) -> Any:
+        return compute_value(compute_left(unit), compute_right(unit))
 
-    return result, scope.calc.add(result, details)
+    return evaluate_bin_op if compiler.trace else evaluate_bin_op_value
 
 
 COMPARATOR_DISPATCH = {
@@ -389,25 +462,59 @@ COMPARATOR_DISPATCH = {
 }
 
 
-def process_compare_node(node: dict, scope: ComputationScope):
-    left, left_details = dispatch(scope.get_property(node, "left"), scope)
-    result = left
-    details = f"{left_details}"
-    ops = node["values"]["ops"].split()
+COMPARATOR_VALUE_DISPATCH = {
+    "Eq": operator.eq,
+    "NotEq": operator.ne,
+    "Lt": operator.lt,
+    "LtE": operator.lt,
+    "Gt": operator.gt,
+    "GtE": operator.ge,
+}
+
 
-    for comparator, op in zip(scope.get_children(node, "comparators"), ops):
-        right, right_details = dispatch(comparator, scope)
+def compile_compare_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
+    compute_left = compiler.compile_property(node, "left")
+    comparisons = []
+
+    for compute_right, op in zip(
+        compiler.compile_children(node, "comparators"), node["values"]["ops"].split()
+    ):
         compute = COMPARATOR_DISPATCH.get(op)
 
         if compute is None:
             raise Exception("Unssuported comparator")
 
-        result, details = compute(left, details, right, right_details)
-        left = right
+        if not compiler.trace:
+            compute = COMPARATOR_VALUE_DISPATCH[op]
+
+        comparisons.append((compute_right, compute))
+
+    def evaluate_compare(unit: ComputationUnit, calc: Calculation) -> Result:
+        left, left_details = compute_left(unit, calc)
+        result = left
+        details = f"{left_details}"
+
+        for compute_right, compute in comparisons:
+            right, right_details = compute_right(unit, calc)
+            result, details = compute(left, details, right, right_details)
+            left = right
 
-    result = Decimal(1 if result else 0)
+        result = Decimal(1 if result else 0)
 
-    return result, scope.calc.add(result, details)
+        return result, calc.add(result, details)
+
+    def evaluate_compare_value(unit: ComputationUnit) -> Any:
+        left = compute_left(unit)
+        result = left
+
+        for compute_right, compute in comparisons:
+            right = compute_right(unit)
+            result = compute(left, right)
+            left = right
+
+        return Decimal(1 if result else 0)
+
+    return evaluate_compare if compiler.trace else evaluate_compare_value
 
 
 def safe_div(a: Decimal, b: Decimal) -> Decimal:
@@ -420,57 +527,71 @@ def safe_div(a: Decimal, b: Decimal) -> Decimal:
     return a / b
 
 
-def process_call_node(node: dict, scope: ComputationScope) -> Result:
-    args = []
-    details: List[str] = []
+def sqrt(*args: Decimal) -> Decimal:
+    assert len(args) == 1
+    return args[0].sqrt()
+
+
+FUNCTION_DISPATCH: Dict[str, Callable[..., Decimal]] = {
+    "safe_div": safe_div,
+    "sqrt": sqrt,
+}
 
-    for arg in scope.get_children(node, "args"):
-        result, calculation_details = dispatch(arg, scope)
-        args.append(result)
-        details.append(calculation_details)
 
-    details_str = ", ".join(details)
+def compile_call_node(node: dict, compiler: FlatAstCompiler) -> CompiledNode:
+    compute_args = compiler.compile_children(node, "args")
     fn_id = node["values"]["fn_name"]
+    fn = FUNCTION_DISPATCH.get(fn_id)
 
-    if fn_id == "safe_div":
-        result = safe_div(*args)
-        details_str = f"safe_div({details_str})"
-        return result, scope.calc.add(result, details_str)
-
-    if fn_id == "sqrt":
-        assert len(args) == 1
-        result = args[0].sqrt()
-        details_str = f"sqrt({details_str})"
-        return result, scope.calc.add(result, details_str)
-
-    raise Exception(f"Unknown function {fn_id}")
-
-
-AST_NODE_PROCESSOR: Dict[str, Callable[[dict, ComputationScope], Result]] = {
-    "Module": process_module_node,
-    "Expr": process_expr_node,
-    "Name": process_name_node,
-    "Constant": process_constant_node,
-    "Num": process_num_node,
-    "Str": process_str_node,
-    "UnaryOp": process_unary_op_node,
-    "BinOp": process_bin_op_node,
-    "Compare": process_compare_node,
-    "Call": process_call_node,
-}
+    if fn is None:
+        raise Exception(f"Unknown function {fn_id}")
+
+    def evaluate_call(unit: ComputationUnit, calc: Calculation) -> Result:
+        args = []
+        details: List[str] = []
+
+        for compute_arg in compute_args:
+            result, calculation_details = compute_arg(unit, calc)
+            args.append(result)
+            details.append(calculation_details)
 
+        result = fn(*args)
+        details_str = ", ".join(details)
 
-def dispatch(node: dict, scope: ComputationScope) -> Result:
-    return AST_NODE_PROCESSOR[node["kind"]](node, scope)
+        return result, calc.add(result, f"{fn_id}({details_str})")
 
+    def evaluate_call_value(unit: ComputationUnit) -> Any:
+        return fn(*[compute_arg(unit) for compute_arg in compute_args])
 
-def compute(flat_tree: dict, unit: ComputationUnit) -> Result:
-    calc = Calculation()
+    return evaluate_call if compiler.trace else evaluate_call_value
+
+
+AST_NODE_COMPILER: Dict[str, Callable[[dict, FlatAstCompiler], CompiledNode]] = {
+    "Module": compile_module_node,
+    "Expr": compile_expr_node,
+    "Name": compile_name_node,
+    "Constant": compile_constant_node,
+    "Num": compile_num_node,
+    "Str": compile_str_node,
+    "UnaryOp": compile_unary_op_node,
+    "BinOp": compile_bin_op_node,
+    "Compare": compile_compare_node,
+    "Call": compile_call_node,
+}
+
+
+def compile_flat_ast(flat_tree: dict) -> CompiledFormula:
     nodes = flat_tree["nodes"]
-    root_index = flat_tree["root_index"]
-    node = nodes[root_index]
-    scope = ComputationScope(unit=unit, calc=calc, nodes=nodes)
 
-    result, details = dispatch(node, scope)
-    calc.add_final(result, details)
-    return result, calc.details
+    return CompiledFormula(nodes, nodes[flat_tree["root_index"]])
+
+
+def compute(
+    flat_tree: dict, unit: ComputationUnit, trace: bool = True
+) -> Tuple[Any, Optional[str]]:
+    compiled_formula = compile_flat_ast(flat_tree)
+
+    if trace:
+        return compiled_formula(unit)
+
+    return compiled_formula.evaluate(unit), None
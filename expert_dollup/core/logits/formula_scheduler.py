@@ -0,0 +1,69 @@
+from typing import List, Dict, Callable, Iterable, TypeVar, Generic
+from expert_dollup.core.exceptions import FormulaCycleError
+
+Unit = TypeVar("Unit")
+
+
+class FormulaScheduler(Generic[Unit]):
+    def __init__(
+        self,
+        units: Iterable[Unit],
+        get_dependencies: Callable[[Unit], Iterable[Unit]],
+    ):
+        self.units = list(units)
+        self.get_dependencies = get_dependencies
+
+    def build_levels(self) -> List[List[Unit]]:
+        unit_by_key: Dict[int, Unit] = {id(unit): unit for unit in self.units}
+        dependents: Dict[int, List[int]] = {key: [] for key in unit_by_key}
+        pending_count: Dict[int, int] = {key: 0 for key in unit_by_key}
+
+        for key, unit in unit_by_key.items():
+            for dependency_key in set(
+                id(dependency) for dependency in self.get_dependencies(unit)
+            ):
+                if dependency_key in unit_by_key:
+                    dependents[dependency_key].append(key)
+                    pending_count[key] += 1
+
+        levels: List[List[Unit]] = []
+        level = [key for key, count in pending_count.items() if count == 0]
+
+        while len(level) > 0:
+            levels.append([unit_by_key[key] for key in level])
+            next_level = []
+
+            for key in level:
+                for dependent_key in dependents[key]:
+                    pending_count[dependent_key] -= 1
+
+                    if pending_count[dependent_key] == 0:
+                        next_level.append(dependent_key)
+
+            level = next_level
+
+        blocked = {key for key, count in pending_count.items() if count > 0}
+
+        if len(blocked) > 0:
+            raise FormulaCycleError(self._find_cycle(unit_by_key, blocked))
+
+        return levels
+
+    def _find_cycle(self, unit_by_key: Dict[int, Unit], blocked: set) -> List[str]:
+        key = next(iter(blocked))
+        visited_at: Dict[int, int] = {}
+        walk: List[int] = []
+
+        while not key in visited_at:
+            visited_at[key] = len(walk)
+            walk.append(key)
+            key = next(
+                id(dependency)
+                for dependency in self.get_dependencies(unit_by_key[key])
+                if id(dependency) in blocked
+            )
+
+        cycle = walk[visited_at[key] :]
+        cycle.append(key)
+
+        return [unit_by_key[cycle_key].name for cycle_key in cycle]
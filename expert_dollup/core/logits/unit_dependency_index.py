@@ -0,0 +1,129 @@
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from expert_dollup.core.domains import StagedFormula, UnitInstanceCache
+from .formula_injector import FormulaInjector
+
+
+class IndexedUnit:
+    __slots__ = ("index", "node_id", "path", "name", "dependencies")
+
+    def __init__(
+        self,
+        index: int,
+        node_id: UUID,
+        path: List[UUID],
+        name: str,
+        dependencies: List[str],
+    ):
+        self.index = index
+        self.node_id = node_id
+        self.path = path
+        self.name = name
+        self.dependencies = dependencies
+
+
+class UnitDependencyIndex:
+    def __init__(
+        self,
+        dependencies_by_index: Dict[int, List[int]],
+        field_index_by_node_id: Dict[UUID, int],
+    ):
+        self.dependencies_by_index = dependencies_by_index
+        self.field_index_by_node_id = field_index_by_node_id
+        self.dependents_by_index: Dict[int, List[int]] = defaultdict(list)
+
+        for index, dependencies in dependencies_by_index.items():
+            for dependency in dependencies:
+                self.dependents_by_index[dependency].append(index)
+
+    @staticmethod
+    def build(
+        unit_instances: UnitInstanceCache, formula_by_id: Dict[UUID, StagedFormula]
+    ) -> Optional["UnitDependencyIndex"]:
+        injector = FormulaInjector()
+        formula_units: List[IndexedUnit] = []
+        field_index_by_node_id: Dict[UUID, int] = {}
+
+        for index in range(len(unit_instances)):
+            node_id = unit_instances.get_node_id(index)
+            formula_id = unit_instances.get_formula_id(index)
+            dependencies: List[str] = []
+
+            if formula_id is None:
+                field_index_by_node_id[node_id] = index
+            else:
+                formula = formula_by_id.get(formula_id)
+
+                if formula is None:
+                    return None
+
+                dependencies = formula.dependency_graph.dependencies
+
+            unit = IndexedUnit(
+                index,
+                node_id,
+                unit_instances.get_path(index),
+                unit_instances.get_name(index),
+                dependencies,
+            )
+
+            if not formula_id is None:
+                formula_units.append(unit)
+
+            injector.add_unit(unit)
+
+        return UnitDependencyIndex(
+            {
+                unit.index: [
+                    dependency.index
+                    for name in unit.dependencies
+                    for dependency in injector.get_unit(unit.node_id, unit.path, name)
+                ]
+                for unit in formula_units
+            },
+            field_index_by_node_id,
+        )
+
+    def find_dependents(self, indexes: Iterable[int]) -> List[int]:
+        dependents = set()
+        pending = list(indexes)
+
+        while len(pending) > 0:
+            for dependent in self.dependents_by_index.get(pending.pop(), []):
+                if not dependent in dependents:
+                    dependents.add(dependent)
+                    pending.append(dependent)
+
+        return sorted(dependents)
+
+
+class UnitDependencyIndexCache:
+    def __init__(self, max_size: int = 16):
+        self.max_size = max_size
+        self._indexes: Dict[
+            UUID, Tuple[Tuple[str, str], UnitDependencyIndex]
+        ] = OrderedDict()
+
+    def get(
+        self, project_id: UUID, revision: Tuple[str, str]
+    ) -> Optional[UnitDependencyIndex]:
+        entry = self._indexes.get(project_id)
+
+        if entry is None or entry[0] != revision:
+            return None
+
+        self._indexes.move_to_end(project_id)
+        return entry[1]
+
+    def set(
+        self, project_id: UUID, revision: Tuple[str, str], index: UnitDependencyIndex
+    ) -> None:
+        self._indexes.pop(project_id, None)
+        self._indexes[project_id] = (revision, index)
+
+        while len(self._indexes) > self.max_size:
+            self._indexes.popitem(last=False)
+
+    def invalidate(self, project_id: UUID) -> None:
+        self._indexes.pop(project_id, None)
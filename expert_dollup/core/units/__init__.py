@@ -1,7 +1,9 @@
+from .data_revisions import DataRevisions
 from .expression_evaluator import ExpressionEvaluator
 from .report_row_cache import ReportRowCache
 from .formula_resolver import FormulaResolver
 from .node_value_validation import NodeValueValidation
 from .node_event_dispatcher import NodeEventDispatcher
 from .report_linking import ReportLinking
+from .report_revision import ReportRevision
 from .report_distributor import ReportDistributor
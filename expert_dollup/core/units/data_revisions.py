@@ -0,0 +1,61 @@
+from asyncio import gather
+from typing import List
+from uuid import UUID, uuid4
+from expert_dollup.shared.database_services import Repository, RecordNotFound
+from expert_dollup.core.domains import DataRevision
+
+NO_REVISION = "0"
+
+
+class DataRevisionKey:
+    @staticmethod
+    def project(project_id: UUID) -> str:
+        return f"project:{project_id}"
+
+    @staticmethod
+    def project_definition(project_definition_id: UUID) -> str:
+        return f"project_definition:{project_definition_id}"
+
+    @staticmethod
+    def labels(project_definition_id: UUID) -> str:
+        return f"labels:{project_definition_id}"
+
+    @staticmethod
+    def datasheet(datasheet_id: UUID) -> str:
+        return f"datasheet:{datasheet_id}"
+
+    @staticmethod
+    def report_rows(report_definition_id: UUID) -> str:
+        return f"report_rows:{report_definition_id}"
+
+    @staticmethod
+    def unit_instances(project_id: UUID) -> str:
+        return f"unit_instances:{project_id}"
+
+    @staticmethod
+    def valid_unit_instances(project_id: UUID) -> str:
+        return f"valid_unit_instances:{project_id}"
+
+
+class DataRevisions:
+    def __init__(self, data_revision_service: Repository[DataRevision]):
+        self.data_revision_service = data_revision_service
+
+    async def bump(self, *keys: str) -> str:
+        revision = uuid4()
+        await self.data_revision_service.upserts(
+            [DataRevision(id=key, revision=revision) for key in keys]
+        )
+
+        return revision.hex
+
+    async def get_revisions(self, keys: List[str]) -> List[str]:
+        return await gather(*[self.get_revision(key) for key in keys])
+
+    async def get_revision(self, key: str) -> str:
+        try:
+            data_revision = await self.data_revision_service.find_by_id(key)
+        except RecordNotFound:
+            return NO_REVISION
+
+        return data_revision.revision.hex
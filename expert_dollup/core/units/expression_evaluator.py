@@ -1,7 +1,13 @@
 import ast
 from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Union
 from expert_dollup.core.exceptions import AstEvaluationError
 
+Scope = Dict[str, Any]
+CompiledNode = Callable[[Scope], Any]
+AST_INDEX_TYPE = getattr(ast, "Index", ())
+
 
 class ReturnSignal(Exception):
     def __init__(self, value):
@@ -9,226 +15,316 @@ class ReturnSignal(Exception):
         self.value = value
 
 
-class AstVirtualMachine:
-    def compute(self, node, scope):
-        if isinstance(node, ast.FunctionDef):
-            args_name = [a.arg for a in node.args.args]
-            body = node.body
+class AstCompiler:
+    def compile(self, node) -> CompiledNode:
+        compile_node = getattr(self, f"compile_{type(node).__name__}", None)
+
+        if compile_node is None:
+            return self.compile_unsupported(node)
+
+        return compile_node(node)
+
+    def compile_unsupported(self, node) -> CompiledNode:
+        node_type = type(node)
+
+        def unsupported_node(scope: Scope):
+            raise Exception(f"Unsupported node {node_type}")
+
+        return unsupported_node
+
+    def compile_FunctionDef(self, node: ast.FunctionDef) -> CompiledNode:
+        args_name = [a.arg for a in node.args.args]
+        name = node.name
+        body = [
+            (True, self.compile(element.value))
+            if isinstance(element, ast.Return)
+            else (False, self.compile(element))
+            for element in node.body
+        ]
 
+        def define_function(scope: Scope):
             def _compute_function(scope, args):
                 fn_scope = dict(scope)
                 fn_scope.update(dict(zip(args_name, args)))
 
-                for element in body:
-                    if isinstance(element, ast.Return):
-                        value = self.compute(element.value, fn_scope)
-                        return value
+                for is_return, element in body:
+                    if is_return:
+                        return element(fn_scope)
 
                     try:
-                        self.compute(element, fn_scope)
+                        element(fn_scope)
                     except ReturnSignal as r:
                         return r.value
 
                 return None
 
-            scope[node.name] = _compute_function
+            scope[name] = _compute_function
             return _compute_function
 
-        if isinstance(node, ast.Return):
-            value = None if node.value is None else self.compute(node.value, scope)
-            raise ReturnSignal(value)
+        return define_function
 
-        if isinstance(node, ast.GeneratorExp):
-            elements = self.compute(node.generators[0].iter, scope)
-            target = self.compute(node.generators[0].target, scope)
+    def compile_Return(self, node: ast.Return) -> CompiledNode:
+        compute_value = None if node.value is None else self.compile(node.value)
+
+        def return_value(scope: Scope):
+            raise ReturnSignal(None if compute_value is None else compute_value(scope))
+
+        return return_value
+
+    def compile_GeneratorExp(self, node: ast.GeneratorExp) -> CompiledNode:
+        compute_elements = self.compile(node.generators[0].iter)
+        compute_target = self.compile(node.generators[0].target)
+        compute_elt = self.compile(node.elt)
+
+        def generate(scope: Scope):
+            elements = compute_elements(scope)
+            target = compute_target(scope)
             values = []
 
             for element in elements:
                 scope[target] = element
-                value = self.compute(node.elt, scope)
-                values.append(value)
+                values.append(compute_elt(scope))
 
             return values
 
-        if isinstance(node, ast.If):
-            result = self.compute(node.test, scope)
+        return generate
 
-            if result:
-                for element in node.body:
-                    self.compute(element, scope)
-            else:
-                for element in node.orelse:
-                    self.compute(element, scope)
+    def compile_If(self, node: ast.If) -> CompiledNode:
+        compute_test = self.compile(node.test)
+        body = [self.compile(element) for element in node.body]
+        orelse = [self.compile(element) for element in node.orelse]
+
+        def branch(scope: Scope):
+            for element in body if compute_test(scope) else orelse:
+                element(scope)
 
             return None
 
-        if isinstance(node, ast.Subscript):
-            value = self.compute(node.value, scope)
-            index = self.compute(node.slice.value, scope)
+        return branch
+
+    def compile_Subscript(self, node: ast.Subscript) -> CompiledNode:
+        compute_value = self.compile(node.value)
+        compute_index = self.compile(
+            node.slice.value if isinstance(node.slice, AST_INDEX_TYPE) else node.slice
+        )
+
+        def subscript(scope: Scope):
+            value = compute_value(scope)
+            return value[compute_index(scope)]
 
-            return value[index]
+        return subscript
 
-        if isinstance(node, ast.Attribute):
-            value = self.compute(node.value, scope)
-            return getattr(value, node.attr)
+    def compile_Attribute(self, node: ast.Attribute) -> CompiledNode:
+        compute_value = self.compile(node.value)
+        attr = node.attr
 
-        if isinstance(node, ast.Assign):
-            targets = [self.compute(t, scope) for t in node.targets]
-            value = self.compute(node.value, scope)
+        def attribute(scope: Scope):
+            return getattr(compute_value(scope), attr)
+
+        return attribute
+
+    def compile_Assign(self, node: ast.Assign) -> CompiledNode:
+        compute_targets = [self.compile(t) for t in node.targets]
+        compute_value = self.compile(node.value)
+
+        def assign(scope: Scope):
+            targets = [compute_target(scope) for compute_target in compute_targets]
+            value = compute_value(scope)
 
             for target in targets:
                 scope[target] = value
 
             return scope[target]
 
-        if isinstance(node, ast.BoolOp):
-            if isinstance(node.op, ast.Or):
+        return assign
+
+    def compile_BoolOp(self, node: ast.BoolOp) -> CompiledNode:
+        compute_values = [self.compile(expr) for expr in node.values]
+
+        if isinstance(node.op, ast.Or):
+
+            def bool_or(scope: Scope):
                 x = False
 
-                for expr in node.values:
-                    value = self.compute(expr, scope)
+                for compute_value in compute_values:
+                    value = compute_value(scope)
                     x = x or value
 
                 return x
 
-            elif isinstance(node.op, ast.And):
+            return bool_or
+
+        if isinstance(node.op, ast.And):
+
+            def bool_and(scope: Scope):
                 x = True
 
-                for expr in node.values:
-                    value = self.compute(expr, scope)
+                for compute_value in compute_values:
+                    value = compute_value(scope)
                     x = x and value
 
                 return x
 
-            raise Exception("Unsupported BoolOp")
+            return bool_and
 
-        if isinstance(node, ast.Expr):
-            return self.compute(node.value, scope)
+        return self.raise_on_evaluation("Unsupported BoolOp")
 
-        if isinstance(node, ast.Name):
-            if isinstance(node.ctx, ast.Load):
-                assert node.id in scope, f"{node.id} not found"
-                value = scope[node.id]
-                return value
+    def compile_Expr(self, node: ast.Expr) -> CompiledNode:
+        return self.compile(node.value)
 
-            return node.id
+    def compile_Name(self, node: ast.Name) -> CompiledNode:
+        name = node.id
 
-        if isinstance(node, ast.Constant):
-            return node.value
+        if isinstance(node.ctx, ast.Load):
 
-        if isinstance(node, ast.Num):
-            return node.n
+            def load(scope: Scope):
+                assert name in scope, f"{name} not found"
+                return scope[name]
 
-        if isinstance(node, ast.Str):
-            return node.s
+            return load
 
-        if isinstance(node, ast.UnaryOp):
-            operand = self.compute(node.operand, scope)
+        return lambda scope: name
 
-            if isinstance(node.op, ast.UAdd):
-                return +operand
+    def compile_Constant(self, node: ast.Constant) -> CompiledNode:
+        value = node.value
+        return lambda scope: value
 
-            if isinstance(node.op, ast.USub):
-                return -operand
+    def compile_UnaryOp(self, node: ast.UnaryOp) -> CompiledNode:
+        compute_operand = self.compile(node.operand)
+        compute = UNARY_OP_DISPATCH.get(type(node.op))
 
-            if isinstance(node.op, ast.Not):
-                return not operand
+        if compute is None:
+            return self.raise_on_evaluation("Unsupported unary op", compute_operand)
 
-            raise Exception("Unsupported unary op")
+        return lambda scope: compute(compute_operand(scope))
 
-        if isinstance(node, ast.BinOp):
-            left = self.compute(node.left, scope)
-            right = self.compute(node.right, scope)
+    def compile_BinOp(self, node: ast.BinOp) -> CompiledNode:
+        compute_left = self.compile(node.left)
+        compute_right = self.compile(node.right)
+        compute = BINARY_OP_DISPATCH.get(type(node.op))
 
-            if isinstance(node.op, ast.Add):
-                return left + right
+        if compute is None:
+            return self.raise_on_evaluation(
+                "Unsupported binary op", compute_left, compute_right
+            )
 
-            if isinstance(node.op, ast.Sub):
-                return left - right
+        return lambda scope: compute(compute_left(scope), compute_right(scope))
 
-            if isinstance(node.op, ast.Mult):
-                assert isinstance(left, Decimal), type(left)
-                assert isinstance(
-                    right, Decimal
-                ), f"Right id type of {type(right)} and value of {right}"
-                return left * right
+    def compile_Compare(self, node: ast.Compare) -> CompiledNode:
+        compute_left = self.compile(node.left)
+        comparisons = [
+            (self.compile(comparator), COMPARATOR_DISPATCH.get(type(op)))
+            for comparator, op in zip(node.comparators, node.ops)
+        ]
 
-            if isinstance(node.op, ast.Div):
-                try:
-                    return left / right
-                except ZeroDivisionError:
-                    return 0
+        def compare(scope: Scope):
+            left = compute_left(scope)
+            result = left
 
-            raise Exception("Unsupported binary op")
+            for compute_right, compute in comparisons:
+                right = compute_right(scope)
 
-        if isinstance(node, ast.Compare):
-            left = self.compute(node.left, scope)
-            result = left
+                if compute is None:
+                    raise Exception("Unssuported comparator")
 
-            for comparator, op in zip(node.comparators, node.ops):
-                right = self.compute(comparator, scope)
+                result = compute(left, right)
+                left = right
 
-                if isinstance(op, ast.Eq):
-                    result = left == right
+            return result
 
-                elif isinstance(op, ast.NotEq):
-                    result = left != right
+        return compare
 
-                elif isinstance(op, ast.Lt):
-                    result = left < right
+    def compile_Call(self, node: ast.Call) -> CompiledNode:
+        compute_args = [self.compile(arg) for arg in node.args]
 
-                elif isinstance(op, ast.LtE):
-                    result = left <= right
+        if isinstance(node.func, ast.Name):
+            fn_name = node.func.id
 
-                elif isinstance(op, ast.Gt):
-                    result = left > right
+            def call_name(scope: Scope):
+                args = [compute_arg(scope) for compute_arg in compute_args]
+                assert len(args) < 15
 
-                elif isinstance(op, ast.GtE):
-                    result = left >= right
+                if fn_name in scope:
+                    fn = scope[fn_name]
 
-                else:
-                    raise Exception("Unssuported comparator")
+                    if fn.__name__ == "_compute_function":
+                        return fn(scope, args)
 
-                left = right
+                    return fn(*args)
 
-            return result
+                raise Exception(f"Unknown function {fn_name}")
 
-        if isinstance(node, ast.Call):
-            args = []
+            return call_name
 
-            for arg in node.args:
-                result = self.compute(arg, scope)
-                args.append(result)
+        compute_fn = self.compile(node.func)
 
+        def call(scope: Scope):
+            args = [compute_arg(scope) for compute_arg in compute_args]
             assert len(args) < 15
+            return compute_fn(scope)(*args)
 
-            if isinstance(node.func, ast.Name):
-                if node.func.id in scope:
-                    if scope[node.func.id].__name__ == "_compute_function":
-                        return scope[node.func.id](scope, args)
-                    else:
-                        return scope[node.func.id](*args)
+        return call
 
-                raise Exception(f"Unknown function {node.func.id}")
-            else:
-                fn = self.compute(node.func, scope)
-                result = fn(*args)
-                return result
+    @staticmethod
+    def raise_on_evaluation(message: str, *operands: CompiledNode) -> CompiledNode:
+        def raise_error(scope: Scope):
+            for compute_operand in operands:
+                compute_operand(scope)
 
-        raise Exception(f"Unsupported node {type(node)}")
+            raise Exception(message)
 
+        return raise_error
 
-class ExpressionEvaluator:
-    def __init__(self):
-        pass
 
-    def evaluate(self, expression: str, scope: dict):
-        formula_ast = ast.parse(expression)
-        ast_vm = AstVirtualMachine()
+def multiply(left, right):
+    assert isinstance(left, Decimal), type(left)
+    assert isinstance(
+        right, Decimal
+    ), f"Right id type of {type(right)} and value of {right}"
+    return left * right
+
+
+def divide(left, right):
+    try:
+        return left / right
+    except ZeroDivisionError:
+        return 0
+
+
+UNARY_OP_DISPATCH = {
+    ast.UAdd: lambda operand: +operand,
+    ast.USub: lambda operand: -operand,
+    ast.Not: lambda operand: not operand,
+}
+
+BINARY_OP_DISPATCH = {
+    ast.Add: lambda left, right: left + right,
+    ast.Sub: lambda left, right: left - right,
+    ast.Mult: multiply,
+    ast.Div: divide,
+}
+
+COMPARATOR_DISPATCH = {
+    ast.Eq: lambda left, right: left == right,
+    ast.NotEq: lambda left, right: left != right,
+    ast.Lt: lambda left, right: left < right,
+    ast.LtE: lambda left, right: left <= right,
+    ast.Gt: lambda left, right: left > right,
+    ast.GtE: lambda left, right: left >= right,
+}
+
+
+class CompiledExpression:
+    def __init__(self, expression: str, statements: List[CompiledNode]):
+        self.expression = expression
+        self.statements = statements
+
+    def evaluate(self, scope: Scope):
         result = None
-        for element in formula_ast.body:
+
+        for statement in self.statements:
             try:
-                result = ast_vm.compute(element, scope)
+                result = statement(scope)
             except Exception as e:
                 raise AstEvaluationError(
                     "Error during evaluation of expression",
@@ -236,3 +332,26 @@ class ExpressionEvaluator:
                 ) from e
 
         return result
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(expression: str) -> CompiledExpression:
+    compiler = AstCompiler()
+    return CompiledExpression(
+        expression,
+        [compiler.compile(element) for element in ast.parse(expression).body],
+    )
+
+
+class ExpressionEvaluator:
+    def __init__(self):
+        pass
+
+    def compile(self, expression: str) -> CompiledExpression:
+        return compile_expression(expression)
+
+    def evaluate(self, expression: Union[str, CompiledExpression], scope: dict):
+        if not isinstance(expression, CompiledExpression):
+            expression = compile_expression(expression)
+
+        return expression.evaluate(scope)
@@ -1,4 +1,4 @@
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional, Tuple
 from uuid import UUID
 from asyncio import gather
 from expert_dollup.shared.database_services import log_execution_time_async, StopWatch
@@ -10,6 +10,8 @@ from expert_dollup.core.domains import *
 from expert_dollup.core.builders import *
 from expert_dollup.core.logits import *
 from expert_dollup.core.repositories import *
+from .single_flight import SingleFlight
+from .data_revisions import DataRevisions, DataRevisionKey
 
 
 class FormulaResolver:
@@ -20,6 +22,11 @@ class FormulaResolver:
         project_definition_node_service: ProjectDefinitionNodeRepository,
         unit_instance_builder: UnitInstanceBuilder,
         stage_formulas_storage: ObjectStorage[StagedFormulas, StagedFormulasKey],
+        unit_instance_storage: ObjectStorage[UnitInstanceCache, UnitInstanceCacheKey],
+        formula_compiler: FormulaCompiler,
+        unit_dependency_index_cache: UnitDependencyIndexCache,
+        single_flight: SingleFlight,
+        data_revisions: DataRevisions,
         logger: LoggerFactory,
     ):
         self.formula_service = formula_service
@@ -27,6 +34,11 @@ class FormulaResolver:
         self.project_definition_node_service = project_definition_node_service
         self.unit_instance_builder = unit_instance_builder
         self.stage_formulas_storage = stage_formulas_storage
+        self.unit_instance_storage = unit_instance_storage
+        self.formula_compiler = formula_compiler
+        self.unit_dependency_index_cache = unit_dependency_index_cache
+        self.single_flight = single_flight
+        self.data_revisions = data_revisions
         self.logger = logger.create(__name__)
 
     async def parse_many(
@@ -200,16 +212,36 @@ class FormulaResolver:
     async def refresh_staged_formulas_cache(
         self, project_definition_id: UUID
     ) -> StagedFormulas:
-        staged_formulas = await self.build_staged_formulas(project_definition_id)
-        await self.stage_formulas_storage.save(
-            StagedFormulasKey(project_definition_id), staged_formulas
+        return await self.single_flight.run_fresh(
+            ("staged_formulas", project_definition_id),
+            lambda: self._save_staged_formulas(project_definition_id),
+        )
+
+    async def patch_staged_formulas(
+        self, project_definition_id: UUID, formulas: List[Formula]
+    ) -> StagedFormulas:
+        return await self.single_flight.run_after(
+            ("staged_formulas", project_definition_id),
+            lambda: self._patch_staged_formulas(project_definition_id, formulas),
         )
-        return staged_formulas
 
     @log_execution_time_async
     async def get_staged_formulas(self, project_definition_id: UUID) -> StagedFormulas:
         try:
-            staged_formulas = await self.stage_formulas_storage.load(
+            return await self.stage_formulas_storage.load(
+                StagedFormulasKey(project_definition_id)
+            )
+        except RessourceNotFound:
+            return await self.single_flight.run(
+                ("staged_formulas", project_definition_id),
+                lambda: self._load_or_save_staged_formulas(project_definition_id),
+            )
+
+    async def _load_or_save_staged_formulas(
+        self, project_definition_id: UUID
+    ) -> StagedFormulas:
+        try:
+            return await self.stage_formulas_storage.load(
                 StagedFormulasKey(project_definition_id)
             )
         except RessourceNotFound:
@@ -217,10 +249,37 @@ class FormulaResolver:
                 "Refreshing formula cache",
                 extra=dict(project_definition_id=project_definition_id),
             )
-            staged_formulas = await self.refresh_staged_formulas_cache(
-                project_definition_id
+            return await self._save_staged_formulas(project_definition_id)
+
+    async def _patch_staged_formulas(
+        self, project_definition_id: UUID, formulas: List[Formula]
+    ) -> StagedFormulas:
+        patched_ids = set(formula.id for formula in formulas)
+
+        try:
+            staged_formulas = await self.stage_formulas_storage.load(
+                StagedFormulasKey(project_definition_id)
             )
+        except RessourceNotFound:
+            return await self._save_staged_formulas(project_definition_id)
+
+        staged_formulas = [
+            formula for formula in staged_formulas if not formula.id in patched_ids
+        ]
+        staged_formulas.extend(FormulaResolver.stage_formulas(formulas))
+        await self.stage_formulas_storage.save(
+            StagedFormulasKey(project_definition_id), staged_formulas
+        )
+
+        return staged_formulas
 
+    async def _save_staged_formulas(
+        self, project_definition_id: UUID
+    ) -> StagedFormulas:
+        staged_formulas = await self.build_staged_formulas(project_definition_id)
+        await self.stage_formulas_storage.save(
+            StagedFormulasKey(project_definition_id), staged_formulas
+        )
         return staged_formulas
 
     @log_execution_time_async
@@ -236,6 +295,7 @@ class FormulaResolver:
             )
 
         formula_by_id = {formula.id: formula for formula in staged_formulas}
+        compiled_by_id = self.formula_compiler.compile_many(staged_formulas)
         unit_instances = self.unit_instance_builder.build_with_fields(
             staged_formulas, nodes
         )
@@ -249,7 +309,7 @@ class FormulaResolver:
                 FormulaUnit(
                     formula_instance,
                     formula.dependency_graph.dependencies,
-                    formula.final_ast,
+                    compiled_by_id[formula.id],
                     injector,
                 )
             )
@@ -259,6 +319,213 @@ class FormulaResolver:
 
         return injector
 
+    @log_execution_time_async
+    async def update_project_formulas(
+        self,
+        project_id: UUID,
+        project_definition_id: UUID,
+        updated_nodes: List[ProjectNode],
+    ) -> Optional[UnitInstanceCache]:
+        return await self.single_flight.run_after(
+            ("unit_instances", project_id),
+            lambda: self._update_project_formulas(
+                project_id, project_definition_id, updated_nodes
+            ),
+        )
+
+    async def _update_project_formulas(
+        self,
+        project_id: UUID,
+        project_definition_id: UUID,
+        updated_nodes: List[ProjectNode],
+    ) -> Optional[UnitInstanceCache]:
+        unit_instance_cache, revision = await self._load_unit_instances(project_id)
+
+        if unit_instance_cache is None:
+            # Fail the revision check of any report linked before this edit, so
+            # it does not store unit instances missing the edit.
+            await self.data_revisions.bump(DataRevisionKey.unit_instances(project_id))
+            return None
+
+        staged_formulas, definition_revision = await gather(
+            self.get_staged_formulas(project_definition_id),
+            self.data_revisions.get_revision(
+                DataRevisionKey.project_definition(project_definition_id)
+            ),
+        )
+        formula_by_id = {formula.id: formula for formula in staged_formulas}
+        dependency_index = self.unit_dependency_index_cache.get(
+            project_id, (revision, definition_revision)
+        )
+
+        if dependency_index is None:
+            with StopWatch(self.logger, "Indexing unit dependencies"):
+                dependency_index = UnitDependencyIndex.build(
+                    unit_instance_cache, formula_by_id
+                )
+
+            if dependency_index is None:
+                return await self._refresh_project_formulas(
+                    project_id, project_definition_id
+                )
+
+        updated_indexes: List[int] = []
+
+        for node in updated_nodes:
+            index = dependency_index.field_index_by_node_id.get(node.id)
+
+            if index is None or unit_instance_cache.get_name(index) != node.type_name:
+                return await self._refresh_project_formulas(
+                    project_id, project_definition_id
+                )
+
+            unit_instance_cache.results[index] = FieldUnit(node).value
+            updated_indexes.append(index)
+
+        dirty_indexes = dependency_index.find_dependents(updated_indexes)
+        dirty_index_set = set(dirty_indexes)
+        dependency_indexes = set(
+            dependency
+            for index in dirty_indexes
+            for dependency in dependency_index.dependencies_by_index[index]
+        )
+        compiled_by_id = self.formula_compiler.compile_many(
+            {
+                formula.id: formula
+                for formula in (
+                    formula_by_id[unit_instance_cache.get_formula_id(index)]
+                    for index in dirty_indexes
+                )
+            }.values()
+        )
+        injector = FormulaInjector()
+        dirty_units: List[Tuple[int, FormulaUnit]] = []
+
+        for index in sorted(dirty_index_set | dependency_indexes):
+            unit_instance = unit_instance_cache.view(index).materialize()
+
+            if index in dirty_index_set:
+                formula = formula_by_id[unit_instance.formula_id]
+                unit = FormulaUnit(
+                    unit_instance,
+                    formula.dependency_graph.dependencies,
+                    compiled_by_id[formula.id],
+                    injector,
+                )
+                dirty_units.append((index, unit))
+            else:
+                unit = FrozenUnit(unit_instance)
+
+            injector.add_unit(unit)
+
+        with StopWatch(self.logger, "Recomputing dirty formulas"):
+            for level in injector.schedule(unit for _, unit in dirty_units):
+                for unit in level:
+                    unit.computed
+
+        for index, unit in dirty_units:
+            unit_instance = unit.computed
+            unit_instance_cache.set_result(
+                index, unit_instance.result, unit_instance.calculation_details
+            )
+
+        revision = await self._store_unit_instances(project_id, unit_instance_cache)
+        self.unit_dependency_index_cache.set(
+            project_id, (revision, definition_revision), dependency_index
+        )
+
+        return unit_instance_cache
+
+    async def refresh_project_formulas(
+        self, project_id: UUID, project_definition_id: UUID
+    ) -> UnitInstanceCache:
+        return await self.single_flight.run_after(
+            ("unit_instances", project_id),
+            lambda: self._refresh_project_formulas(project_id, project_definition_id),
+        )
+
+    async def _refresh_project_formulas(
+        self, project_id: UUID, project_definition_id: UUID
+    ) -> UnitInstanceCache:
+        injector = await self.compute_all_project_formula(
+            project_id, project_definition_id
+        )
+        unit_instance_cache = UnitInstanceCache(injector.unit_instances)
+        await self._store_unit_instances(project_id, unit_instance_cache)
+
+        return unit_instance_cache
+
+    async def invalidate_project_formulas(self, project_id: UUID) -> None:
+        await self.single_flight.run_after(
+            ("unit_instances", project_id),
+            lambda: self.data_revisions.bump(
+                DataRevisionKey.unit_instances(project_id)
+            ),
+        )
+
+    async def get_unit_instances_revision(self, project_id: UUID) -> str:
+        return await self.data_revisions.get_revision(
+            DataRevisionKey.unit_instances(project_id)
+        )
+
+    async def load_unit_instances(
+        self, project_id: UUID
+    ) -> Optional[UnitInstanceCache]:
+        unit_instance_cache, _ = await self._load_unit_instances(project_id)
+        return unit_instance_cache
+
+    async def _load_unit_instances(
+        self, project_id: UUID
+    ) -> Tuple[Optional[UnitInstanceCache], str]:
+        revision, valid_revision = await self.data_revisions.get_revisions(
+            [
+                DataRevisionKey.unit_instances(project_id),
+                DataRevisionKey.valid_unit_instances(project_id),
+            ]
+        )
+
+        if revision != valid_revision:
+            return None, revision
+
+        try:
+            unit_instance_cache = await self.unit_instance_storage.load(
+                UnitInstanceCacheKey(project_id=project_id)
+            )
+        except RessourceNotFound:
+            return None, revision
+
+        return unit_instance_cache, revision
+
+    async def save_unit_instances(
+        self, project_id: UUID, revision: str, unit_instance_cache: UnitInstanceCache
+    ) -> bool:
+        return await self.single_flight.run_after(
+            ("unit_instances", project_id),
+            lambda: self._save_unit_instances(
+                project_id, revision, unit_instance_cache
+            ),
+        )
+
+    async def _save_unit_instances(
+        self, project_id: UUID, revision: str, unit_instance_cache: UnitInstanceCache
+    ) -> bool:
+        if await self.get_unit_instances_revision(project_id) != revision:
+            return False
+
+        await self._store_unit_instances(project_id, unit_instance_cache)
+        return True
+
+    async def _store_unit_instances(
+        self, project_id: UUID, unit_instance_cache: UnitInstanceCache
+    ) -> str:
+        await self.unit_instance_storage.save(
+            UnitInstanceCacheKey(project_id=project_id), unit_instance_cache
+        )
+        return await self.data_revisions.bump(
+            DataRevisionKey.unit_instances(project_id),
+            DataRevisionKey.valid_unit_instances(project_id),
+        )
+
     @log_execution_time_async
     async def compute_formula(
         self,
@@ -271,6 +538,7 @@ class FormulaResolver:
         )
         formula_by_names = {formula.name: formula for formula in staged_formulas}
         formula_by_ids = {formula.id: formula for formula in staged_formulas}
+        compiled_by_ids = self.formula_compiler.compile_many(staged_formulas)
 
         formula_dependencies = [
             formula_reference.name for formula_reference in formula_references
@@ -300,7 +568,7 @@ class FormulaResolver:
             staged_formulas, nodes
         )
 
-        injector = FormulaInjector()
+        injector = FormulaInjector(trace_details=False)
 
         for node in nodes:
             injector.add_unit(FieldUnit(node))
@@ -311,7 +579,7 @@ class FormulaResolver:
                 FormulaUnit(
                     formula_instance,
                     formula.dependency_graph.dependencies,
-                    formula.final_ast,
+                    compiled_by_ids[formula.id],
                     injector,
                 )
             )
@@ -30,28 +30,48 @@ class NodeEventDispatcher:
     async def update_node_value(
         self, project_id: UUID, node_id: UUID, value: PrimitiveWithNoneUnion
     ) -> ProjectNode:
-        bounded_node = await self._get_bounded_node(project_id, node_id)
-        self.node_value_validation.validate_value(bounded_node.definition, value)
-        await self._execute_triggers(bounded_node, value)
-        await self.project_node_service.update(
-            ProjectNodeValues(value=value),
-            ProjectNodeFilter(project_id=bounded_node.node.project_id, id=node_id),
+        bounded_node = await self._write_node_value(project_id, node_id, value)
+        await self.formula_resolver.update_project_formulas(
+            project_id,
+            bounded_node.definition.project_definition_id,
+            [bounded_node.node],
         )
 
-        return await self.project_node_service.find_by_id(node_id)
+        return bounded_node.node
 
     async def update_nodes_value(
         self, project_id: UUID, updates: List[FieldUpdate]
     ) -> List[ProjectNode]:
-        nodes: List[ProjectNode] = []
+        bounded_nodes: List[BoundedNode] = []
 
         for update in updates:
-            node = await self.update_node_value(
+            bounded_node = await self._write_node_value(
                 project_id, update.node_id, update.value
             )
-            nodes.append(node)
+            bounded_nodes.append(bounded_node)
+
+        if len(bounded_nodes) > 0:
+            await self.formula_resolver.update_project_formulas(
+                project_id,
+                bounded_nodes[0].definition.project_definition_id,
+                [bounded_node.node for bounded_node in bounded_nodes],
+            )
+
+        return [bounded_node.node for bounded_node in bounded_nodes]
+
+    async def _write_node_value(
+        self, project_id: UUID, node_id: UUID, value: PrimitiveWithNoneUnion
+    ) -> BoundedNode:
+        bounded_node = await self._get_bounded_node(project_id, node_id)
+        self.node_value_validation.validate_value(bounded_node.definition, value)
+        await self._execute_triggers(bounded_node, value)
+        await self.project_node_service.update(
+            ProjectNodeValues(value=value),
+            ProjectNodeFilter(project_id=bounded_node.node.project_id, id=node_id),
+        )
+        bounded_node.node = await self.project_node_service.find_by_id(node_id)
 
-        return nodes
+        return bounded_node
 
     async def update_value_inplace(
         self, nodes: List[ProjectNode], metas: List[ProjectNodeMeta]
@@ -1,8 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, List, Dict, Tuple, Callable, Any
+from typing import (
+    Iterable,
+    Iterator,
+    AsyncIterator,
+    List,
+    Dict,
+    Tuple,
+    Callable,
+    Any,
+    Optional,
+)
 from uuid import UUID
 from decimal import Decimal
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from dataclasses import dataclass
 from asyncio import gather
 from expert_dollup.shared.database_services import Repository
@@ -14,13 +24,18 @@ from expert_dollup.core.exceptions import (
     AstEvaluationError,
 )
 from expert_dollup.core.domains import *
-from expert_dollup.shared.database_services.time_it import log_execution_time_async
+from expert_dollup.shared.database_services.time_it import (
+    log_execution_time_async,
+    StopWatch,
+)
 from expert_dollup.shared.starlette_injection import Clock, LoggerFactory
-from .expression_evaluator import ExpressionEvaluator
+from .expression_evaluator import ExpressionEvaluator, CompiledExpression
+from .report_row_batch import ReportRowBatch, ReportRowView
+from .report_plan import ReportPlan, ReportPlanCache, COLUMNS_BUCKET_NAME
 
 FORMULA_BUCKET_NAME = "formula"
-COLUMNS_BUCKET_NAME = "columns"
 INTERNAL_BUCKET_NAME = "internal"
+UnitKey = Tuple[bytes, bytes]
 
 
 def round_number(number: Decimal, digits: int, method: str) -> Decimal:
@@ -43,8 +58,10 @@ class LinkingData:
     report_definition: ReportDefinition
     project_details: ProjectDetails
     unit_instances: UnitInstanceCache
-    injector: FormulaInjector
+    unit_instances_revision: str
+    injector: Optional[FormulaInjector]
     datasheet_elements_by_id: Dict[UUID, DatasheetElement]
+    report_plan: ReportPlan
 
 
 class ReportEvaluationContext:
@@ -54,10 +71,12 @@ class ReportEvaluationContext:
         self.expression_evaluator = expression_evaluator
         self.injector = injector
 
-    def evaluate_row(self, expression, row, rows):
+    def compile(self, expression: str) -> CompiledExpression:
+        return self.expression_evaluator.compile(expression)
+
+    def evaluate_row(self, expression: CompiledExpression, row, rows):
         try:
-            return self.expression_evaluator.evaluate(
-                expression,
+            return expression.evaluate(
                 {
                     "row": row,
                     "rows": rows,
@@ -69,40 +88,37 @@ class ReportEvaluationContext:
         except AstEvaluationError as e:
             raise ReportGenerationError(
                 f"Error while evaluating expression",
-                expression=expression,
+                expression=expression.expression,
                 row=row,
                 **e.props,
             ) from e
 
-    def evaluate(self, expression, scope):
+    def evaluate(self, expression: CompiledExpression, scope):
         try:
-            return self.expression_evaluator.evaluate(
-                expression,
-                scope,
-            )
+            return expression.evaluate(scope)
         except AstEvaluationError as e:
             raise ReportGenerationError(
                 f"Error while evaluating expression",
-                expression=expression,
+                expression=expression.expression,
                 **e.props,
             ) from e
 
 
 class JoinStep(ABC):
     @abstractmethod
-    def apply(self, row: ReportRowDict) -> List[ReportRowDict]:
+    def apply(self, batch: ReportRowBatch) -> ReportRowBatch:
         pass
 
 
 class MutateStep(ABC):
     @abstractmethod
-    def apply(self, row: ReportRowDict) -> None:
+    def apply(self, batch: ReportRowBatch) -> None:
         pass
 
 
 class ProjectionStep(ABC):
     @abstractmethod
-    def apply(self, rows: List[ReportRowDict]) -> List[ReportRowDict]:
+    def apply(self, batch: ReportRowBatch) -> ReportRowBatch:
         pass
 
 
@@ -116,23 +132,25 @@ class ReportGeneration:
         self,
         rows: List[ReportRowDict],
     ) -> List[ReportRowDict]:
-        for join_step in self.join_steps:
-            new_rows: List[ReportRowDict] = []
+        batch = self.apply_row_steps(rows)
+        return self.apply_projection_steps(batch).materialize()
 
-            for row in rows:
-                step_rows = join_step.apply(row)
-                new_rows.extend(step_rows)
+    def apply_row_steps(self, rows: List[ReportRowDict]) -> ReportRowBatch:
+        batch = ReportRowBatch(rows)
 
-            rows = new_rows
+        for join_step in self.join_steps:
+            batch = join_step.apply(batch)
 
         for mutate_step in self.mutate_steps:
-            for row in rows:
-                mutate_step.apply(row)
+            mutate_step.apply(batch)
+
+        return batch
 
+    def apply_projection_steps(self, batch: ReportRowBatch) -> ReportRowBatch:
         for projection_step in self.projection_steps:
-            rows = projection_step.apply(rows)
+            batch = projection_step.apply(batch)
 
-        return rows
+        return batch
 
 
 class JoinFormulaUnitInstances(JoinStep):
@@ -146,35 +164,66 @@ class JoinFormulaUnitInstances(JoinStep):
             )
         )
 
+    @staticmethod
+    def is_reported(unit_instances: UnitInstanceCache, index: int) -> bool:
+        result = unit_instances.results[index]
+        return unit_instances.has_formula(index) and (
+            not isinstance(result, Decimal) or result > 0
+        )
+
     @staticmethod
     def get_unit_instances_by_def_id(
         unit_instances: UnitInstanceCache,
-    ) -> Dict[UUID, UnitInstanceCache]:
+    ) -> Dict[UUID, List[UnitInstanceView]]:
         formula_instances = [
-            unit_instance
-            for unit_instance in unit_instances
-            if not unit_instance.formula_id is None
-            and (
-                not isinstance(unit_instance.result, Decimal)
-                or unit_instance.result > 0
-            )
+            unit_instances.view(index)
+            for index in range(len(unit_instances))
+            if JoinFormulaUnitInstances.is_reported(unit_instances, index)
         ]
 
         return group_by_key(formula_instances, lambda x: x.formula_id)
 
-    def apply(self, row: ReportRowDict) -> List[ReportRowDict]:
-        element_def_id = self.element_attribute.get(row)
-        assert isinstance(element_def_id, UUID)
-        formula_id = self.formula_attribute.get(row)
-        assert isinstance(formula_id, UUID)
+    @staticmethod
+    def get_unit_indexes_by_key(
+        unit_instances: UnitInstanceCache,
+    ) -> Dict[UnitKey, int]:
+        return {
+            unit_instances.get_packed_ids(index)[0:2]: index
+            for index in range(len(unit_instances))
+            if JoinFormulaUnitInstances.is_reported(unit_instances, index)
+        }
 
-        if not formula_id in self.unit_instances_by_def_id:
-            return []
+    def apply(self, batch: ReportRowBatch) -> ReportRowBatch:
+        indexes: List[int] = []
+        formula_dicts: List[dict] = []
+        report_dicts_by_def_id: Dict[UUID, List[dict]] = {}
 
-        return [
-            {**row, FORMULA_BUCKET_NAME: formula_instance.report_dict}
-            for formula_instance in self.unit_instances_by_def_id[formula_id]
-        ]
+        for index in range(len(batch)):
+            row = batch.row(index)
+            element_def_id = self.element_attribute.get(row)
+            assert isinstance(element_def_id, UUID)
+            formula_id = self.formula_attribute.get(row)
+            assert isinstance(formula_id, UUID)
+
+            if not formula_id in self.unit_instances_by_def_id:
+                continue
+
+            report_dicts = report_dicts_by_def_id.get(formula_id)
+
+            if report_dicts is None:
+                report_dicts = [
+                    formula_instance.report_dict
+                    for formula_instance in self.unit_instances_by_def_id[formula_id]
+                ]
+                report_dicts_by_def_id[formula_id] = report_dicts
+
+            indexes.extend(index for _ in report_dicts)
+            formula_dicts.extend(report_dicts)
+
+        joined_batch = batch.take(indexes)
+        joined_batch.set_bucket(FORMULA_BUCKET_NAME, formula_dicts)
+
+        return joined_batch
 
 
 class DatasheetElementInstanceAssignation(MutateStep):
@@ -185,11 +234,26 @@ class DatasheetElementInstanceAssignation(MutateStep):
         self.elements_by_id = linking_data.datasheet_elements_by_id
         self.datasheet_selection_alias = structure.datasheet_selection_alias
 
-    def apply(self, row: ReportRowDict) -> None:
-        element_def_id = self.element_attribute.get(row)
-        element_dict = self.elements_by_id[element_def_id].report_dict
-        element_def_dict = row[self.datasheet_selection_alias]
-        row[self.datasheet_bucket_name] = {**element_def_dict, **element_dict}
+    def apply(self, batch: ReportRowBatch) -> None:
+        element_dicts: List[dict] = []
+        element_dict_by_base_index: Dict[int, dict] = {}
+
+        for index in range(len(batch)):
+            base_index = batch.base_indexes[index]
+            element_dict = element_dict_by_base_index.get(base_index)
+
+            if element_dict is None:
+                row = batch.row(index)
+                element_def_id = self.element_attribute.get(row)
+                element_dict = {
+                    **row[self.datasheet_selection_alias],
+                    **self.elements_by_id[element_def_id].report_dict,
+                }
+                element_dict_by_base_index[base_index] = element_dict
+
+            element_dicts.append(element_dict)
+
+        batch.set_bucket(self.datasheet_bucket_name, element_dicts)
 
 
 class GroupDigestAssignation(MutateStep):
@@ -197,37 +261,29 @@ class GroupDigestAssignation(MutateStep):
         self, linking_data: LinkingData, evaluation_context: ReportEvaluationContext
     ):
         self.evaluation_context = evaluation_context
-        self.structure = linking_data.report_definition.structure
-        footprint_columns = {
-            g.attribute_name
-            for g in self.structure.group_by
-            if g.bucket_name == COLUMNS_BUCKET_NAME
-        }
+        self.first_pass_expressions = linking_data.report_plan.first_pass_expressions
+        self.group_by_getters = linking_data.report_plan.group_by_getters
 
-        self.first_pass_columns = (
-            self.structure.columns
-            if len(footprint_columns) == 0
-            else [
-                column
-                for column in self.structure.columns
-                if column.name in footprint_columns or not column.is_visible
-            ]
-        )
+    def apply(self, batch: ReportRowBatch) -> None:
+        columns_bucket: List[ReportDefinitionColumnDict] = [
+            {} for _ in range(len(batch))
+        ]
+        batch.set_bucket(COLUMNS_BUCKET_NAME, columns_bucket)
+        internal_bucket: List[dict] = []
 
-    def apply(self, row: ReportRowDict) -> None:
-        columns: ReportDefinitionColumnDict = {}
-        row[COLUMNS_BUCKET_NAME] = columns
+        for row, columns in zip(batch.rows(), columns_bucket):
+            group_id = self.evaluate_row(row, columns)
+            internal_bucket.append({"group_digest": group_id})
 
-        for column in self.first_pass_columns:
-            columns[column.name] = self.evaluation_context.evaluate_row(
-                column.expression, row, None
-            )
+        batch.set_bucket(INTERNAL_BUCKET_NAME, internal_bucket)
 
-        group_id = "/".join(
-            attribute_bucket.get(row) for attribute_bucket in self.structure.group_by
-        )
+    def evaluate_row(
+        self, row: ReportRowView, columns: ReportDefinitionColumnDict
+    ) -> str:
+        for name, expression in self.first_pass_expressions:
+            columns[name] = self.evaluation_context.evaluate_row(expression, row, None)
 
-        row[INTERNAL_BUCKET_NAME] = {"group_digest": group_id}
+        return "/".join(get(row) for get in self.group_by_getters)
 
 
 class GroupedColumnProjection(ProjectionStep):
@@ -235,78 +291,59 @@ class GroupedColumnProjection(ProjectionStep):
         self, linking_data: LinkingData, evaluation_context: ReportEvaluationContext
     ):
         self.evaluation_context = evaluation_context
-        report_definition = linking_data.report_definition
-        footprint_columns = {
-            g.attribute_name
-            for g in report_definition.structure.group_by
-            if g.bucket_name == COLUMNS_BUCKET_NAME
-        }
-
-        first_pass_columns = (
-            report_definition.structure.columns
-            if len(footprint_columns) == 0
-            else [
-                column
-                for column in report_definition.structure.columns
-                if column.name in footprint_columns or not column.is_visible
-            ]
-        )
-
-        first_pass_column_names = {
-            first_pass_column.name for first_pass_column in first_pass_columns
-        }
-
-        self.second_pass_column = (
-            []
-            if len(footprint_columns) == 0
-            else [
-                column
-                for column in report_definition.structure.columns
-                if not column.name in first_pass_column_names
-            ]
-        )
+        self.second_pass_expressions = linking_data.report_plan.second_pass_expressions
 
-        if len(self.second_pass_column) == 0:
-            raise Exception("Group by require at least one aggregate")
+    @staticmethod
+    def is_kept(batch: ReportRowBatch, grouped_indexes: List[int]) -> bool:
+        return batch.buckets[COLUMNS_BUCKET_NAME][grouped_indexes[0]]["cost"] != 0
 
-    def apply(self, rows: List[ReportRowDict]) -> List[ReportRowDict]:
-        new_rows: List[ReportRowDict] = []
-        rows_by_group = group_by_key(
-            rows, lambda x: x[INTERNAL_BUCKET_NAME]["group_digest"]
+    @staticmethod
+    def get_indexes_by_group(batch: ReportRowBatch) -> Dict[str, List[int]]:
+        internal_bucket = batch.buckets[INTERNAL_BUCKET_NAME]
+        return group_by_key(
+            range(len(batch)), lambda index: internal_bucket[index]["group_digest"]
         )
 
-        for grouped_rows in rows_by_group.values():
-            current_row = grouped_rows[0]
-            columns = current_row[COLUMNS_BUCKET_NAME]
-            rows = [row for row in grouped_rows]
+    def evaluate_group(self, batch: ReportRowBatch, grouped_indexes: List[int]) -> bool:
+        current_index = grouped_indexes[0]
+        current_row = batch.row(current_index)
+        columns = batch.buckets[COLUMNS_BUCKET_NAME][current_index]
+        rows = [batch.row(index) for index in grouped_indexes]
 
-            for column in self.second_pass_column:
-                columns[column.name] = self.evaluation_context.evaluate_row(
-                    column.expression, current_row, rows
-                )
+        for name, expression in self.second_pass_expressions:
+            columns[name] = self.evaluation_context.evaluate_row(
+                expression, current_row, rows
+            )
 
-            if columns["cost"] != 0:
-                new_rows.append(current_row)
+        return GroupedColumnProjection.is_kept(batch, grouped_indexes)
 
-        return new_rows
+    def apply(self, batch: ReportRowBatch) -> ReportRowBatch:
+        return batch.take(
+            grouped_indexes[0]
+            for grouped_indexes in self.get_indexes_by_group(batch).values()
+            if self.evaluate_group(batch, grouped_indexes)
+        )
 
 
 class RowOrdering(ProjectionStep):
     def __init__(self, linking_data: LinkingData):
-        self.structure = linking_data.report_definition.structure
+        self.order_by_getters = linking_data.report_plan.order_by_getters
 
-    def get_row_order_tuple(self, row: ReportRowDict) -> list:
-        return [
-            attribute_bucket.get(row) for attribute_bucket in self.structure.order_by
-        ]
+    def get_row_order_tuple(self, row: ReportRowView) -> list:
+        return [get(row) for get in self.order_by_getters]
+
+    def apply(self, batch: ReportRowBatch) -> ReportRowBatch:
+        order_tuples = [self.get_row_order_tuple(row) for row in batch.rows()]
+        batch = batch.take(sorted(range(len(batch)), key=order_tuples.__getitem__))
 
-    def apply(self, rows: List[ReportRowDict]) -> List[ReportRowDict]:
-        rows.sort(key=self.get_row_order_tuple)
+        for index, internal in enumerate(batch.buckets[INTERNAL_BUCKET_NAME]):
+            internal["order_index"] = index
 
-        for index, row in enumerate(rows):
-            row[INTERNAL_BUCKET_NAME]["order_index"] = index
+        return batch
 
-        return rows
+
+def get_unit(row, unit):
+    return unit.get(row) if isinstance(unit, AttributeBucket) else unit
 
 
 class ReportBuilder:
@@ -319,66 +356,101 @@ class ReportBuilder:
         self.clock = clock
         self.linking_data = linking_data
         self.evaluation_context = evaluation_context
+        self.structure = linking_data.report_definition.structure
 
     def build(self, rows: List[ReportRowDict]) -> Report:
-        formula_attribute = (
-            self.linking_data.report_definition.structure.formula_attribute
-        )
-        element_attribute = (
-            self.linking_data.report_definition.structure.datasheet_attribute
-        )
-        stage_summary = self.linking_data.report_definition.structure.stage_summary
-        report_summary = self.linking_data.report_definition.structure.report_summary
-        columns = self.linking_data.report_definition.structure.columns
-
-        def get_unit(row, unit):
-            return unit.get(row) if isinstance(unit, AttributeBucket) else unit
-
-        report_rows = [
-            ReportRow(
-                node_id=row[FORMULA_BUCKET_NAME]["node_id"],
-                formula_id=formula_attribute.get(row),
-                element_def_id=element_attribute.get(row),
-                child_reference_id=self.linking_data.datasheet_elements_by_id[
-                    element_attribute.get(row)
-                ].child_element_reference,
-                columns=[
-                    ComputedValue(
-                        label=column.name,
-                        value=row[COLUMNS_BUCKET_NAME][column.name],
-                        unit=get_unit(row, column.unit),
-                        is_visible=column.is_visible,
-                    )
-                    for column in columns
-                ],
-                row=row,
-            )
-            for row in rows
+        report_rows = [self.build_row(row) for row in rows]
+        report_rows_by_stage = group_by_key(
+            report_rows, self.structure.stage_summary.label.get
+        )
+        stages = [
+            self.build_stage(label, rows)
+            for label, rows in report_rows_by_stage.items()
         ]
 
-        report_rows_by_stage = group_by_key(report_rows, stage_summary.label.get)
-        stages = [
-            ReportStage(
-                rows=rows,
-                columns=[
-                    StageColumn(
-                        column.name, get_unit(rows[0], column.unit), column.is_visible
-                    )
-                    for column in columns
-                ],
-                summary=ComputedValue(
-                    value=self.evaluation_context.evaluate_row(
-                        stage_summary.summary.expression,
-                        None,
-                        rows,
-                    ),
-                    label=label,
-                    unit=get_unit(rows[0], stage_summary.summary.unit),
-                ),
+        return self.build_report(stages)
+
+    def build_row(self, row: ReportRowDict) -> ReportRow:
+        element_attribute = self.structure.datasheet_attribute
+
+        return ReportRow(
+            node_id=row[FORMULA_BUCKET_NAME]["node_id"],
+            formula_id=self.structure.formula_attribute.get(row),
+            element_def_id=element_attribute.get(row),
+            child_reference_id=self.linking_data.datasheet_elements_by_id[
+                element_attribute.get(row)
+            ].child_element_reference,
+            columns=[
+                ComputedValue(
+                    label=column.name,
+                    value=row[COLUMNS_BUCKET_NAME][column.name],
+                    unit=get_unit(row, column.unit),
+                    is_visible=column.is_visible,
+                )
+                for column in self.structure.columns
+            ],
+            row=row,
+        )
+
+    def stream(self, batch: ReportRowBatch) -> Iterator[ReportStreamItem]:
+        get_stage_label = self.structure.stage_summary.label.get
+        indexes_by_stage = group_by_key(
+            range(len(batch)), lambda index: get_stage_label(batch.row(index))
+        )
+        stages: List[ReportStage] = []
+
+        for label, indexes in indexes_by_stage.items():
+            rows: List[ReportRow] = []
+
+            for index in indexes:
+                report_row = self.build_row(batch.materialize_row(index))
+
+                if len(rows) == 0:
+                    yield ReportStageHeader(label, self.build_columns(report_row))
+
+                rows.append(report_row)
+                yield report_row
+
+            stage = self.build_stage(label, rows)
+            stages.append(
+                ReportStage(summary=stage.summary, columns=stage.columns, rows=[])
             )
-            for label, rows in report_rows_by_stage.items()
+            yield ReportStageSummary(stage.summary)
+
+        yield ReportStreamSummary(
+            name=self.linking_data.report_definition.name,
+            datasheet_id=self.linking_data.project_details.datasheet_id,
+            summaries=self.build_summaries(stages),
+            creation_date_utc=self.clock.utcnow(),
+        )
+
+    def build_columns(self, first_row: ReportRow) -> List[StageColumn]:
+        return [
+            StageColumn(
+                column.name, get_unit(first_row, column.unit), column.is_visible
+            )
+            for column in self.structure.columns
         ]
 
+    def build_stage(self, label: str, rows: List[ReportRow]) -> ReportStage:
+        stage_summary = self.structure.stage_summary
+
+        return ReportStage(
+            rows=rows,
+            columns=self.build_columns(rows[0]),
+            summary=ComputedValue(
+                value=self.evaluation_context.evaluate_row(
+                    self.linking_data.report_plan.stage_summary_expression,
+                    None,
+                    rows,
+                ),
+                label=label,
+                unit=get_unit(rows[0], stage_summary.summary.unit),
+            ),
+        )
+
+    def build_summaries(self, stages: List[ReportStage]) -> List[ComputedValue]:
+        report_plan = self.linking_data.report_plan
         metas: Dict[str, Any] = {}
         scope = {
             "stages": stages,
@@ -387,30 +459,132 @@ class ReportBuilder:
             "injector": self.linking_data.injector,
             "metas": metas,
         }
-        summaries = [
+
+        return [
             ComputedValue(
                 label=summary.name,
                 value=metas.setdefault(
                     summary.name,
-                    self.evaluation_context.evaluate(
-                        summary.expression,
-                        scope,
-                    ),
+                    self.evaluation_context.evaluate(expression, scope),
                 ),
                 unit=summary.unit,
             )
-            for summary in report_summary
+            for summary, expression in report_plan.report_summary_expressions
         ]
 
+    def build_report(self, stages: List[ReportStage]) -> Report:
         return Report(
             name=self.linking_data.report_definition.name,
             datasheet_id=self.linking_data.project_details.datasheet_id,
             stages=stages,
-            summaries=summaries,
+            summaries=self.build_summaries(stages),
             creation_date_utc=self.clock.utcnow(),
         )
 
 
+def iter_report_stream(report: Report) -> Iterator[ReportStreamItem]:
+    for stage in report.stages:
+        yield ReportStageHeader(stage.summary.label, stage.columns)
+        yield from stage.rows
+        yield ReportStageSummary(stage.summary)
+
+    yield ReportStreamSummary(
+        name=report.name,
+        datasheet_id=report.datasheet_id,
+        summaries=report.summaries,
+        creation_date_utc=report.creation_date_utc,
+    )
+
+
+def get_formula_unit_key(formula_dict: dict) -> UnitKey:
+    return (formula_dict["formula_id"].bytes, formula_dict["node_id"].bytes)
+
+
+@dataclass
+class LinkedReport:
+    linking_data: LinkingData
+    group_digest_assignation: GroupDigestAssignation
+    grouped_column_projection: GroupedColumnProjection
+    row_ordering: RowOrdering
+    report_builder: ReportBuilder
+    batch: ReportRowBatch
+    unit_indexes_by_key: Dict[UnitKey, int]
+    rows_by_unit_key: Dict[UnitKey, List[int]]
+    indexes_by_group: Dict[str, List[int]]
+    report: Optional[Report] = None
+
+    @property
+    def report_key(self) -> ReportKey:
+        return ReportKey(
+            project_id=self.linking_data.project_details.id,
+            report_definition_id=self.linking_data.report_definition.id,
+        )
+
+    @property
+    def row_count(self) -> int:
+        return len(self.batch)
+
+    def release_injector(self) -> None:
+        self.linking_data.injector = None
+        self.report_builder.evaluation_context.injector = None
+
+    def get_report_row_positions(self) -> Dict[str, Tuple[int, int]]:
+        return {
+            report_row.row[INTERNAL_BUCKET_NAME]["group_digest"]: (
+                stage_index,
+                row_index,
+            )
+            for stage_index, stage in enumerate(self.report.stages)
+            for row_index, report_row in enumerate(stage.rows)
+        }
+
+
+class ReportLinkingCache:
+    def __init__(self, max_size: int = 16, max_rows: int = 200000):
+        self.max_size = max_size
+        self.max_rows = max_rows
+        self.row_count = 0
+        self._linked_reports: Dict[Tuple[UUID, UUID], LinkedReport] = OrderedDict()
+
+    def get(self, report_key: ReportKey) -> Optional[LinkedReport]:
+        key = (report_key.project_id, report_key.report_definition_id)
+        linked_report = self._linked_reports.get(key)
+
+        if not linked_report is None:
+            self._linked_reports.move_to_end(key)
+
+        return linked_report
+
+    def set(self, linked_report: LinkedReport) -> None:
+        report_key = linked_report.report_key
+        key = (report_key.project_id, report_key.report_definition_id)
+        self._pop(key)
+
+        if linked_report.row_count > self.max_rows:
+            return
+
+        self._linked_reports[key] = linked_report
+        self.row_count = self.row_count + linked_report.row_count
+
+        while (
+            len(self._linked_reports) > self.max_size or self.row_count > self.max_rows
+        ):
+            self._pop(next(iter(self._linked_reports)))
+
+    def invalidate(self, report_key: ReportKey) -> None:
+        self._pop((report_key.project_id, report_key.report_definition_id))
+
+    def invalidate_project(self, project_id: UUID) -> None:
+        for key in [key for key in self._linked_reports if key[0] == project_id]:
+            self._pop(key)
+
+    def _pop(self, key: Tuple[UUID, UUID]) -> None:
+        linked_report = self._linked_reports.pop(key, None)
+
+        if not linked_report is None:
+            self.row_count = self.row_count - linked_report.row_count
+
+
 class ReportLinking:
     def __init__(
         self,
@@ -418,6 +592,8 @@ class ReportLinking:
         expression_evaluator: ExpressionEvaluator,
         report_row_cache_builder: ReportRowCache,
         formula_resolver: FormulaResolver,
+        report_plan_cache: ReportPlanCache,
+        report_linking_cache: ReportLinkingCache,
         clock: Clock,
         logger: LoggerFactory,
     ):
@@ -425,6 +601,8 @@ class ReportLinking:
         self.expression_evaluator = expression_evaluator
         self.report_row_cache_builder = report_row_cache_builder
         self.formula_resolver = formula_resolver
+        self.report_plan_cache = report_plan_cache
+        self.report_linking_cache = report_linking_cache
         self.clock = clock
         self.logger = logger.create(__name__)
 
@@ -434,26 +612,301 @@ class ReportLinking:
         report_definition: ReportDefinition,
         project_details: ProjectDetails,
     ) -> Report:
+        linked_report, batch = await self._link_rows(
+            report_definition, project_details
+        )
+        return linked_report.report_builder.build(batch.materialize())
+
+    @log_execution_time_async
+    async def refresh_report(
+        self,
+        report_definition: ReportDefinition,
+        project_details: ProjectDetails,
+    ) -> Report:
+        report = await self._patch_cached_report(report_definition, project_details)
+
+        if not report is None:
+            return report
+
+        linked_report, batch = await self._link_rows(
+            report_definition, project_details
+        )
+        linked_report.report = linked_report.report_builder.build(batch.materialize())
+        await self._remember_linked_report(linked_report)
+
+        return linked_report.report
+
+    async def stream_report(
+        self,
+        report_definition: ReportDefinition,
+        project_details: ProjectDetails,
+    ) -> AsyncIterator[ReportStreamItem]:
+        report = await self._patch_cached_report(report_definition, project_details)
+
+        if not report is None:
+            for item in iter_report_stream(report):
+                yield item
+
+            return
+
+        linked_report, batch = await self._link_rows(
+            report_definition, project_details
+        )
+        await self._remember_linked_report(linked_report)
+
+        for item in linked_report.report_builder.stream(batch):
+            yield item
+
+    async def _link_rows(
+        self,
+        report_definition: ReportDefinition,
+        project_details: ProjectDetails,
+    ) -> Tuple[LinkedReport, ReportRowBatch]:
         rows, linking_data = await self._preload_data(
             report_definition, project_details
         )
         evaluation_context = ReportEvaluationContext(
             self.expression_evaluator, linking_data.injector
         )
+        group_digest_assignation = GroupDigestAssignation(
+            linking_data, evaluation_context
+        )
+        grouped_column_projection = GroupedColumnProjection(
+            linking_data, evaluation_context
+        )
+        row_ordering = RowOrdering(linking_data)
         report_generation = ReportGeneration(
             join_steps=[JoinFormulaUnitInstances(linking_data)],
             mutate_steps=[
                 DatasheetElementInstanceAssignation(linking_data),
-                GroupDigestAssignation(linking_data, evaluation_context),
-            ],
-            projection_steps=[
-                GroupedColumnProjection(linking_data, evaluation_context),
-                RowOrdering(linking_data),
+                group_digest_assignation,
             ],
+            projection_steps=[grouped_column_projection, row_ordering],
+        )
+
+        batch = report_generation.apply_row_steps(rows)
+        formula_bucket = batch.buckets[FORMULA_BUCKET_NAME]
+        linked_report = LinkedReport(
+            linking_data=linking_data,
+            group_digest_assignation=group_digest_assignation,
+            grouped_column_projection=grouped_column_projection,
+            row_ordering=row_ordering,
+            report_builder=ReportBuilder(self.clock, linking_data, evaluation_context),
+            batch=batch,
+            unit_indexes_by_key=JoinFormulaUnitInstances.get_unit_indexes_by_key(
+                linking_data.unit_instances
+            ),
+            rows_by_unit_key=group_by_key(
+                range(len(batch)),
+                lambda index: get_formula_unit_key(formula_bucket[index]),
+            ),
+            indexes_by_group=GroupedColumnProjection.get_indexes_by_group(batch),
+        )
+
+        return linked_report, report_generation.apply_projection_steps(batch)
+
+    async def _remember_linked_report(self, linked_report: LinkedReport) -> None:
+        linking_data = linked_report.linking_data
+
+        if (
+            not linked_report.report is None
+            and not linking_data.report_plan.depends_on_injector
+        ):
+            linked_report.release_injector()
+            self.report_linking_cache.set(linked_report)
+
+        await self.formula_resolver.save_unit_instances(
+            linking_data.project_details.id,
+            linking_data.unit_instances_revision,
+            linking_data.unit_instances,
+        )
+
+    async def _patch_cached_report(
+        self,
+        report_definition: ReportDefinition,
+        project_details: ProjectDetails,
+    ) -> Optional[Report]:
+        report_key = ReportKey(
+            project_id=project_details.id, report_definition_id=report_definition.id
+        )
+        linked_report = self.report_linking_cache.get(report_key)
+
+        if linked_report is None:
+            return None
+
+        self.report_linking_cache.invalidate(report_key)
+        report = await self._patch_report(
+            linked_report, report_definition, project_details
+        )
+
+        if not report is None:
+            self.report_linking_cache.set(linked_report)
+
+        return report
+
+    async def _patch_report(
+        self,
+        linked_report: LinkedReport,
+        report_definition: ReportDefinition,
+        project_details: ProjectDetails,
+    ) -> Optional[Report]:
+        linking_data = linked_report.linking_data
+        report_plan = self.report_plan_cache.get(
+            report_definition, self.expression_evaluator
+        )
+
+        if (
+            report_plan.version != linking_data.report_plan.version
+            or project_details != linking_data.project_details
+        ):
+            return None
+
+        rows, unit_instances, datasheet_elements = await gather(
+            self.report_row_cache_builder.refresh_cache(report_definition),
+            self.formula_resolver.load_unit_instances(project_details.id),
+            self._find_datasheet_elements(project_details),
+        )
+
+        if (
+            unit_instances is None
+            or rows != linked_report.batch.base_rows
+            or self._index_datasheet_elements(datasheet_elements)
+            != linking_data.datasheet_elements_by_id
+        ):
+            return None
+
+        with StopWatch(self.logger, "Patching linked report"):
+            return self._patch_unit_instances(linked_report, unit_instances)
+
+    def _patch_unit_instances(
+        self, linked_report: LinkedReport, unit_instances: UnitInstanceCache
+    ) -> Optional[Report]:
+        unit_indexes_by_key = JoinFormulaUnitInstances.get_unit_indexes_by_key(
+            unit_instances
+        )
+
+        if unit_indexes_by_key.keys() != linked_report.unit_indexes_by_key.keys():
+            return None
+
+        previous_unit_instances = linked_report.linking_data.unit_instances
+        batch = linked_report.batch
+        formula_bucket = batch.buckets[FORMULA_BUCKET_NAME]
+        columns_bucket = batch.buckets[COLUMNS_BUCKET_NAME]
+        internal_bucket = batch.buckets[INTERNAL_BUCKET_NAME]
+        dirty_groups: Dict[str, bool] = {}
+
+        for key, index in unit_indexes_by_key.items():
+            previous_index = linked_report.unit_indexes_by_key[key]
+
+            if (
+                unit_instances.results[index]
+                == previous_unit_instances.results[previous_index]
+                and unit_instances.get_calculation_details(index)
+                == previous_unit_instances.get_calculation_details(previous_index)
+            ):
+                continue
+
+            report_dict = unit_instances.view(index).report_dict
+
+            for row_index in linked_report.rows_by_unit_key.get(key, []):
+                formula_bucket[row_index] = report_dict
+                columns_bucket[row_index] = {}
+                group_digest = linked_report.group_digest_assignation.evaluate_row(
+                    batch.row(row_index), columns_bucket[row_index]
+                )
+
+                if group_digest != internal_bucket[row_index]["group_digest"]:
+                    return None
+
+                dirty_groups[group_digest] = False
+
+        for group_digest in dirty_groups:
+            dirty_groups[group_digest] = (
+                linked_report.grouped_column_projection.evaluate_group(
+                    batch, linked_report.indexes_by_group[group_digest]
+                )
+            )
+
+        linked_report.linking_data.unit_instances = unit_instances
+        linked_report.unit_indexes_by_key = unit_indexes_by_key
+        linked_report.report = self._patch_report_rows(linked_report, dirty_groups)
+
+        return linked_report.report
+
+    def _patch_report_rows(
+        self, linked_report: LinkedReport, kept_by_group: Dict[str, bool]
+    ) -> Report:
+        report_builder = linked_report.report_builder
+        get_stage_label = report_builder.structure.stage_summary.label.get
+        get_order_tuple = linked_report.row_ordering.get_row_order_tuple
+        report_row_positions = linked_report.get_report_row_positions()
+        stage_rows = [list(stage.rows) for stage in linked_report.report.stages]
+        dirty_stage_indexes = set()
+
+        for group_digest, is_kept in kept_by_group.items():
+            position = report_row_positions.get(group_digest)
+
+            if is_kept != (not position is None):
+                return self._rebuild_report(linked_report)
+
+            if position is None:
+                continue
+
+            stage_index, row_index = position
+            previous_report_row = stage_rows[stage_index][row_index]
+            grouped_indexes = linked_report.indexes_by_group[group_digest]
+            report_row = report_builder.build_row(
+                linked_report.batch.materialize_row(grouped_indexes[0])
+            )
+
+            if get_stage_label(report_row) != get_stage_label(
+                previous_report_row
+            ) or get_order_tuple(report_row.row) != get_order_tuple(
+                previous_report_row.row
+            ):
+                return self._rebuild_report(linked_report)
+
+            stage_rows[stage_index][row_index] = report_row
+            dirty_stage_indexes.add(stage_index)
+
+        return report_builder.build_report(
+            [
+                report_builder.build_stage(stage.summary.label, stage_rows[index])
+                if index in dirty_stage_indexes
+                else stage
+                for index, stage in enumerate(linked_report.report.stages)
+            ]
+        )
+
+    def _rebuild_report(self, linked_report: LinkedReport) -> Report:
+        batch = linked_report.batch
+        kept_batch = batch.take(
+            grouped_indexes[0]
+            for grouped_indexes in linked_report.indexes_by_group.values()
+            if GroupedColumnProjection.is_kept(batch, grouped_indexes)
+        )
+        rows = linked_report.row_ordering.apply(kept_batch).materialize()
+
+        return linked_report.report_builder.build(rows)
+
+    async def _find_datasheet_elements(
+        self, project_details: ProjectDetails
+    ) -> List[DatasheetElement]:
+        return await self.datasheet_element_service.find_by(
+            DatasheetElementFilter(
+                datasheet_id=project_details.datasheet_id,
+                ordinal=0,
+            )
         )
 
-        rows = report_generation.apply_steps(rows)
-        return ReportBuilder(self.clock, linking_data, evaluation_context).build(rows)
+    @staticmethod
+    def _index_datasheet_elements(
+        datasheet_elements: List[DatasheetElement],
+    ) -> Dict[UUID, DatasheetElement]:
+        return {
+            datasheet_element.element_def_id: datasheet_element
+            for datasheet_element in datasheet_elements
+        }
 
     @log_execution_time_async
     async def _preload_data(
@@ -461,29 +914,27 @@ class ReportLinking:
         report_definition: ReportDefinition,
         project_details: ProjectDetails,
     ) -> Tuple[ReportRowsCache, LinkingData]:
-
+        unit_instances_revision = (
+            await self.formula_resolver.get_unit_instances_revision(project_details.id)
+        )
         rows, injector, datasheet_elements = await gather(
             self.report_row_cache_builder.refresh_cache(report_definition),
             self.formula_resolver.compute_all_project_formula(
                 project_details.id, project_details.project_definition_id
             ),
-            self.datasheet_element_service.find_by(
-                DatasheetElementFilter(
-                    datasheet_id=project_details.datasheet_id,
-                    ordinal=0,
-                )
-            ),
+            self._find_datasheet_elements(project_details),
         )
 
-        datasheet_elements_by_id = {
-            datasheet_element.element_def_id: datasheet_element
-            for datasheet_element in datasheet_elements
-        }
+        datasheet_elements_by_id = self._index_datasheet_elements(datasheet_elements)
 
         return rows, LinkingData(
             report_definition=report_definition,
             project_details=project_details,
-            unit_instances=injector.unit_instances,
+            unit_instances=UnitInstanceCache(injector.unit_instances),
+            unit_instances_revision=unit_instances_revision,
             injector=injector,
             datasheet_elements_by_id=datasheet_elements_by_id,
+            report_plan=self.report_plan_cache.get(
+                report_definition, self.expression_evaluator
+            ),
         )
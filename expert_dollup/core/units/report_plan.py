@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any, Callable, Dict, List, Tuple
+from uuid import UUID
+from expert_dollup.core.domains import *
+from .expression_evaluator import ExpressionEvaluator, CompiledExpression
+
+COLUMNS_BUCKET_NAME = "columns"
+
+
+@dataclass
+class ReportPlan:
+    report_definition_id: UUID
+    version: str
+    structure: ReportStructure
+    first_pass_expressions: List[Tuple[str, CompiledExpression]]
+    second_pass_expressions: List[Tuple[str, CompiledExpression]]
+    group_by_getters: List[Callable[[ReportRowDict], Any]]
+    order_by_getters: List[Callable[[ReportRowDict], Any]]
+    stage_summary_expression: CompiledExpression
+    report_summary_expressions: List[Tuple[ReportComputation, CompiledExpression]]
+    depends_on_injector: bool
+
+
+def get_report_definition_version(report_definition: ReportDefinition) -> str:
+    return sha256(repr(report_definition.structure).encode("utf8")).hexdigest()
+
+
+def compile_report_plan(
+    report_definition: ReportDefinition, expression_evaluator: ExpressionEvaluator
+) -> ReportPlan:
+    structure = report_definition.structure
+    footprint_columns = {
+        g.attribute_name
+        for g in structure.group_by
+        if g.bucket_name == COLUMNS_BUCKET_NAME
+    }
+
+    first_pass_columns = (
+        structure.columns
+        if len(footprint_columns) == 0
+        else [
+            column
+            for column in structure.columns
+            if column.name in footprint_columns or not column.is_visible
+        ]
+    )
+
+    first_pass_column_names = {
+        first_pass_column.name for first_pass_column in first_pass_columns
+    }
+
+    second_pass_columns = (
+        []
+        if len(footprint_columns) == 0
+        else [
+            column
+            for column in structure.columns
+            if not column.name in first_pass_column_names
+        ]
+    )
+
+    if len(second_pass_columns) == 0:
+        raise Exception("Group by require at least one aggregate")
+
+    expressions = [
+        *(column.expression for column in structure.columns),
+        structure.stage_summary.summary.expression,
+        *(summary.expression for summary in structure.report_summary),
+    ]
+
+    return ReportPlan(
+        report_definition_id=report_definition.id,
+        version=get_report_definition_version(report_definition),
+        structure=structure,
+        first_pass_expressions=[
+            (column.name, expression_evaluator.compile(column.expression))
+            for column in first_pass_columns
+        ],
+        second_pass_expressions=[
+            (column.name, expression_evaluator.compile(column.expression))
+            for column in second_pass_columns
+        ],
+        group_by_getters=[
+            attribute_bucket.get for attribute_bucket in structure.group_by
+        ],
+        order_by_getters=[
+            attribute_bucket.get for attribute_bucket in structure.order_by
+        ],
+        stage_summary_expression=expression_evaluator.compile(
+            structure.stage_summary.summary.expression
+        ),
+        report_summary_expressions=[
+            (summary, expression_evaluator.compile(summary.expression))
+            for summary in structure.report_summary
+        ],
+        depends_on_injector=any("injector" in expression for expression in expressions),
+    )
+
+
+class ReportPlanCache:
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self._plans: Dict[UUID, ReportPlan] = OrderedDict()
+
+    def get(
+        self,
+        report_definition: ReportDefinition,
+        expression_evaluator: ExpressionEvaluator,
+    ) -> ReportPlan:
+        version = get_report_definition_version(report_definition)
+        plan = self._plans.get(report_definition.id)
+
+        if plan is None or plan.version != version:
+            plan = compile_report_plan(report_definition, expression_evaluator)
+            self._plans[report_definition.id] = plan
+
+        self._plans.move_to_end(report_definition.id)
+
+        while len(self._plans) > self.max_size:
+            self._plans.popitem(last=False)
+
+        return plan
+
+    def invalidate(self, report_definition_id: UUID) -> None:
+        self._plans.pop(report_definition_id, None)
@@ -0,0 +1,40 @@
+from asyncio import Task, create_task
+from typing import Awaitable, Callable, Dict, Tuple
+from uuid import UUID
+from expert_dollup.core.domains import ReportKey
+from expert_dollup.shared.starlette_injection import LoggerFactory
+
+
+class ReportRefreshScheduler:
+    def __init__(self, logger: LoggerFactory):
+        self.logger = logger.create(__name__)
+        self._tasks: Dict[Tuple[UUID, UUID], Task] = {}
+
+    def schedule(
+        self, report_key: ReportKey, refresh: Callable[[], Awaitable[object]]
+    ) -> bool:
+        key = (report_key.project_id, report_key.report_definition_id)
+
+        if key in self._tasks:
+            return False
+
+        task = create_task(refresh())
+        self._tasks[key] = task
+        task.add_done_callback(lambda done: self._complete(key, done))
+
+        return True
+
+    def is_refreshing(self, report_key: ReportKey) -> bool:
+        return (report_key.project_id, report_key.report_definition_id) in self._tasks
+
+    def _complete(self, key: Tuple[UUID, UUID], task: Task) -> None:
+        self._tasks.pop(key, None)
+
+        if task.cancelled() or task.exception() is None:
+            return
+
+        self.logger.error(
+            "Background report refresh failed",
+            exc_info=task.exception(),
+            extra=dict(project_id=key[0], report_definition_id=key[1]),
+        )
@@ -0,0 +1,33 @@
+from hashlib import sha256
+from expert_dollup.core.domains import *
+from .data_revisions import DataRevisions, DataRevisionKey
+from .report_plan import get_report_definition_version
+
+
+class ReportRevision:
+    def __init__(self, data_revisions: DataRevisions):
+        self.data_revisions = data_revisions
+
+    async def compute(
+        self, report_definition: ReportDefinition, project_details: ProjectDetails
+    ) -> str:
+        project_definition_id = project_details.project_definition_id
+        revisions = await self.data_revisions.get_revisions(
+            [
+                DataRevisionKey.project(project_details.id),
+                DataRevisionKey.project_definition(project_definition_id),
+                DataRevisionKey.labels(project_definition_id),
+                DataRevisionKey.datasheet(project_details.datasheet_id),
+                DataRevisionKey.report_rows(report_definition.id),
+            ]
+        )
+
+        digest = sha256()
+        digest.update(get_report_definition_version(report_definition).encode("utf8"))
+        digest.update(project_definition_id.bytes)
+        digest.update(project_details.datasheet_id.bytes)
+
+        for revision in revisions:
+            digest.update(revision.encode("utf8"))
+
+        return digest.hexdigest()
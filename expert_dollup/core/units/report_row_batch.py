@@ -0,0 +1,99 @@
+from collections.abc import Mapping
+from typing import List, Dict, Any, Iterator, Iterable
+from expert_dollup.core.domains import ReportRowDict
+
+
+class ReportRowView(Mapping):
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "ReportRowBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, bucket_name: str) -> Any:
+        bucket = self._batch.buckets.get(bucket_name)
+
+        if bucket is None:
+            return self._batch.base_rows[self._batch.base_indexes[self._index]][
+                bucket_name
+            ]
+
+        return bucket[self._index]
+
+    def __iter__(self) -> Iterator[str]:
+        base_row = self._batch.base_rows[self._batch.base_indexes[self._index]]
+        yield from base_row
+
+        for bucket_name in self._batch.buckets:
+            if not bucket_name in base_row:
+                yield bucket_name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class ReportRowBatch:
+    def __init__(
+        self,
+        base_rows: List[ReportRowDict],
+        base_indexes: List[int] = None,
+        buckets: Dict[str, List[Any]] = None,
+    ):
+        self.base_rows = base_rows
+        self.base_indexes = (
+            list(range(len(base_rows))) if base_indexes is None else base_indexes
+        )
+        self.buckets: Dict[str, List[Any]] = {} if buckets is None else buckets
+
+    def __len__(self) -> int:
+        return len(self.base_indexes)
+
+    def row(self, index: int) -> ReportRowView:
+        return ReportRowView(self, index)
+
+    def rows(self) -> List[ReportRowView]:
+        return [ReportRowView(self, index) for index in range(len(self))]
+
+    def base_row(self, index: int) -> ReportRowDict:
+        return self.base_rows[self.base_indexes[index]]
+
+    def set_bucket(self, bucket_name: str, values: List[Any]) -> None:
+        assert len(values) == len(self), "Bucket must have one value per row"
+        self.buckets[bucket_name] = values
+
+    def take(self, indexes: Iterable[int]) -> "ReportRowBatch":
+        indexes = list(indexes)
+
+        return ReportRowBatch(
+            self.base_rows,
+            [self.base_indexes[index] for index in indexes],
+            {
+                bucket_name: [bucket[index] for index in indexes]
+                for bucket_name, bucket in self.buckets.items()
+            },
+        )
+
+    def materialize_row(self, index: int) -> ReportRowDict:
+        row = dict(self.base_rows[self.base_indexes[index]])
+
+        for bucket_name, bucket in self.buckets.items():
+            row[bucket_name] = bucket[index]
+
+        return row
+
+    def materialize(self) -> List[ReportRowDict]:
+        rows: List[ReportRowDict] = []
+        buckets = list(self.buckets.items())
+
+        for index, base_index in enumerate(self.base_indexes):
+            row = dict(self.base_rows[base_index])
+
+            for bucket_name, bucket in buckets:
+                row[bucket_name] = bucket[index]
+
+            rows.append(row)
+
+        return rows
@@ -1,18 +1,16 @@
 from asyncio import gather
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from uuid import UUID
 from collections import defaultdict
 from itertools import islice
-from dataclasses import dataclass
-from hashlib import sha256
-from expert_dollup.shared.database_services import (
-    JsonSerializer,
-    Repository,
-    Plucker,
-)
+from dataclasses import dataclass, field
+from expert_dollup.shared.database_services import Repository, Plucker, StopWatch
+from expert_dollup.shared.starlette_injection import LoggerFactory
 from expert_dollup.core.domains import *
 from expert_dollup.core.exceptions import ReportGenerationError, RessourceNotFound
 from expert_dollup.core.object_storage import ObjectStorage
+from .single_flight import SingleFlight
+from .data_revisions import DataRevisions, DataRevisionKey
 
 
 @dataclass
@@ -24,6 +22,9 @@ class ReportCache:
     labels_by_collection_id: Dict[UUID, List[Label]]
     labels_by_id: Dict[UUID, Label]
     label_collections_by_name: Dict[str, LabelCollection]
+    label_indexes: Dict[
+        Tuple[UUID, str], Dict[Any, List[ReportDefinitionColumnDict]]
+    ] = field(default_factory=dict)
 
 
 class ReportRowCache:
@@ -35,6 +36,9 @@ class ReportRowCache:
         label_service: Repository[Label],
         formula_plucker: Plucker[Formula],
         report_def_row_cache: ObjectStorage[ReportRowsCache, ReportRowKey],
+        single_flight: SingleFlight,
+        data_revisions: DataRevisions,
+        logger: LoggerFactory,
     ):
         self.project_definition_service = project_definition_service
         self.datasheet_definition_element_service = datasheet_definition_element_service
@@ -42,6 +46,9 @@ class ReportRowCache:
         self.label_service = label_service
         self.formula_plucker = formula_plucker
         self.report_def_row_cache = report_def_row_cache
+        self.single_flight = single_flight
+        self.data_revisions = data_revisions
+        self.logger = logger.create(__name__)
 
     async def refresh_cache(
         self, report_definition: ReportDefinition
@@ -51,11 +58,25 @@ class ReportRowCache:
             report_definition_id=report_definition.id,
         )
 
+        try:
+            return await self.report_def_row_cache.load(key)
+        except RessourceNotFound:
+            return await self.single_flight.run(
+                ("report_rows", key.project_definition_id, key.report_definition_id),
+                lambda: self._load_or_save_cache(key, report_definition),
+            )
+
+    async def _load_or_save_cache(
+        self, key: ReportRowKey, report_definition: ReportDefinition
+    ) -> ReportRowsCache:
         try:
             return await self.report_def_row_cache.load(key)
         except RessourceNotFound:
             rows = await self.build_cache(report_definition)
             await self.report_def_row_cache.save(key, rows)
+            await self.data_revisions.bump(
+                DataRevisionKey.report_rows(key.report_definition_id)
+            )
             return rows
 
     async def build_cache(
@@ -65,10 +86,21 @@ class ReportRowCache:
         report_buckets = await self._build_from_datasheet_elements(cache)
 
         for join in report_definition.structure.joins_cache:
-            report_buckets = self._join_on(report_buckets, join, cache)
+            with StopWatch(self.logger, f"Join {join.alias_name}", "Report cache join"):
+                report_buckets = self._join_on(report_buckets, join, cache)
+
+        if len(cache.warnings) > 0:
+            self.logger.warning(
+                "Report cache built with warnings",
+                extra=dict(
+                    report_definition_id=report_definition.id,
+                    warnings=cache.warnings[:20],
+                    warning_count=len(cache.warnings),
+                ),
+            )
 
         await self._join_formulas(report_buckets, report_definition)
-        report_buckets = self._distinct_rows(report_buckets)
+        report_buckets = self._distinct_rows(report_buckets, report_definition)
 
         return report_buckets
 
@@ -118,16 +150,30 @@ class ReportRowCache:
             },
         )
 
-    def _distinct_rows(self, report_buckets):
-        fingerprints = (
-            sha256(JsonSerializer.encode(row)).hexdigest() for row in report_buckets
-        )
-        seen = {}
-        filtered_bucket = [
-            seen.setdefault(fingerprint, row)
-            for fingerprint, row in zip(fingerprints, report_buckets)
-            if not fingerprint in seen
+    def _distinct_rows(
+        self, report_buckets: ReportRowsCache, report_definition: ReportDefinition
+    ) -> ReportRowsCache:
+        structure = report_definition.structure
+        aliases = [
+            structure.datasheet_selection_alias,
+            *(join.alias_name for join in structure.joins_cache),
         ]
+        formula_bucket_name = structure.formula_attribute.bucket_name
+        formula_attribute_name = structure.formula_attribute.attribute_name
+        seen = set()
+        filtered_bucket = []
+
+        for row in report_buckets:
+            fingerprint = (
+                *(row[alias]["id"] for alias in aliases),
+                row[formula_bucket_name][formula_attribute_name],
+            )
+
+            if fingerprint in seen:
+                continue
+
+            seen.add(fingerprint)
+            filtered_bucket.append(row)
 
         return filtered_bucket
 
@@ -135,15 +181,16 @@ class ReportRowCache:
         self, cache: ReportCache
     ) -> ReportRowsCache:
         selection_alias = cache.report_definition.structure.datasheet_selection_alias
-        elements = await self.datasheet_definition_element_service.find_by(
+        report_buckets: ReportRowsCache = []
+
+        async for elements in self.datasheet_definition_element_service.stream_by(
             DatasheetDefinitionElementFilter(
                 project_definition_id=cache.project_definition.id
             )
-        )
-
-        report_buckets: ReportRowsCache = [
-            {selection_alias: element.report_dict} for element in elements
-        ]
+        ):
+            report_buckets.extend(
+                {selection_alias: element.report_dict} for element in elements
+            )
 
         return report_buckets
 
@@ -215,46 +262,61 @@ class ReportRowCache:
                 avaiable_names=list(joined_collection.attributes_schema.keys()),
             )
 
-        labels = cache.labels_by_collection_id[joined_collection.id]
+        label_index = self._get_label_index(
+            cache, joined_collection, join.join_on_attribute
+        )
         new_buckets: ReportRowsCache = []
-        attributes_to_label = defaultdict(list)
         seen = set()
 
-        for label in labels:
-            a = label.get_attribute(join.join_on_attribute)
-            attributes_to_label[a].append(label)
-
         for report_bucket in report_buckets:
-            report_dict = report_bucket[join.from_object_name]
-            attribute = report_dict[join.from_property_name]
+            attribute = report_bucket[join.from_object_name][join.from_property_name]
+            matchs = label_index.get(attribute)
 
-            if attribute in attributes_to_label:
-                seen.add(attribute)
-                matchs = attributes_to_label[attribute]
-            else:
+            if matchs is None:
                 cache.warnings.append(f"Discarding attribute {attribute} for {join}")
+
                 if join.allow_dicard_element:
                     continue
 
                 raise Exception(f"Expected data {attribute} for {join}")
 
-            report_bucket[join.alias_name] = matchs[0].report_dict
-            new_buckets.append(report_bucket)
-
             if len(matchs) > 1 and join.same_cardinality:
                 raise Exception(
                     f"Expected cardinality be unchanged after join on {join}"
                 )
 
-            for label in islice(matchs, 1, len(matchs)):
+            seen.add(attribute)
+            report_bucket[join.alias_name] = matchs[0]
+            new_buckets.append(report_bucket)
+
+            for label_dict in islice(matchs, 1, None):
                 new_bucket = dict(report_bucket)
-                new_bucket[join.alias_name] = label.report_dict
+                new_bucket[join.alias_name] = label_dict
                 new_buckets.append(new_bucket)
 
-        """
-        
-        assert len(seen) == len(
-            attributes_to_label
-        ), f"Unused {len(attributes_to_label) - len(seen)} labels for collection {joined_collection.name}"
-        """
+        if join.warn_about_idle_items and len(seen) < len(label_index):
+            idle_count = len(label_index) - len(seen)
+            cache.warnings.append(
+                f"Unused {idle_count} labels for collection {joined_collection.name}"
+            )
+
         return new_buckets
+
+    def _get_label_index(
+        self, cache: ReportCache, collection: LabelCollection, attribute_name: str
+    ) -> Dict[Any, List[ReportDefinitionColumnDict]]:
+        key = (collection.id, attribute_name)
+        label_index = cache.label_indexes.get(key)
+
+        if label_index is None:
+            label_index = defaultdict(list)
+
+            for label in cache.labels_by_collection_id[collection.id]:
+                label_index[label.get_attribute(attribute_name)].append(
+                    label.report_dict
+                )
+
+            label_index = dict(label_index)
+            cache.label_indexes[key] = label_index
+
+        return label_index
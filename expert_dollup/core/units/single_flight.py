@@ -0,0 +1,139 @@
+import os
+import fcntl
+from abc import ABC, abstractmethod
+from asyncio import Future, ensure_future, shield, sleep, wait
+from contextlib import asynccontextmanager
+from contextvars import Context
+from hashlib import sha256
+from pathlib import Path
+from typing import (
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+)
+
+
+class FlightLease(ABC):
+    @abstractmethod
+    def hold(self, key: Hashable) -> AsyncContextManager[None]:
+        pass
+
+
+class FileLease(FlightLease):
+    """
+    flock on a lock file per key in a shared directory, so it only coordinates
+    processes on the same host. The kernel releases the lock when its holder
+    closes the file or dies, so a crashed holder never leaves a stale lock.
+    Lock files are kept, removing them would race with a process opening them.
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 0.05):
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        path = self.directory / f"{sha256(repr(key).encode('utf8')).hexdigest()}.lock"
+        fd = os.open(path, os.O_CREAT | os.O_RDWR)
+
+        try:
+            while not self._try_lock(fd):
+                await sleep(self.poll_interval)
+
+            yield
+        finally:
+            os.close(fd)
+
+    def _try_lock(self, fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+
+        return True
+
+
+class SingleFlight:
+    def __init__(self, lease: Optional[FlightLease] = None):
+        self.lease = lease
+        self._flights: Dict[Hashable, Future] = {}
+        self._next_flights: Dict[Hashable, Future] = {}
+
+    async def run(self, key: Hashable, build: Callable[[], Awaitable]):
+        flight = self._flights.get(key)
+
+        if flight is None:
+            flight = self._start(key, build)
+
+        return await shield(flight)
+
+    async def run_fresh(self, key: Hashable, build: Callable[[], Awaitable]):
+        running = self._flights.get(key)
+
+        if running is None:
+            return await shield(self._start(key, build))
+
+        next_flight = self._next_flights.get(key)
+
+        if next_flight is None:
+            next_flight = ensure_future(self._run_after(key, running, build))
+            self._next_flights[key] = next_flight
+
+        return await shield(next_flight)
+
+    async def run_after(self, key: Hashable, build: Callable[[], Awaitable]):
+        while True:
+            pending = [
+                flight
+                for flight in (self._flights.get(key), self._next_flights.get(key))
+                if not flight is None
+            ]
+
+            if len(pending) == 0:
+                return await shield(self._start(key, build))
+
+            await wait(pending)
+
+    def is_running(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def _run_after(
+        self, key: Hashable, running: Future, build: Callable[[], Awaitable]
+    ):
+        await wait([running])
+        self._next_flights.pop(key, None)
+        flight = self._flights.get(key)
+
+        if flight is None:
+            flight = self._start(key, build)
+
+        return await flight
+
+    def _start(self, key: Hashable, build: Callable[[], Awaitable]) -> Future:
+        # A flight is shared by every caller, so it runs in an empty context
+        # instead of inheriting the starter's one, like a pinned db connection.
+        flight = Context().run(ensure_future, self._fly(key, build))
+        self._flights[key] = flight
+
+        def complete(done: Future) -> None:
+            if self._flights.get(key) is done:
+                del self._flights[key]
+
+            if not done.cancelled():
+                done.exception()
+
+        flight.add_done_callback(complete)
+
+        return flight
+
+    async def _fly(self, key: Hashable, build: Callable[[], Awaitable]):
+        if self.lease is None:
+            return await build()
+
+        async with self.lease.hold(key):
+            return await build()
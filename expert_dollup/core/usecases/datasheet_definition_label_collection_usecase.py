@@ -1,22 +1,36 @@
 from uuid import UUID
 from expert_dollup.shared.database_services import Repository
 from expert_dollup.core.domains import LabelCollection
+from expert_dollup.core.units import DataRevisions
+from expert_dollup.core.units.data_revisions import DataRevisionKey
 
 
 class LabelCollectionUseCase:
-    def __init__(self, label_collection_service: Repository[LabelCollection]):
+    def __init__(
+        self,
+        label_collection_service: Repository[LabelCollection],
+        data_revisions: DataRevisions,
+    ):
         self.label_collection_service = label_collection_service
+        self.data_revisions = data_revisions
 
     async def find_by_id(self, id: UUID):
         return await self.label_collection_service.find_by_id(id)
 
     async def add(self, label_collection: LabelCollection) -> LabelCollection:
         await self.label_collection_service.insert(label_collection)
+        await self._bump_revision(label_collection.project_definition_id)
         return await self.label_collection_service.find_by_id(label_collection.id)
 
     async def update(self, label_collection: LabelCollection) -> LabelCollection:
         await self.label_collection_service.upserts([label_collection])
+        await self._bump_revision(label_collection.project_definition_id)
         return await self.label_collection_service.find_by_id(label_collection.id)
 
     async def delete_by_id(self, id: UUID) -> None:
+        label_collection = await self.label_collection_service.find_by_id(id)
         await self.label_collection_service.delete_by_id(id)
+        await self._bump_revision(label_collection.project_definition_id)
+
+    async def _bump_revision(self, project_definition_id: UUID) -> None:
+        await self.data_revisions.bump(DataRevisionKey.labels(project_definition_id))
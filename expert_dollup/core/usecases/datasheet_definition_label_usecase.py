@@ -1,22 +1,43 @@
 from uuid import UUID
 from expert_dollup.shared.database_services import Repository
-from expert_dollup.core.domains import Label
+from expert_dollup.core.domains import Label, LabelCollection
+from expert_dollup.core.units import DataRevisions
+from expert_dollup.core.units.data_revisions import DataRevisionKey
 
 
 class LabelUseCase:
-    def __init__(self, label_service: Repository[Label]):
+    def __init__(
+        self,
+        label_service: Repository[Label],
+        label_collection_service: Repository[LabelCollection],
+        data_revisions: DataRevisions,
+    ):
         self.label_service = label_service
+        self.label_collection_service = label_collection_service
+        self.data_revisions = data_revisions
 
     async def find_by_id(self, id: UUID):
         return await self.label_service.find_by_id(id)
 
     async def add(self, label: Label) -> Label:
         await self.label_service.insert(label)
+        await self._bump_revision(label.label_collection_id)
         return await self.label_service.find_by_id(label.id)
 
     async def update(self, label: Label) -> Label:
         await self.label_service.upserts([label])
+        await self._bump_revision(label.label_collection_id)
         return await self.label_service.find_by_id(label.id)
 
     async def delete_by_id(self, id: UUID):
+        label = await self.label_service.find_by_id(id)
         await self.label_service.delete_by_id(id)
+        await self._bump_revision(label.label_collection_id)
+
+    async def _bump_revision(self, label_collection_id: UUID) -> None:
+        label_collection = await self.label_collection_service.find_by_id(
+            label_collection_id
+        )
+        await self.data_revisions.bump(
+            DataRevisionKey.labels(label_collection.project_definition_id)
+        )
@@ -4,6 +4,8 @@ from expert_dollup.core.domains.project_definition import ProjectDefinition
 from expert_dollup.core.exceptions import ValidationError, InvalidUsageError
 from expert_dollup.core.domains import *
 from expert_dollup.shared.database_services import Repository
+from expert_dollup.core.units import DataRevisions
+from expert_dollup.core.units.data_revisions import DataRevisionKey
 from expert_dollup.infra.validators.schema_validator import SchemaValidator
 from expert_dollup.shared.starlette_injection import Clock
 
@@ -18,6 +20,7 @@ class DatasheetElementUseCase:
         ressource_service: Repository[Ressource],
         project_definition_service: Repository[ProjectDefinition],
         clock: Clock,
+        data_revisions: DataRevisions,
     ):
         self.datasheet_service = datasheet_service
         self.datasheet_element_service = datasheet_element_service
@@ -26,6 +29,7 @@ class DatasheetElementUseCase:
         self.project_definition_service = project_definition_service
         self.ressource_service = ressource_service
         self.clock = clock
+        self.data_revisions = data_revisions
 
     async def find_datasheet_element(self, id: DatasheetElementId) -> DatasheetElement:
         return await self.datasheet_element_service.find_by_id(id)
@@ -57,6 +61,7 @@ class DatasheetElementUseCase:
                 child_element_reference=id.child_element_reference,
             ),
         )
+        await self.data_revisions.bump(DataRevisionKey.datasheet(id.datasheet_id))
 
         return await self.datasheet_element_service.find_by_id(id)
 
@@ -97,6 +102,7 @@ class DatasheetElementUseCase:
             creation_date_utc=self.clock.utcnow(),
         )
         await self.datasheet_element_service.insert(new_element)
+        await self.data_revisions.bump(DataRevisionKey.datasheet(datasheet_id))
 
         return new_element
 
@@ -121,6 +127,9 @@ class DatasheetElementUseCase:
             raise InvalidUsageError("Cannot delete all items of collection")
 
         await self.datasheet_element_service.delete_by_id(element_id)
+        await self.data_revisions.bump(
+            DataRevisionKey.datasheet(element_id.datasheet_id)
+        )
 
     def _validate_datasheet_element_properties(
         self,
@@ -15,6 +15,7 @@ class DistributableUseCase:
         project_service: Repository[ProjectDetails],
         report_linking: ReportLinking,
         report_storage: ObjectStorage[Report, ReportKey],
+        report_revision: ReportRevision,
     ):
         self.distributable_service = distributable_service
         self.report_distributor = report_distributor
@@ -22,6 +23,7 @@ class DistributableUseCase:
         self.project_service = project_service
         self.report_linking = report_linking
         self.report_storage = report_storage
+        self.report_revision = report_revision
 
     async def distributable_reports(self, project_id: UUID) -> List[ReportDefinition]:
         project_details = await self.project_service.find_by_id(project_id)
@@ -59,9 +61,13 @@ class DistributableUseCase:
         report_key = ReportKey(
             project_id=project_id, report_definition_id=report_definition_id
         )
-        report = await self.report_linking.link_report(
+        revision = await self.report_revision.compute(
             report_definition, project_details
         )
+        report = await self.report_linking.refresh_report(
+            report_definition, project_details
+        )
+        report.revision = revision
         await self.report_storage.save(report_key, report)
         distributable_items = await self.distributable_service.find_by(
             DistributableItemFilter(
@@ -1,8 +1,9 @@
 from typing import List
 from uuid import UUID
 from expert_dollup.core.domains import *
-from expert_dollup.core.object_storage import ObjectStorage
-from expert_dollup.core.units import FormulaResolver
+from expert_dollup.core.units import FormulaResolver, DataRevisions
+from expert_dollup.core.units.data_revisions import DataRevisionKey
+from expert_dollup.infra.storages.object_cache import ObjectCache
 from expert_dollup.shared.database_services import Repository
 
 
@@ -12,14 +13,14 @@ class FormulaUseCase:
         formula_service: Repository[Formula],
         formula_resolver: FormulaResolver,
         project_service: Repository[ProjectDetails],
-        formula_instance_service: ObjectStorage[
-            UnitInstanceCache, UnitInstanceCacheKey
-        ],
+        object_cache: ObjectCache,
+        data_revisions: DataRevisions,
     ):
         self.formula_service = formula_service
         self.formula_resolver = formula_resolver
         self.project_service = project_service
-        self.formula_instance_service = formula_instance_service
+        self.object_cache = object_cache
+        self.data_revisions = data_revisions
 
     async def find_by_id(self, formula_id: UUID) -> Formula:
         return await self.formula_service.find_by_id(formula_id)
@@ -30,6 +31,13 @@ class FormulaUseCase:
 
         formula = await self.formula_resolver.parse(formula_expression)
         await self.formula_service.insert(formula)
+        self.object_cache.invalidate_project_definition(formula.project_definition_id)
+        await self.formula_resolver.patch_staged_formulas(
+            formula.project_definition_id, [formula]
+        )
+        await self.data_revisions.bump(
+            DataRevisionKey.project_definition(formula.project_definition_id)
+        )
 
         return formula
 
@@ -37,16 +45,27 @@ class FormulaUseCase:
         formulas = await self.formula_resolver.parse_many(formula_expressions)
         await self.formula_service.insert_many(formulas)
 
+        for project_definition_id in {
+            formula.project_definition_id for formula in formulas
+        }:
+            self.object_cache.invalidate_project_definition(project_definition_id)
+            await self.formula_resolver.patch_staged_formulas(
+                project_definition_id,
+                [
+                    formula
+                    for formula in formulas
+                    if formula.project_definition_id == project_definition_id
+                ],
+            )
+            await self.data_revisions.bump(
+                DataRevisionKey.project_definition(project_definition_id)
+            )
+
     async def delete_by_id(self, formula_id: UUID, remove_recursively: bool):
         await self.formula_service.find_by_id(formula_id)
 
     async def compute_project_formulas(self, project_id) -> UnitInstanceCache:
         project_details = await self.project_service.find_by_id(project_id)
-        injector = await self.formula_resolver.compute_all_project_formula(
+        return await self.formula_resolver.refresh_project_formulas(
             project_id, project_details.project_definition_id
         )
-        instances = injector.unit_instances
-        await self.formula_instance_service.save(
-            UnitInstanceCacheKey(project_id=project_id), instances
-        )
-        return instances
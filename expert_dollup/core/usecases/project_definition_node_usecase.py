@@ -5,7 +5,9 @@ from expert_dollup.core.domains import *
 from expert_dollup.shared.database_services import Page, Paginator, Repository
 from expert_dollup.shared.starlette_injection import LoggerFactory
 from expert_dollup.core.builders import ProjectDefinitionTreeBuilder
-from expert_dollup.core.units import NodeValueValidation
+from expert_dollup.core.units import NodeValueValidation, DataRevisions
+from expert_dollup.core.units.data_revisions import DataRevisionKey
+from expert_dollup.infra.storages.object_cache import ObjectCache
 from expert_dollup.core.repositories import ProjectDefinitionNodeRepository
 
 
@@ -17,6 +19,8 @@ class ProjectDefinitionNodeUseCase:
         project_definition_node_repository: ProjectDefinitionNodeRepository,
         project_definition_tree_builder: ProjectDefinitionTreeBuilder,
         node_value_validation: NodeValueValidation,
+        object_cache: ObjectCache,
+        data_revisions: DataRevisions,
         logger: LoggerFactory,
     ):
         self.project_definition_node_paginator = project_definition_node_paginator
@@ -24,20 +28,29 @@ class ProjectDefinitionNodeUseCase:
         self.project_definition_node_repository = project_definition_node_repository
         self.project_definition_tree_builder = project_definition_tree_builder
         self.node_value_validation = node_value_validation
+        self.object_cache = object_cache
+        self.data_revisions = data_revisions
         self.logger = logger.create(__name__)
 
     async def add(self, domain: ProjectDefinitionNode) -> ProjectDefinitionNode:
         await self._ensure_node_is_valid(domain)
         await self.project_definition_node_repository.insert(domain)
+        self.object_cache.invalidate_project_definition(domain.project_definition_id)
+        await self._bump_revision(domain.project_definition_id)
         return await self.find_by_id(domain.id)
 
     async def delete_by_id(self, id: UUID) -> None:
+        node = await self.project_definition_node_repository.find_by_id(id)
         await self.project_definition_node_repository.delete_child_of(id)
         await self.project_definition_node_repository.delete_by_id(id)
+        self.object_cache.invalidate_project_definition(node.project_definition_id)
+        await self._bump_revision(node.project_definition_id)
 
     async def update(self, domain: ProjectDefinitionNode) -> None:
         await self._ensure_node_is_valid(domain)
         await self.project_definition_node_repository.upserts([domain])
+        self.object_cache.invalidate_project_definition(domain.project_definition_id)
+        await self._bump_revision(domain.project_definition_id)
         return domain
 
     async def find_by_id(self, id: UUID) -> ProjectDefinitionNode:
@@ -88,6 +101,11 @@ class ProjectDefinitionNodeUseCase:
         tree = self.project_definition_tree_builder.build(form_definitions)
         return tree
 
+    async def _bump_revision(self, project_definition_id: UUID) -> None:
+        await self.data_revisions.bump(
+            DataRevisionKey.project_definition(project_definition_id)
+        )
+
     async def _ensure_node_is_valid(self, domain: ProjectDefinitionNode) -> None:
         has_project_def = await self.project_definition_service.has(
             domain.project_definition_id
@@ -3,6 +3,9 @@ from expert_dollup.shared.starlette_injection import Clock
 from expert_dollup.shared.database_services import DatabaseContext
 from expert_dollup.core.exceptions import RessourceNotFound
 from expert_dollup.core.domains import *
+from expert_dollup.core.units import DataRevisions
+from expert_dollup.core.units.data_revisions import DataRevisionKey
+from expert_dollup.infra.storages.object_cache import ObjectCache
 from expert_dollup.infra.providers import WordProvider
 from expert_dollup.core.utils.ressource_permissions import authorization_factory
 
@@ -13,10 +16,14 @@ class ProjectDefinitonUseCase:
         db_context: DatabaseContext,
         word_provider: WordProvider,
         clock: Clock,
+        object_cache: ObjectCache,
+        data_revisions: DataRevisions,
     ):
         self.db_context = db_context
         self.word_provider = word_provider
         self.clock = clock
+        self.object_cache = object_cache
+        self.data_revisions = data_revisions
 
     async def add(self, domain: ProjectDefinition, user: User) -> ProjectDefinition:
         ressource = authorization_factory.allow_access_to(domain, user)
@@ -38,6 +45,8 @@ class ProjectDefinitonUseCase:
         await self.db_context.delete_by_id(ProjectDefinition, id)
         await self.db_context.delete_by_id(Datasheet, definition.default_datasheet_id)
         await self.db_context.delete_by(Ressource, RessourceFilter(id=id))
+        self.object_cache.invalidate_project_definition(id)
+        await self.data_revisions.bump(DataRevisionKey.project_definition(id))
 
     async def update(self, domain: ProjectDefinition) -> ProjectDefinition:
         await self.db_context.update(
@@ -49,6 +58,8 @@ class ProjectDefinitonUseCase:
             ),
             ProjectDefinitionFilter(id=domain.id),
         )
+        self.object_cache.invalidate_project_definition(domain.id)
+        await self.data_revisions.bump(DataRevisionKey.project_definition(domain.id))
         return domain
 
     async def find_by_id(self, id: UUID) -> ProjectDefinition:
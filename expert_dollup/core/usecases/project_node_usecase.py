@@ -1,7 +1,14 @@
 from typing import List, Optional
 from uuid import UUID
 from expert_dollup.shared.database_services import Repository
-from expert_dollup.core.units import NodeValueValidation, NodeEventDispatcher
+from expert_dollup.core.units import (
+    NodeValueValidation,
+    NodeEventDispatcher,
+    FormulaResolver,
+    DataRevisions,
+)
+from expert_dollup.core.units.data_revisions import DataRevisionKey
+from expert_dollup.core.units.report_linking import ReportLinkingCache
 from expert_dollup.core.builders import ProjectNodeSliceBuilder, ProjectTreeBuilder
 from expert_dollup.core.repositories import *
 from expert_dollup.core.domains import *
@@ -17,6 +24,9 @@ class ProjectNodeUseCase:
         project_node_slice_builder: ProjectNodeSliceBuilder,
         project_tree_builder: ProjectTreeBuilder,
         project_node_meta: ProjectNodeMetaRepository,
+        report_linking_cache: ReportLinkingCache,
+        formula_resolver: FormulaResolver,
+        data_revisions: DataRevisions,
     ):
         self.project_service = project_service
         self.project_node_service = project_node_service
@@ -25,6 +35,9 @@ class ProjectNodeUseCase:
         self.project_node_slice_builder = project_node_slice_builder
         self.project_tree_builder = project_tree_builder
         self.project_node_meta = project_node_meta
+        self.report_linking_cache = report_linking_cache
+        self.formula_resolver = formula_resolver
+        self.data_revisions = data_revisions
 
     async def find_by_type(self, project_id: UUID, type_id: UUID) -> List[ProjectNode]:
         results = await self.project_node_service.find_by(
@@ -82,9 +95,11 @@ class ProjectNodeUseCase:
     async def update_node_value(
         self, project_id: UUID, node_id: UUID, value: PrimitiveWithNoneUnion
     ) -> ProjectNode:
-        return await self.node_event_dispatcher.update_node_value(
+        node = await self.node_event_dispatcher.update_node_value(
             project_id, node_id, value
         )
+        await self.data_revisions.bump(DataRevisionKey.project(project_id))
+        return node
 
     async def update_nodes_value(
         self, project_id: UUID, updates: List[FieldUpdate]
@@ -92,6 +107,7 @@ class ProjectNodeUseCase:
         results = await self.node_event_dispatcher.update_nodes_value(
             project_id, updates
         )
+        await self.data_revisions.bump(DataRevisionKey.project(project_id))
         return results
 
     async def add_many(self, nodes: List[ProjectNode]):
@@ -108,6 +124,8 @@ class ProjectNodeUseCase:
             bounded_node = BoundedNode(node=node, definition=definition)
             await self.node_event_dispatcher.execute_node_trigger(bounded_node)
 
+        await self._invalidate_project_structure(project_id)
+
     async def add_collection(
         self,
         project_id: UUID,
@@ -124,6 +142,8 @@ class ProjectNodeUseCase:
         for bounded_node in bounded_node_slice.bounded_nodes:
             await self.node_event_dispatcher.execute_node_trigger(bounded_node)
 
+        await self._invalidate_project_structure(project_id)
+
         return nodes
 
     async def clone_collection(
@@ -138,6 +158,8 @@ class ProjectNodeUseCase:
         for bounded_node in bounded_node_slice.bounded_nodes:
             await self.node_event_dispatcher.execute_node_trigger(bounded_node)
 
+        await self._invalidate_project_structure(project_id)
+
         return nodes
 
     async def remove_collection(self, project_id: UUID, node_id: UUID) -> ProjectNode:
@@ -146,4 +168,10 @@ class ProjectNodeUseCase:
         )
         await self.project_node_service.remove_collection(node)
         await self.project_node_service.delete_by_id(node.id)
+        await self._invalidate_project_structure(project_id)
         return node
+
+    async def _invalidate_project_structure(self, project_id: UUID):
+        self.report_linking_cache.invalidate_project(project_id)
+        await self.formula_resolver.invalidate_project_formulas(project_id)
+        await self.data_revisions.bump(DataRevisionKey.project(project_id))
@@ -1,5 +1,5 @@
 from uuid import UUID
-from expert_dollup.shared.database_services import Repository
+from expert_dollup.shared.database_services import Repository, DatabaseContext
 from expert_dollup.core.builders import ProjectBuilder
 from expert_dollup.shared.starlette_injection import LoggerFactory
 from expert_dollup.core.domains import (
@@ -22,6 +22,7 @@ class ProjectUseCase:
         project_node_meta_service: Repository[ProjectNodeMeta],
         ressource_service: Repository[Ressource],
         project_builder: ProjectBuilder,
+        db_context: DatabaseContext,
         logger: LoggerFactory,
     ):
         self.project_service = project_service
@@ -29,18 +30,28 @@ class ProjectUseCase:
         self.project_node_meta_service = project_node_meta_service
         self.ressource_service = ressource_service
         self.project_builder = project_builder
+        self.db_context = db_context
         self.logger = logger.create(__name__)
 
     async def add(self, project_details: ProjectDetails, user: User) -> ProjectDetails:
         project = await self.project_builder.build_new(project_details, user)
-        await self._insert_new_project(project)
+        await self.db_context.transaction(lambda: self._insert_new_project(project))
 
         return project_details
 
     async def clone(self, project_id: UUID, user: User) -> ProjectDetails:
         project_details = await self.project_service.find_by_id(project_id)
         cloned_project = await self.project_builder.clone(project_details, user)
-        await self._insert_new_project(cloned_project)
+
+        async def insert_cloned_project():
+            await self._insert_new_project(cloned_project)
+
+            async for cloned_nodes in self.project_builder.clone_project_nodes(
+                project_id, cloned_project.details
+            ):
+                await self.project_node_service.insert_many(cloned_nodes)
+
+        await self.db_context.transaction(insert_cloned_project)
 
         return cloned_project.details
 
@@ -2,7 +2,9 @@ from re import I
 from uuid import UUID
 from typing import List
 from expert_dollup.core.object_storage import ObjectStorage
-from expert_dollup.core.units import ReportRowCache
+from expert_dollup.core.units import ReportRowCache, DataRevisions
+from expert_dollup.core.units.data_revisions import DataRevisionKey
+from expert_dollup.core.units.report_plan import ReportPlanCache
 from expert_dollup.core.domains import *
 from expert_dollup.shared.database_services import Repository
 
@@ -15,15 +17,20 @@ class ReportDefinitionUseCase:
         report_definition_row_cache_service: ObjectStorage[
             ReportRowsCache, ReportRowKey
         ],
+        report_plan_cache: ReportPlanCache,
+        data_revisions: DataRevisions,
     ):
         self.report_definition_service = report_definition_service
         self.report_row_cache_builder = report_row_cache_builder
         self.report_definition_row_cache_service = report_definition_row_cache_service
+        self.report_plan_cache = report_plan_cache
+        self.data_revisions = data_revisions
 
     async def refresh_cache(self, report_definition_id: UUID) -> None:
         report_definition = await self.report_definition_service.find_by_id(
             report_definition_id
         )
+        self.report_plan_cache.invalidate(report_definition_id)
         report_cached_rows = await self.report_row_cache_builder.refresh_cache(
             report_definition
         )
@@ -34,9 +41,13 @@ class ReportDefinitionUseCase:
             ),
             report_cached_rows,
         )
+        await self.data_revisions.bump(
+            DataRevisionKey.report_rows(report_definition_id)
+        )
 
     async def add(self, report_definition: ReportDefinition):
         await self.report_definition_service.insert(report_definition)
+        self.report_plan_cache.invalidate(report_definition.id)
 
     async def find_all_reports_definitions(
         self, project_definition_id: UUID
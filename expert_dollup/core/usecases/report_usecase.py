@@ -1,7 +1,10 @@
-from typing import List
+from typing import List, AsyncIterator, Optional
 from uuid import UUID
+from asyncio import gather
 from expert_dollup.core.domains import *
-from expert_dollup.core.units import ReportLinking
+from expert_dollup.core.exceptions import RessourceNotFound
+from expert_dollup.core.units import ReportLinking, ReportRevision
+from expert_dollup.core.units.report_refresh_scheduler import ReportRefreshScheduler
 from expert_dollup.core.object_storage import ObjectStorage
 from expert_dollup.shared.database_services import Repository
 
@@ -13,11 +16,15 @@ class ReportUseCase:
         project_service: Repository[ProjectDetails],
         report_linking: ReportLinking,
         report_storage: ObjectStorage[Report, ReportKey],
+        report_revision: ReportRevision,
+        report_refresh_scheduler: ReportRefreshScheduler,
     ):
         self.report_definition_service = report_definition_service
         self.project_service = project_service
         self.report_linking = report_linking
         self.report_storage = report_storage
+        self.report_revision = report_revision
+        self.report_refresh_scheduler = report_refresh_scheduler
 
     async def get_report(
         self, project_id: UUID, report_definition_id: UUID, save_report: bool = False
@@ -26,16 +33,70 @@ class ReportUseCase:
         report_definition = await self.report_definition_service.find_by_id(
             report_definition_id
         )
-        report = await self.report_linking.link_report(
-            report_definition, project_details
+        report_key = ReportKey(
+            project_id=project_id, report_definition_id=report_definition_id
         )
 
         if save_report:
-            await self.report_storage.save(
-                ReportKey(
-                    project_id=project_id, report_definition_id=report_definition_id
+            return await self._refresh_stored_report(
+                report_key, report_definition, project_details
+            )
+
+        revision, stored_report = await gather(
+            self.report_revision.compute(report_definition, project_details),
+            self._load_stored_report(report_key),
+        )
+
+        if stored_report is None:
+            return await self._refresh_stored_report(
+                report_key, report_definition, project_details, revision
+            )
+
+        if stored_report.revision != revision:
+            self.report_refresh_scheduler.schedule(
+                report_key,
+                lambda: self._refresh_stored_report(
+                    report_key, report_definition, project_details
                 ),
-                report,
             )
 
+        return stored_report
+
+    async def stream_report(
+        self, project_id: UUID, report_definition_id: UUID
+    ) -> AsyncIterator[ReportStreamItem]:
+        project_details = await self.project_service.find_by_id(project_id)
+        report_definition = await self.report_definition_service.find_by_id(
+            report_definition_id
+        )
+
+        async for item in self.report_linking.stream_report(
+            report_definition, project_details
+        ):
+            yield item
+
+    async def _load_stored_report(self, report_key: ReportKey) -> Optional[Report]:
+        try:
+            return await self.report_storage.load(report_key)
+        except RessourceNotFound:
+            return None
+
+    async def _refresh_stored_report(
+        self,
+        report_key: ReportKey,
+        report_definition: ReportDefinition,
+        project_details: ProjectDetails,
+        revision: Optional[str] = None,
+    ) -> Report:
+        if revision is None:
+            revision = await self.report_revision.compute(
+                report_definition, project_details
+            )
+
+        report = await self.report_linking.refresh_report(
+            report_definition, project_details
+        )
+        report.revision = revision
+        await self.report_storage.save(report_key, report)
+
         return report
@@ -461,6 +461,17 @@ class MeasureUnitDao(BaseModel):
     id: str = Field(max_length=16)
 
 
+class DataRevisionDao(BaseModel):
+    class Meta:
+        pk = "id"
+
+    class Config:
+        title = "data_revision"
+
+    id: str = Field(max_length=64)
+    revision: UUID
+
+
 class ComputedValueDao(BaseModel):
     label: str
     value: PrimitiveUnionDao
@@ -24,7 +24,7 @@ class UnitInstanceDao(BaseModel):
     node_id: UUID
     node_path: List[UUID]
     name: str
-    calculation_details: str
+    calculation_details: Optional[str]
     result: PrimitiveUnionDao
 
 
@@ -70,6 +70,7 @@ class ReportDao(BaseModel):
     stages: List[ReportStageDao]
     summaries: List[ComputedValueDao]
     creation_date_utc: datetime
+    revision: Optional[str] = None
 
 
 class StagedFormulaDao(BaseModel):
@@ -1154,6 +1154,14 @@ def map_measure_unit_to_dao(src: MeasureUnit, mapper: Mapper) -> MeasureUnitDao:
     return MeasureUnitDao(id=src.id)
 
 
+def map_data_revision_from_dao(src: DataRevisionDao, mapper: Mapper) -> DataRevision:
+    return DataRevision(id=src.id, revision=src.revision)
+
+
+def map_data_revision_to_dao(src: DataRevision, mapper: Mapper) -> DataRevisionDao:
+    return DataRevisionDao(id=src.id, revision=src.revision)
+
+
 def map_report_definition_from_dao(
     src: ReportDefinitionDao, mapper: Mapper
 ) -> ReportDefinition:
@@ -1374,6 +1382,7 @@ def map_report_to_dao(src: Report, mapper: Mapper) -> ReportDao:
         creation_date_utc=src.creation_date_utc,
         summaries=mapper.map_many(src.summaries, ComputedValueDao),
         stages=mapper.map_many(src.stages, ReportStageDao),
+        revision=src.revision,
     )
 
 
@@ -1384,6 +1393,7 @@ def map_report_from_dao(src: ReportDao, mapper: Mapper) -> Report:
         creation_date_utc=src.creation_date_utc,
         summaries=mapper.map_many(src.summaries, ComputedValue),
         stages=mapper.map_many(src.stages, ReportStage),
+        revision=src.revision,
     )
 
 
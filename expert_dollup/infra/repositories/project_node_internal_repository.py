@@ -81,9 +81,12 @@ class ProjectNodeInternalRepository(
         return results
 
     async def get_all_fields(self, project_id: UUID) -> List[ProjectNode]:
-        nodes = await self.find_by(
+        nodes = []
+
+        async for nodes_chunk in self.stream_by(
             ProjectNodeFilter(project_id=project_id, level=FIELD_LEVEL)
-        )
+        ):
+            nodes.extend(nodes_chunk)
 
         return nodes
 
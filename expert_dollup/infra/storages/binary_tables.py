@@ -0,0 +1,66 @@
+import struct
+from typing import Dict, List
+from uuid import UUID
+
+STRING_LENGTH = struct.Struct("<I")
+
+
+class StringTable:
+    def __init__(self):
+        self.strings: List[bytes] = []
+        self.index_by_string: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        index = self.index_by_string.get(value)
+
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(value.encode("utf8"))
+            self.index_by_string[value] = index
+
+        return index
+
+    def dump(self) -> bytes:
+        return b"".join(
+            STRING_LENGTH.pack(len(value)) + value for value in self.strings
+        )
+
+
+class UuidTable:
+    def __init__(self):
+        self.uuids: List[bytes] = []
+        self.index_by_uuid: Dict[UUID, int] = {}
+
+    def add(self, value: UUID) -> int:
+        index = self.index_by_uuid.get(value)
+
+        if index is None:
+            index = len(self.uuids)
+            self.uuids.append(value.bytes)
+            self.index_by_uuid[value] = index
+
+        return index
+
+    def dump(self) -> bytes:
+        return b"".join(self.uuids)
+
+
+def load_strings(data: memoryview, offset: int, count: int):
+    strings: List[str] = []
+
+    for _ in range(0, count):
+        (string_len,) = STRING_LENGTH.unpack_from(data, offset)
+        offset = offset + STRING_LENGTH.size
+        strings.append(str(data[offset : offset + string_len], "utf8"))
+        offset = offset + string_len
+
+    return strings, offset
+
+
+def load_uuids(data: memoryview, offset: int, count: int):
+    end = offset + count * 16
+    uuids = [
+        UUID(bytes=bytes(data[index : index + 16]))
+        for index in range(offset, end, 16)
+    ]
+    return uuids, end
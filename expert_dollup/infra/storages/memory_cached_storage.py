@@ -0,0 +1,31 @@
+from expert_dollup.core.object_storage import ObjectStorage, Domain, ObjectContext
+from .object_cache import ObjectCache
+
+
+class MemoryCachedStorage(ObjectStorage[Domain, ObjectContext]):
+    def __init__(
+        self,
+        storage: ObjectStorage[Domain, ObjectContext],
+        object_cache: ObjectCache,
+        namespace: str,
+    ):
+        self.storage = storage
+        self.object_cache = object_cache
+        self.namespace = namespace
+
+    async def save(self, ctx: ObjectContext, data: Domain) -> None:
+        self.object_cache.invalidate(self.namespace, ctx)
+        await self.storage.save(ctx, data)
+        self.object_cache.set(self.namespace, ctx, data)
+
+    async def load(self, ctx: ObjectContext) -> Domain:
+        data = self.object_cache.get(self.namespace, ctx)
+
+        if data is None:
+            data = await self.storage.load(ctx)
+            self.object_cache.set(self.namespace, ctx, data)
+
+        return data
+
+    def get_url(self, ctx: ObjectContext) -> str:
+        return self.storage.get_url(ctx)
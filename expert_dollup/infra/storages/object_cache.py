@@ -0,0 +1,171 @@
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass, is_dataclass, astuple, replace
+from sys import getsizeof
+from time import monotonic
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+
+
+@dataclass
+class ObjectCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+
+@dataclass
+class ObjectCacheEntry:
+    context: Any
+    value: Any
+    size_bytes: int
+    expires_at: float
+
+
+def estimate_size(value: Any) -> int:
+    seen = set()
+    pending = [value]
+    size = 0
+
+    while len(pending) > 0:
+        item = pending.pop()
+
+        if id(item) in seen:
+            continue
+
+        seen.add(id(item))
+        size += getsizeof(item)
+
+        if isinstance(item, (str, bytes, int, float, bool, UUID)) or item is None:
+            continue
+
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        elif hasattr(item, "__dict__"):
+            pending.append(item.__dict__)
+
+    return size
+
+
+def get_context_key(context: Any) -> Hashable:
+    return astuple(context) if is_dataclass(context) else context
+
+
+class ObjectCache:
+    """
+    Writes only invalidate entries of this process, other workers see them once
+    the ttl expires, and a ttl_seconds of 0 turns caching off. Values are copied
+    in and out, so callers never share a cached object.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float = 60,
+        now: Callable[[], float] = monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.now = now
+        self.size_bytes = 0
+        self._entries: Dict[Tuple[str, Hashable], ObjectCacheEntry] = OrderedDict()
+        self._stats: Dict[str, ObjectCacheStats] = {}
+
+    def get(self, namespace: str, context: Any) -> Optional[Any]:
+        key = (namespace, get_context_key(context))
+        stats = self._get_stats(namespace)
+        entry = self._entries.get(key)
+
+        if entry is not None and entry.expires_at <= self.now():
+            self._remove(key)
+            stats.expirations += 1
+            entry = None
+
+        if entry is None:
+            stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        stats.hits += 1
+
+        return deepcopy(entry.value)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def set(self, namespace: str, context: Any, value: Any) -> None:
+        key = (namespace, get_context_key(context))
+        self._remove(key)
+
+        if not self.enabled:
+            return
+
+        value = deepcopy(value)
+        size_bytes = estimate_size(value)
+
+        if size_bytes > self.max_bytes:
+            return
+
+        self._entries[key] = ObjectCacheEntry(
+            context, value, size_bytes, self.now() + self.ttl_seconds
+        )
+        self._add_size(namespace, size_bytes, 1)
+
+        while self.size_bytes > self.max_bytes:
+            evicted_key = next(iter(self._entries))
+            self._remove(evicted_key)
+            self._get_stats(evicted_key[0]).evictions += 1
+
+    def invalidate(self, namespace: str, context: Any) -> None:
+        if self._remove((namespace, get_context_key(context))):
+            self._get_stats(namespace).invalidations += 1
+
+    def invalidate_project_definition(self, project_definition_id: UUID) -> None:
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if getattr(entry.context, "project_definition_id", None)
+            == project_definition_id
+        ]
+
+        for key in keys:
+            self._remove(key)
+            self._get_stats(key[0]).invalidations += 1
+
+    def stats(self, namespace: str) -> ObjectCacheStats:
+        return replace(self._get_stats(namespace))
+
+    def all_stats(self) -> Dict[str, ObjectCacheStats]:
+        return {namespace: replace(stats) for namespace, stats in self._stats.items()}
+
+    def _remove(self, key: Tuple[str, Hashable]) -> bool:
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return False
+
+        self._add_size(key[0], -entry.size_bytes, -1)
+        return True
+
+    def _add_size(self, namespace: str, size_bytes: int, entries: int) -> None:
+        stats = self._get_stats(namespace)
+        stats.size_bytes += size_bytes
+        stats.entries += entries
+        self.size_bytes += size_bytes
+
+    def _get_stats(self, namespace: str) -> ObjectCacheStats:
+        stats = self._stats.get(namespace)
+
+        if stats is None:
+            stats = ObjectCacheStats()
+            self._stats[namespace] = stats
+
+        return stats
@@ -1,3 +1,10 @@
+import gzip
+import struct
+import sys
+from array import array
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
 from expert_dollup.infra.expert_dollup_storage import (
     ExpertDollupStorage,
     ReportRowDictDao,
@@ -7,29 +14,246 @@ from expert_dollup.core.object_storage import ObjectStorage
 from expert_dollup.core.domains import ReportRowsCache, ReportRowKey, ReportRowDict
 from expert_dollup.shared.automapping import Mapper
 from pydantic import BaseModel
+from .binary_tables import StringTable, UuidTable, load_strings, load_uuids
+
+FORMAT_MAGIC = b"EDRC"
+FORMAT_VERSION = 1
+GZIP_MAGIC = b"\x1f\x8b"
+FILE_HEADER = struct.Struct("<4sBIIIII")
+COLUMN_NAME = struct.Struct("<II")
+
+ABSENT = ord("A")
+NONE = ord("N")
+BOOL = ord("B")
+INT = ord("I")
+DECIMAL = ord("D")
+STRING = ord("S")
+UUID_VALUE = ord("U")
+UUID_LIST = ord("L")
+
+Column = Tuple[str, str]
 
 
 class RootRowsDao(BaseModel):
     __root__: ReportRowsCacheDao
 
 
+class ReportRowsEncoder:
+    def __init__(self, rows: ReportRowsCache):
+        self.rows = rows
+        self.strings = StringTable()
+        self.uuids = UuidTable()
+        self.list_items = array("I")
+        self.columns: Dict[Column, Tuple[bytearray, array]] = {}
+
+    def encode(self) -> bytes:
+        for row_index, row in enumerate(self.rows):
+            for bucket_name, bucket in row.items():
+                for attribute_name, value in bucket.items():
+                    tags, values = self._get_column(
+                        (bucket_name, attribute_name), row_index
+                    )
+                    tag, packed_value = self._pack(value)
+                    tags.append(tag)
+                    values.append(packed_value)
+
+            for tags, values in self.columns.values():
+                if len(tags) == row_index:
+                    tags.append(ABSENT)
+                    values.append(0)
+
+        column_names = [
+            COLUMN_NAME.pack(self.strings.add(bucket), self.strings.add(attribute))
+            for bucket, attribute in self.columns.keys()
+        ]
+
+        return b"".join(
+            [
+                FILE_HEADER.pack(
+                    FORMAT_MAGIC,
+                    FORMAT_VERSION,
+                    len(self.rows),
+                    len(self.columns),
+                    len(self.strings.strings),
+                    len(self.uuids.uuids),
+                    len(self.list_items),
+                ),
+                self.strings.dump(),
+                self.uuids.dump(),
+                *column_names,
+                to_little_endian(self.list_items),
+                *(
+                    bytes(tags) + to_little_endian(values)
+                    for tags, values in self.columns.values()
+                ),
+            ]
+        )
+
+    def _get_column(self, column: Column, row_index: int) -> Tuple[bytearray, array]:
+        entry = self.columns.get(column)
+
+        if entry is None:
+            entry = (bytearray([ABSENT] * row_index), array("q", [0] * row_index))
+            self.columns[column] = entry
+
+        return entry
+
+    def _pack(self, value: Any) -> Tuple[int, int]:
+        if value is None:
+            return NONE, 0
+
+        if isinstance(value, bool):
+            return BOOL, 1 if value else 0
+
+        if isinstance(value, int):
+            return INT, value
+
+        if isinstance(value, Decimal):
+            return DECIMAL, self.strings.add(str(value))
+
+        if isinstance(value, str):
+            return STRING, self.strings.add(value)
+
+        if isinstance(value, UUID):
+            return UUID_VALUE, self.uuids.add(value)
+
+        if isinstance(value, list):
+            offset = len(self.list_items)
+            self.list_items.append(len(value))
+            self.list_items.extend(self.uuids.add(item) for item in value)
+            return UUID_LIST, offset
+
+        raise Exception(f"Unsupported report row value type {type(value)}")
+
+
+def to_little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    return values.tobytes()
+
+
+def from_little_endian(typecode: str, data: memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    return values
+
+
+def decode_report_rows(data: memoryview) -> ReportRowsCache:
+    (
+        _,
+        version,
+        row_count,
+        column_count,
+        string_count,
+        uuid_count,
+        list_item_count,
+    ) = FILE_HEADER.unpack_from(data, 0)
+
+    if version != FORMAT_VERSION:
+        raise Exception(f"Unkown report rows format version {version}")
+
+    strings, offset = load_strings(data, FILE_HEADER.size, string_count)
+    uuids, offset = load_uuids(data, offset, uuid_count)
+    columns: List[Column] = []
+
+    for _ in range(0, column_count):
+        bucket_index, attribute_index = COLUMN_NAME.unpack_from(data, offset)
+        columns.append((strings[bucket_index], strings[attribute_index]))
+        offset = offset + COLUMN_NAME.size
+
+    list_items = from_little_endian("I", data[offset : offset + 4 * list_item_count])
+    offset = offset + 4 * list_item_count
+    decimals: Dict[int, Decimal] = {}
+    rows: ReportRowsCache = [{} for _ in range(0, row_count)]
+
+    def decode(tag: int, value: int):
+        if tag == UUID_VALUE:
+            return uuids[value]
+
+        if tag == STRING:
+            return strings[value]
+
+        if tag == DECIMAL:
+            decimal = decimals.get(value)
+
+            if decimal is None:
+                decimal = Decimal(strings[value])
+                decimals[value] = decimal
+
+            return decimal
+
+        if tag == INT:
+            return value
+
+        if tag == BOOL:
+            return value == 1
+
+        if tag == NONE:
+            return None
+
+        if tag == UUID_LIST:
+            length = list_items[value]
+            return [uuids[item] for item in list_items[value + 1 : value + 1 + length]]
+
+        raise Exception(f"Unkown value type {chr(tag)}")
+
+    for bucket_name, attribute_name in columns:
+        tags = data[offset : offset + row_count]
+        offset = offset + row_count
+        values = from_little_endian("q", data[offset : offset + 8 * row_count])
+        offset = offset + 8 * row_count
+
+        for row, tag, value in zip(rows, tags, values):
+            if tag == ABSENT:
+                continue
+
+            bucket = row.get(bucket_name)
+
+            if bucket is None:
+                bucket = {}
+                row[bucket_name] = bucket
+
+            bucket[attribute_name] = decode(tag, value)
+
+    return rows
+
+
 class ReportDefinitionRowCacheCloudObject(ObjectStorage[ReportRowsCache, ReportRowKey]):
+    compress_level: Optional[int] = 1
+
     def __init__(self, storage: ExpertDollupStorage, mapper: Mapper):
         self.storage = storage
         self.mapper = mapper
 
     async def save(self, ctx: ReportRowKey, rows: ReportRowsCache):
         path = self.get_url(ctx)
-        daos = self.mapper.map_many(rows, ReportRowDictDao, ReportRowDict)
-        await self.storage.upload_binary(
-            path,
-            RootRowsDao(__root__=daos).json().encode("utf8"),
-        )
+        data = ReportRowsEncoder(rows).encode()
+
+        if not self.compress_level is None:
+            data = gzip.compress(data, compresslevel=self.compress_level)
+
+        await self.storage.upload_binary(path, data)
 
     async def load(self, ctx: ReportRowKey) -> ReportRowsCache:
         path = self.get_url(ctx)
-        rows_cache_json = await self.storage.download_binary(path)
-        rows_cache = RootRowsDao.parse_raw(rows_cache_json.decode("utf8"))
+        data = await self.storage.download_binary(path)
+
+        if data[0 : len(GZIP_MAGIC)] == GZIP_MAGIC:
+            data = gzip.decompress(data)
+
+        if data[0 : len(FORMAT_MAGIC)] == FORMAT_MAGIC:
+            return decode_report_rows(memoryview(data))
+
+        return self._load_json(data)
+
+    def _load_json(self, data: bytes) -> ReportRowsCache:
+        rows_cache = RootRowsDao.parse_raw(data.decode("utf8"))
         domains = self.mapper.map_many(
             rows_cache.__root__, ReportRowDict, ReportRowDictDao
         )
@@ -1,15 +1,130 @@
-from typing import List
-from gzip import GzipFile
-from io import BytesIO
-from expert_dollup.infra.expert_dollup_storage import (
-    ExpertDollupStorage,
-    StagedFormulaDao,
-)
+import gc
+import gzip
+from datetime import datetime
+from typing import Any, List
+from contextlib import contextmanager
+from uuid import UUID
+from expert_dollup.infra.expert_dollup_storage import ExpertDollupStorage
 from expert_dollup.core.object_storage import ObjectStorage
-from expert_dollup.core.domains import StagedFormulas, StagedFormulasKey, StagedFormula
+from expert_dollup.core.exceptions import RessourceNotFound
+from expert_dollup.core.domains import (
+    StagedFormulas,
+    StagedFormulasKey,
+    StagedFormula,
+    FormulaDependencyGraph,
+    FormulaDependency,
+)
 from expert_dollup.shared.automapping import Mapper
 from expert_dollup.shared.database_services import JsonSerializer
 
+FORMAT_MAGIC = b"EDSF"
+FORMAT_VERSION = 2
+COMPRESS_LEVEL = 3
+
+
+NODE_KEYS = ("kind", "values", "properties", "children")
+
+
+@contextmanager
+def paused_gc():
+    was_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def flatten_ast(final_ast: dict) -> list:
+    return [
+        final_ast["root_index"],
+        [[node[key] for key in NODE_KEYS] for node in final_ast["nodes"]],
+    ]
+
+
+def unflatten_ast(flat_ast: list) -> dict:
+    root_index, nodes = flat_ast
+
+    return {
+        "nodes": [dict(zip(NODE_KEYS, node)) for node in nodes],
+        "root_index": root_index,
+    }
+
+
+def encode_staged_formulas(staged_formulas: StagedFormulas) -> bytes:
+    return (
+        FORMAT_MAGIC
+        + bytes([FORMAT_VERSION])
+        + JsonSerializer.encode(
+            [
+                [
+                    formula.id,
+                    formula.project_definition_id,
+                    formula.attached_to_type_id,
+                    formula.name,
+                    formula.expression,
+                    formula.path,
+                    formula.creation_date_utc,
+                    flatten_ast(formula.final_ast),
+                    [
+                        [dependency.target_type_id, dependency.name]
+                        for dependency in formula.dependency_graph.formulas
+                    ],
+                    [
+                        [dependency.target_type_id, dependency.name]
+                        for dependency in formula.dependency_graph.nodes
+                    ],
+                ]
+                for formula in staged_formulas
+            ]
+        )
+    )
+
+
+def decode_staged_formulas(data: bytes) -> StagedFormulas:
+    version = data[len(FORMAT_MAGIC)]
+
+    if version != FORMAT_VERSION:
+        raise Exception(f"Unkown staged formula format version {version}")
+
+    def decode_dependencies(dependencies: List[List[Any]]) -> List[FormulaDependency]:
+        return [
+            FormulaDependency(target_type_id=UUID(target_type_id), name=name)
+            for target_type_id, name in dependencies
+        ]
+
+    with paused_gc():
+        return [
+            StagedFormula(
+                id=UUID(id),
+                project_definition_id=UUID(project_definition_id),
+                attached_to_type_id=UUID(attached_to_type_id),
+                name=name,
+                expression=expression,
+                path=[UUID(item) for item in path],
+                creation_date_utc=datetime.fromisoformat(creation_date_utc),
+                final_ast=unflatten_ast(final_ast),
+                dependency_graph=FormulaDependencyGraph(
+                    formulas=decode_dependencies(formula_dependencies),
+                    nodes=decode_dependencies(node_dependencies),
+                ),
+            )
+            for (
+                id,
+                project_definition_id,
+                attached_to_type_id,
+                name,
+                expression,
+                path,
+                creation_date_utc,
+                final_ast,
+                formula_dependencies,
+                node_dependencies,
+            ) in JsonSerializer.decode(data[len(FORMAT_MAGIC) + 1 :])
+        ]
+
 
 class StagedFormulaCache(ObjectStorage[StagedFormulas, StagedFormulasKey]):
     def __init__(self, storage: ExpertDollupStorage, mapper: Mapper):
@@ -17,35 +132,20 @@ class StagedFormulaCache(ObjectStorage[StagedFormulas, StagedFormulasKey]):
         self.mapper = mapper
 
     async def save(self, ctx: StagedFormulasKey, staged_formulas: StagedFormulas):
-        fileobj = BytesIO()
         path = self.get_url(ctx)
-        daos: List[StagedFormulaDao] = self.mapper.map_many(
-            staged_formulas, StagedFormulaDao
+        output_bytes = gzip.compress(
+            encode_staged_formulas(staged_formulas), compresslevel=COMPRESS_LEVEL
         )
-
-        with GzipFile(fileobj=fileobj, compresslevel=9, mode="wb") as f:
-            for dao in daos:
-                f.write(JsonSerializer.encode(dao.dict()))
-                f.write(b"\n")
-
-        fileobj.seek(0)
-        output_bytes = fileobj.read()
         await self.storage.upload_binary(path, output_bytes)
 
     async def load(self, ctx: StagedFormulasKey) -> StagedFormulas:
-        daos = []
         path = self.get_url(ctx)
-        initial_bytes = await self.storage.download_binary(path)
-        inbytes = BytesIO(initial_bytes)
-
-        with GzipFile(fileobj=inbytes, mode="rb") as f:
-            for line in f.readlines():
-                dao = StagedFormulaDao.parse_obj(JsonSerializer.decode(line))
-                daos.append(dao)
+        data = gzip.decompress(await self.storage.download_binary(path))
 
-        domains = self.mapper.map_many(daos, StagedFormula)
+        if data[0 : len(FORMAT_MAGIC)] != FORMAT_MAGIC:
+            raise RessourceNotFound()
 
-        return domains
+        return decode_staged_formulas(data)
 
     def get_url(self, ctx: StagedFormulasKey) -> str:
         return f"project_definitions/{ctx.project_definition_id}/staged_formulas.jsonl.gzip"
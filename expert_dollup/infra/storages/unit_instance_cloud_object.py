@@ -1,5 +1,5 @@
 from uuid import UUID
-from typing import Optional
+from typing import Optional, List, Dict, Tuple
 import gzip
 import struct
 from decimal import Decimal
@@ -11,24 +11,93 @@ from expert_dollup.core.domains import (
     UnitInstanceCacheKey,
     UnitInstanceCache,
 )
+from .binary_tables import StringTable, load_strings
+
+FORMAT_MAGIC = b"EDUI"
+FORMAT_VERSION = 2
+MAX_PATH_LENGTH = 5
+NO_STRING = 0xFFFFFFFF
+NULL_UUID_BYTES = bytes(16)
+FILE_HEADER = struct.Struct("<4sBQI")
+RECORD = struct.Struct("<16s16s80sBIIcq")
 
 
 def read_from(format, f):
     return struct.unpack(format, f.read(struct.calcsize(format)))[0]
 
 
+def load_calculation_details(
+    formula_id: bytes, details_index: int, strings: List[str]
+) -> Optional[str]:
+    if details_index != NO_STRING:
+        return strings[details_index]
+
+    return "" if formula_id == NULL_UUID_BYTES else None
+
+
 class UnitInstanceCloudObject(ObjectStorage[UnitInstanceCache, UnitInstanceCacheKey]):
     def __init__(self, storage: ExpertDollupStorage):
         self.storage = storage
 
     async def load(self, ctx: UnitInstanceCacheKey) -> UnitInstanceCache:
-        instances = []
-        null_uuid = UUID(int=0)
         path = self.get_url(ctx)
         initial_bytes = await self.storage.download_binary(path)
-        inbytes = BytesIO(initial_bytes)
+        data = gzip.decompress(initial_bytes)
+
+        if data[0 : len(FORMAT_MAGIC)] == FORMAT_MAGIC:
+            return self._load_v2(memoryview(data))
+
+        return self._load_v1(data)
+
+    def _load_v2(self, data: memoryview) -> UnitInstanceCache:
+        instances = UnitInstanceCache()
+        _, version, instance_count, string_count = FILE_HEADER.unpack_from(data, 0)
+
+        if version != FORMAT_VERSION:
+            raise Exception(f"Unkown unit instance format version {version}")
+
+        strings, offset = load_strings(data, FILE_HEADER.size, string_count)
+        records_end = offset + instance_count * RECORD.size
+
+        for (
+            formula_id,
+            node_id,
+            node_path,
+            path_len,
+            name_index,
+            details_index,
+            value_type,
+            value,
+        ) in RECORD.iter_unpack(data[offset:records_end]):
+            if value_type == b"I":
+                result = value
+            elif value_type == b"D":
+                result = Decimal(strings[value])
+            elif value_type == b"B":
+                result = value == 1
+            elif value_type == b"S":
+                result = strings[value]
+            elif value_type == b"N":
+                result = None
+            else:
+                raise Exception(f"Unkown value type {value_type}")
+
+            instances.append_packed(
+                formula_id,
+                node_id,
+                node_path[0 : path_len * 16],
+                strings[name_index],
+                load_calculation_details(formula_id, details_index, strings),
+                result,
+            )
 
-        with gzip.GzipFile(fileobj=inbytes, mode="rb") as f:
+        return instances
+
+    def _load_v1(self, data: bytes) -> UnitInstanceCache:
+        instances = UnitInstanceCache()
+        null_uuid = UUID(int=0)
+
+        with BytesIO(data) as f:
             instance_count = read_from("H", f)
 
             for _ in range(0, instance_count):
@@ -81,55 +150,73 @@ class UnitInstanceCloudObject(ObjectStorage[UnitInstanceCache, UnitInstanceCache
         return instances
 
     async def save(self, ctx: UnitInstanceCacheKey, instances: UnitInstanceCache):
-        null_uuid = UUID(int=0)
-        outbytes = BytesIO()
+        if not isinstance(instances, UnitInstanceCache):
+            instances = UnitInstanceCache(instances)
+
+        string_table = StringTable()
+        records: List[bytes] = []
+
+        for index in range(0, len(instances)):
+            formula_id, node_id, node_path = instances.get_packed_ids(index)
+            path_len = len(node_path) // 16
+            assert path_len <= MAX_PATH_LENGTH, f"Path too long {path_len}"
+            value_type, value = self._pack_result(instances.results[index], string_table)
+            calculation_details = instances.get_calculation_details(index)
+            details_index = (
+                NO_STRING
+                if formula_id == NULL_UUID_BYTES or calculation_details is None
+                else string_table.add(calculation_details)
+            )
+
+            records.append(
+                RECORD.pack(
+                    formula_id,
+                    node_id,
+                    node_path,
+                    path_len,
+                    string_table.add(instances.get_name(index)),
+                    details_index,
+                    value_type,
+                    value,
+                )
+            )
+
+        output_bytes = gzip.compress(
+            b"".join(
+                [
+                    FILE_HEADER.pack(
+                        FORMAT_MAGIC,
+                        FORMAT_VERSION,
+                        len(records),
+                        len(string_table.strings),
+                    ),
+                    string_table.dump(),
+                    *records,
+                ]
+            ),
+            compresslevel=9,
+        )
+        path = self.get_url(ctx)
+        await self.storage.upload_binary(path, output_bytes)
 
-        with gzip.GzipFile(fileobj=outbytes, compresslevel=9, mode="wb") as f:
-            f.write(struct.pack("H", len(instances)))
+    @staticmethod
+    def _pack_result(result, string_table: StringTable) -> Tuple[bytes, int]:
+        if isinstance(result, bool):
+            return b"B", 1 if result else 0
 
-            for instance in instances:
-                f.write((instance.formula_id or null_uuid).bytes)
-                f.write(instance.node_id.bytes)
+        if isinstance(result, int):
+            return b"I", result
 
-                for index in range(0, 5):
-                    uuid = (
-                        instance.path[index]
-                        if index < len(instance.path)
-                        else null_uuid
-                    )
+        if isinstance(result, Decimal):
+            return b"D", string_table.add(str(result))
 
-                    f.write(uuid.bytes)
-
-                name = instance.name.encode("utf8")
-                f.write(struct.pack("H", len(name)))
-                f.write(name)
-
-                if not instance.formula_id is None:
-                    calculation_details = instance.calculation_details.encode("utf8")
-                    f.write(struct.pack("L", len(calculation_details)))
-                    f.write(calculation_details)
-
-                if isinstance(instance.result, int):
-                    f.write(struct.pack("B", ord("I")))
-                    f.write(struct.pack("l", instance.result))
-                elif isinstance(instance.result, Decimal):
-                    f.write(struct.pack("B", ord("D")))
-                    result = str(instance.result).encode("utf8")
-                    f.write(struct.pack("L", len(result)))
-                    f.write(result)
-                elif isinstance(instance.result, bool):
-                    f.write(struct.pack("B", ord("B")))
-                    f.write(struct.pack("B", 1 if instance.result else 0))
-                elif isinstance(instance.result, str):
-                    result = instance.result.encode("utf8")
-                    f.write(struct.pack("B", ord("S")))
-                    f.write(struct.pack("L", len(result)))
-                    f.write(result)
-
-        outbytes.seek(0)
-        output_bytes = outbytes.read()
-        path = self.get_url(ctx)
-        await self.storage.upload_binary(path, output_bytes)
+        if isinstance(result, str):
+            return b"S", string_table.add(result)
+
+        if result is None:
+            return b"N", 0
+
+        raise Exception(f"Unsupported result type {type(result)}")
 
     def get_url(self, ctx: UnitInstanceCacheKey) -> str:
         return f"projects/{ctx.project_id}/formula_instance.raw.gzip"
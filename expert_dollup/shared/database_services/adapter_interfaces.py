@@ -10,6 +10,7 @@ from typing import (
     Any,
     Callable,
     Awaitable,
+    AsyncIterator,
 )
 from typing_extensions import TypeAlias
 from dataclasses import dataclass
@@ -86,6 +87,12 @@ class Repository(ABC, Generic[Domain]):
     async def find_by(self, query_filter: WhereFilter) -> List[Domain]:
         pass
 
+    @abstractmethod
+    def stream_by(
+        self, query_filter: WhereFilter, chunk_size: int = 1000
+    ) -> AsyncIterator[List[Domain]]:
+        pass
+
     @abstractmethod
     async def find_one_by(self, query_filter: WhereFilter) -> Domain:
         pass
@@ -122,6 +129,16 @@ class Repository(ABC, Generic[Domain]):
 
 
 class InternalRepository(Repository[Domain]):
+    @property
+    @abstractmethod
+    def pluck_batch_size(self) -> int:
+        pass
+
+    @property
+    @abstractmethod
+    def pluck_concurrency(self) -> int:
+        pass
+
     @abstractmethod
     def get_builder(self) -> QueryBuilder:
         pass
@@ -171,7 +188,7 @@ class DbConnection(ABC):
         pass
 
     @abstractmethod
-    async def transaction(self, callback: Callable[[], Awaitable]) -> None:
+    async def transaction(self, callback: Callable[[], Awaitable]) -> Any:
         pass
 
 
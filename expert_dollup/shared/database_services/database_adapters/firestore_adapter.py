@@ -1,4 +1,15 @@
-from typing import Callable, Iterable, List, TypeVar, Optional, Dict, Type, Set, Any
+from typing import (
+    Callable,
+    Iterable,
+    List,
+    TypeVar,
+    Optional,
+    Dict,
+    Type,
+    Set,
+    Any,
+    AsyncIterator,
+)
 from dataclasses import dataclass
 from collections import defaultdict
 from os import environ
@@ -273,6 +284,14 @@ class FirestoreCollection(InternalRepository[Domain]):
     def batch_size(self) -> int:
         return 20
 
+    @property
+    def pluck_batch_size(self) -> int:
+        return 30
+
+    @property
+    def pluck_concurrency(self) -> int:
+        return 8
+
     async def insert(self, domain: Domain):
         d = self._db_mapping.map_domain_to_dict(domain)
 
@@ -319,6 +338,22 @@ class FirestoreCollection(InternalRepository[Domain]):
         domains = self._db_mapping.map_many_record_to_domain(results)
         return domains
 
+    async def stream_by(
+        self, query_filter: WhereFilter, chunk_size: int = 1000
+    ) -> AsyncIterator[List[Domain]]:
+        results = []
+        query = self._build_query(query_filter)
+
+        async for doc in query.stream():
+            results.append(doc)
+
+            if len(results) == chunk_size:
+                yield self._db_mapping.map_many_record_to_domain(results)
+                results = []
+
+        if len(results) > 0:
+            yield self._db_mapping.map_many_record_to_domain(results)
+
     async def find_one_by(self, query_filter: WhereFilter) -> Domain:
         query = self._build_query(query_filter).limit(1)
 
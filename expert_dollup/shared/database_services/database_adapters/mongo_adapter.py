@@ -3,9 +3,11 @@ from bson.decimal128 import Decimal128
 from decimal import Decimal
 from motor.motor_asyncio import (
     AsyncIOMotorClient,
+    AsyncIOMotorClientSession,
     AsyncIOMotorDatabase,
     AsyncIOMotorCollection,
 )
+from contextvars import ContextVar
 from pydantic import BaseModel
 from typing import (
     Callable,
@@ -17,6 +19,7 @@ from typing import (
     Set,
     Any,
     Awaitable,
+    AsyncIterator,
     get_args,
 )
 from dataclasses import dataclass
@@ -120,6 +123,14 @@ class MongoConnection(DbConnection):
 
         self.db_name = urlparse(connection_string).path.strip("/ ")
         self.collections: Dict[Type, CollectionDetails] = {}
+        self._session: ContextVar[Optional[AsyncIOMotorClientSession]] = ContextVar(
+            f"mongo_session_{id(self)}", default=None
+        )
+        self._supports_transactions: Optional[bool] = None
+
+    @property
+    def session(self) -> Optional[AsyncIOMotorClientSession]:
+        return self._session.get()
 
     def get_collection_service(self, meta: RepositoryMetadata, mapper: Mapper):
         return MongoCollection(
@@ -157,9 +168,31 @@ class MongoConnection(DbConnection):
             await db.get_collection(collection.name).delete_many({})
 
     async def transaction(self, callback: Callable[[], Awaitable]):
-        async with await self._client.start_session() as s:
-            async with s.start_transaction():
-                await callback()
+        if not self._session.get() is None:
+            return await callback()
+
+        if not await self.supports_transactions():
+            return await callback()
+
+        async with await self._client.start_session() as session:
+            async with session.start_transaction():
+                token = self._session.set(session)
+
+                try:
+                    return await callback()
+                finally:
+                    self._session.reset(token)
+
+    async def supports_transactions(self) -> bool:
+        # Multi-document transactions need a replica set member or a mongos, a
+        # standalone mongod rejects them.
+        if self._supports_transactions is None:
+            hello = await self._client.admin.command("ismaster")
+            self._supports_transactions = (
+                "setName" in hello or hello.get("msg") == "isdbgrid"
+            )
+
+        return self._supports_transactions
 
     async def connect(self) -> None:
         pass
@@ -198,16 +231,24 @@ SIMLIFIERS = {Decimal: lambda v: Decimal128(str(v)), set: lambda value: list(val
 
 
 class QueryCompiler:
-    def __init__(self, mapper: Mapper, collection: AsyncIOMotorCollection):
+    def __init__(
+        self,
+        mapper: Mapper,
+        collection: AsyncIOMotorCollection,
+        parent: MongoConnection,
+    ):
         self._mapper = mapper
         self._collection = collection
+        self._parent = parent
         self._simplifier = Simplifier(SIMLIFIERS)
 
     def find(self, builder: WhereFilter):
         if isinstance(builder, QueryBuilder):
             return self.compile_query(builder)
 
-        return self._collection.find(self.build_filter(builder))
+        return self._collection.find(
+            self.build_filter(builder), session=self._parent.session
+        )
 
     def build_filter(self, builder: Optional[WhereFilter]) -> dict:
         if builder is None:
@@ -255,6 +296,7 @@ class QueryCompiler:
             if len(orders) == 0
             else {"$query": query_filter, "$orderby": orders},
             selections,
+            session=self._parent.session,
         )
 
         if not builder._max_records is None:
@@ -284,7 +326,7 @@ class MongoCollection(InternalRepository[Domain]):
         self._client = client
         self._table_details = parent.collections[meta.dao]
         self._collection = client.get_collection(self._table_details.name)
-        self._query_compiler = QueryCompiler(mapper, self._collection)
+        self._query_compiler = QueryCompiler(mapper, self._collection, parent)
         self._db_mapping = CollectionElementMapping(
             mapper,
             CollectionElementMapping.get_mapping_details(meta.domain, meta.dao),
@@ -299,24 +341,37 @@ class MongoCollection(InternalRepository[Domain]):
     def batch_size(self) -> int:
         return 1000
 
+    @property
+    def pluck_batch_size(self) -> int:
+        return 5000
+
+    @property
+    def pluck_concurrency(self) -> int:
+        # A session does not support concurrent operations.
+        return 4 if self._parent.session is None else 1
+
     @property
     def db(self) -> DbConnection:
         return self._parent
 
     async def insert(self, domain: Domain):
         document = self._db_mapping.map_domain_to_dict(domain)
-        await self._collection.insert_one(document)
+        await self._collection.insert_one(document, session=self._parent.session)
 
     async def insert_many(self, domains: List[Domain]):
         dicts = self._db_mapping.map_many_domain_to_dict(domains)
         for dicts_batch in batch(dicts, BATCH_SIZE):
-            await self._collection.insert_many(dicts_batch)
+            await self._collection.insert_many(
+                dicts_batch, session=self._parent.session
+            )
 
     async def update(self, value_filter: QueryFilter, where_filter: WhereFilter):
         value_dict = self._table_details.unfold_query(value_filter, self._mapper)
         simplified_dict = self._query_compiler.simplify(value_dict)
         compiled_filter = self._query_compiler.build_filter(where_filter)
-        await self._collection.update_many(compiled_filter, {"$set": simplified_dict})
+        await self._collection.update_many(
+            compiled_filter, {"$set": simplified_dict}, session=self._parent.session
+        )
 
     async def upserts(self, domains: List[Domain]) -> None:
         dicts = self._db_mapping.map_many_domain_to_dict(domains)
@@ -331,12 +386,15 @@ class MongoCollection(InternalRepository[Domain]):
                 for doc in docs
             ]
 
-            await self._collection.bulk_write(operations, ordered=False)
+            await self._collection.bulk_write(
+                operations, ordered=False, session=self._parent.session
+            )
 
     async def find_all(self, limit: int = 1000) -> List[Domain]:
         results = []
+        query = self._collection.find(session=self._parent.session).limit(limit)
 
-        async for doc in self._collection.find().limit(limit):
+        async for doc in query:
             results.append(doc)
 
         domains = self._db_mapping.map_many_record_to_domain(results)
@@ -348,6 +406,19 @@ class MongoCollection(InternalRepository[Domain]):
         domains = self._db_mapping.map_many_record_to_domain(results)
         return domains
 
+    async def stream_by(
+        self, query_filter: WhereFilter, chunk_size: int = 1000
+    ) -> AsyncIterator[List[Domain]]:
+        query = self._query_compiler.find(query_filter).batch_size(chunk_size)
+
+        while True:
+            results = await query.to_list(length=chunk_size)
+
+            if len(results) == 0:
+                break
+
+            yield self._db_mapping.map_many_record_to_domain(results)
+
     async def find_one_by(self, query_filter: WhereFilter) -> Domain:
         query = self._query_compiler.find(query_filter).limit(1)
 
@@ -358,7 +429,9 @@ class MongoCollection(InternalRepository[Domain]):
 
     async def find_by_id(self, pk_id: Id) -> Domain:
         document_id = self._table_details.build_id_from_pk(self._mapper, pk_id)
-        doc = await self._collection.find_one({"_id": document_id})
+        doc = await self._collection.find_one(
+            {"_id": document_id}, session=self._parent.session
+        )
 
         if doc is None:
             raise RecordNotFound()
@@ -367,7 +440,9 @@ class MongoCollection(InternalRepository[Domain]):
 
     async def has(self, pk_id: Id) -> bool:
         document_id = self._table_details.build_id_from_pk(self._mapper, pk_id)
-        doc = await self._collection.find_one({"_id": document_id})
+        doc = await self._collection.find_one(
+            {"_id": document_id}, session=self._parent.session
+        )
         return not doc is None
 
     async def exists(self, query_filter: WhereFilter) -> bool:
@@ -380,16 +455,22 @@ class MongoCollection(InternalRepository[Domain]):
 
     async def count(self, query_filter: Optional[WhereFilter] = None) -> int:
         counter_filter = self._query_compiler.build_filter(query_filter)
-        count = await self._collection.count_documents(counter_filter)
+        count = await self._collection.count_documents(
+            counter_filter, session=self._parent.session
+        )
         return count
 
     async def delete_by(self, query_filter: WhereFilter):
         compiled_filter = self._query_compiler.build_filter(query_filter)
-        await self._collection.delete_many(compiled_filter)
+        await self._collection.delete_many(
+            compiled_filter, session=self._parent.session
+        )
 
     async def delete_by_id(self, pk_id: Id):
         document_id = self._table_details.build_id_from_pk(self._mapper, pk_id)
-        await self._collection.delete_many({"_id": document_id})
+        await self._collection.delete_many(
+            {"_id": document_id}, session=self._parent.session
+        )
 
     # Extended api
 
@@ -421,7 +502,9 @@ class MongoCollection(InternalRepository[Domain]):
         dicts = self._db_mapping.map_many_dao_to_dict(daos)
 
         for dicts_batch in batch(dicts, BATCH_SIZE):
-            await self._collection.insert_many(dicts_batch)
+            await self._collection.insert_many(
+                dicts_batch, session=self._parent.session
+            )
 
     def map_domain_to_dao(self, domain: Domain) -> BaseModel:
         return self._db_mapping.map_domain_to_dao(domain)
@@ -1,10 +1,27 @@
-from typing import List, TypeVar, Optional, Dict, Type, Union, Callable, Any, get_args
+from typing import (
+    List,
+    Tuple,
+    TypeVar,
+    Optional,
+    Dict,
+    Type,
+    Union,
+    Callable,
+    Awaitable,
+    AsyncIterator,
+    Any,
+    get_args,
+)
+from asyncio import Lock
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from pydantic import BaseModel, ConstrainedStr
 from pydantic.fields import ModelField
 from inspect import isclass
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection
 from sqlalchemy import (
     MetaData,
     and_,
@@ -18,6 +35,8 @@ from sqlalchemy import (
     DateTime,
     Integer,
     text,
+    any_,
+    bindparam,
 )
 from sqlalchemy.sql import select
 from sqlalchemy.dialects.postgresql import insert as pg_insert, ARRAY
@@ -28,6 +47,7 @@ from ..adapter_interfaces import (
     QueryBuilder,
     WhereFilter,
     DbConnection,
+    RepositoryMetadata,
 )
 from ..query_filter import QueryFilter
 from ..exceptions import RecordNotFound
@@ -152,60 +172,144 @@ class PostgresColumnBuilder:
         return column_type
 
 
+class PinnedConnection:
+    def __init__(self, connection: AsyncConnection):
+        self.connection = connection
+        self.lock = Lock()
+
+
 class PostgresConnection(DbConnection):
     def __init__(self, connection_string: str, **kwargs):
         self.metadata = MetaData()
         self.tables: Dict[Type, Table] = {}
+        self.copy_threshold = kwargs.pop("copy_threshold", COPY_THRESHOLD)
+        cache_size = kwargs.pop("statement_cache_size", STATEMENT_CACHE_SIZE)
+        self.query_compiler = QueryCompiler(cache_size)
+        kwargs.setdefault("query_cache_size", cache_size)
+        kwargs.setdefault("connect_args", {}).setdefault(
+            "prepared_statement_cache_size", cache_size
+        )
         self._engine = create_async_engine(
             connection_string,
             json_serializer=lambda x: JsonSerializer.encode(x).decode("utf8"),
             json_deserializer=JsonSerializer.decode,
             **kwargs,
         )
+        self._pinned: ContextVar[Optional[PinnedConnection]] = ContextVar(
+            f"postgres_pinned_connection_{id(self)}", default=None
+        )
 
     def get_collection_service(self, meta: RepositoryMetadata, mapper: Mapper):
-        return PostgresTableService(meta, self.tables, self._engine, mapper)
+        return PostgresTableService(
+            meta, self.tables, self, mapper, self.copy_threshold
+        )
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[AsyncConnection]:
+        pinned = self._pinned.get()
+
+        if pinned is None:
+            async with self._engine.begin() as connection:
+                yield connection
+        else:
+            async with pinned.lock:
+                yield pinned.connection
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[AsyncConnection]:
+        pinned = self._pinned.get()
+
+        if pinned is None:
+            async with self._engine.connect() as connection:
+                yield connection
+        else:
+            async with pinned.lock:
+                yield pinned.connection
+
+    @asynccontextmanager
+    async def stream(
+        self, query, params: Optional[dict] = None
+    ) -> AsyncIterator[Callable[[int], Awaitable[list]]]:
+        pinned = self._pinned.get()
+
+        if pinned is None:
+            async with self._engine.begin() as connection:
+                result = await connection.stream(query, params)
+                yield result.fetchmany
+
+            return
+
+        async with pinned.lock:
+            result = await pinned.connection.stream(query, params)
+
+        async def fetch_many(size: int) -> list:
+            async with pinned.lock:
+                return await result.fetchmany(size)
+
+        try:
+            yield fetch_many
+        finally:
+            async with pinned.lock:
+                await result.close()
 
     def load_metadatas(self, metadatas: List[RepositoryMetadata]):
         def get_dao(dao):
             for t in get_args(dao):
-                return t.schema(), t.Meta
+                return t
             else:
-                return dao.schema(), dao.Meta
+                return dao
 
         column_builder = PostgresColumnBuilder()
 
         for metadata in metadatas:
-            schema, meta = get_dao(metadata.dao)
+            dao = get_dao(metadata.dao)
+            schema, meta = dao.schema(), dao.Meta
             assert schema.get("type") == "object"
             assert "properties" in schema
 
+            table_name = schema["title"]
+
+            if table_name in self.metadata.tables:
+                self.tables[metadata.dao] = self.metadata.tables[table_name]
+                continue
+
             columns = [
                 column_builder.build(
                     meta,
                     schema["properties"][field.name],
                     field,
                 )
-                for field in metadata.dao.__fields__.values()
+                for field in dao.__fields__.values()
             ]
 
             if hasattr(meta, "version"):
                 columns.append(Column("_version", Integer, nullable=False))
 
-            table_name = schema["title"]
             table = Table(table_name, self.metadata, *columns)
             self.tables[metadata.dao] = table
 
     async def truncate_db(self):
         async with self._engine.begin() as con:
-            for table in self.tables.values():
+            for table in self.metadata.tables.values():
                 name = table.name
                 await con.execute(text(f'ALTER TABLE "{name}" DISABLE TRIGGER ALL;'))
                 await con.execute(text(f"DELETE FROM {name};"))
                 await con.execute(text(f'ALTER TABLE "{name}" ENABLE TRIGGER ALL;'))
 
     async def transaction(self, callback: Callable[[], Awaitable]):
-        pass
+        if not self._pinned.get() is None:
+            return await callback()
+
+        async with self._engine.begin() as connection:
+            # asyncpg only opens the transaction on the first statement, which
+            # must happen before any raw driver call such as COPY.
+            await connection.execute(text("SELECT 1"))
+            token = self._pinned.set(PinnedConnection(connection))
+
+            try:
+                return await callback()
+            finally:
+                self._pinned.reset(token)
 
     async def connect(self) -> None:
         pass
@@ -219,50 +323,145 @@ class PostgresConnection(DbConnection):
 
 
 BATCH_SIZE = 1000
-SUPPORTED_OPS = {
+COPY_THRESHOLD = 1000
+STATEMENT_CACHE_SIZE = 500
+
+WhereShape = Tuple[Tuple[str, str], ...]
+
+BOUND_OPS = {
     "==": lambda lhs, rhs: lhs == rhs,
     "<": lambda lhs, rhs: lhs < rhs,
-    "in": lambda lhs, rhs: lhs.in_(rhs),
-    "startwiths": lambda lhs, rhs: lhs.like(f"{rhs}%"),
+    "in": lambda lhs, rhs: lhs == any_(rhs),
+    "startwiths": lambda lhs, rhs: lhs.like(rhs),
+    "is_null": lambda lhs, rhs: lhs.is_(None),
+}
+
+BOUND_VALUE_TYPES = {
+    "in": lambda column: ARRAY(column.type),
+    "startwiths": lambda column: column.type,
+}
+
+BOUND_VALUES = {
+    "in": list,
+    "startwiths": lambda value: f"{value}%",
 }
 
 
 class QueryCompiler:
-    @staticmethod
-    def compile_query(builder, table):
-        query = (
-            table.select()
-            if builder._selections is None
-            else select([getattr(table.c, name) for name in builder._selections])
+    """
+    Cache statements by query shape so repeated queries only bind values.
+    A stable sql text also lets asyncpg reuse its prepared statements.
+    """
+
+    def __init__(self, cache_size: int = STATEMENT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._statements: "OrderedDict[tuple, Any]" = OrderedDict()
+
+    def compile_query(self, builder, table) -> Tuple[Any, dict]:
+        return self.compile_select(
+            table,
+            builder._wheres,
+            selections=builder._selections,
+            orders=builder._orders,
+            limit=builder._max_records,
+        )
+
+    def compile_select(
+        self,
+        table: Table,
+        wheres: list,
+        selections: Optional[List[str]] = None,
+        orders: Optional[list] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[Any, dict]:
+        shape = QueryCompiler.get_where_shape(wheres)
+        selections = None if selections is None else tuple(selections)
+        orders = None if orders is None else tuple(orders)
+        key = ("select", table.name, selections, shape, orders, limit)
+
+        def build():
+            query = (
+                table.select()
+                if selections is None
+                else select([getattr(table.c, name) for name in selections])
+            )
+            query = QueryCompiler._apply_where(query, table, shape)
+
+            if not orders is None:
+                ordering = []
+
+                for column_name, direction in orders:
+                    assert direction in ("desc", "asc")
+                    apply_order = desc if direction == "desc" else asc
+                    ordering.append(apply_order(getattr(table.c, column_name)))
+
+                query = query.order_by(*ordering)
+
+            if not limit is None:
+                query = query.limit(limit)
+
+            return query
+
+        return self._get_or_build(key, build), QueryCompiler.bind_values(wheres)
+
+    def compile_count(self, table: Table, wheres: list) -> Tuple[Any, dict]:
+        shape = QueryCompiler.get_where_shape(wheres)
+        key = ("count", table.name, shape)
+        build = lambda: QueryCompiler._apply_where(
+            select([func.count()]).select_from(table), table, shape
         )
 
-        where_filter = QueryCompiler.build_where_filter(builder, table)
+        return self._get_or_build(key, build), QueryCompiler.bind_values(wheres)
+
+    def compile_where(self, table: Table, wheres: list) -> Tuple[Any, dict]:
+        shape = QueryCompiler.get_where_shape(wheres)
+        key = ("where", table.name, shape)
+        build = lambda: QueryCompiler.build_where_filter(table, shape)
+
+        return self._get_or_build(key, build), QueryCompiler.bind_values(wheres)
 
-        if not where_filter is None:
-            query = query.where(where_filter)
+    def _get_or_build(self, key: tuple, build: Callable[[], Any]):
+        statement = self._statements.get(key)
 
-        if not builder._orders is None:
-            ordering = []
+        if statement is None:
+            statement = build()
+            self._statements[key] = statement
 
-            for column_name, direction in builder._orders:
-                assert direction in ("desc", "asc")
-                apply_order = desc if direction == "desc" else asc
-                ordering.append(apply_order(getattr(table.c, column_name)))
+            if len(self._statements) > self.cache_size:
+                self._statements.popitem(last=False)
+        else:
+            self._statements.move_to_end(key)
 
-            query = query.order_by(*ordering)
+        return statement
 
-        if not builder._max_records is None:
-            query = query.limit(builder._max_records)
+    @staticmethod
+    def get_where_shape(wheres: list) -> WhereShape:
+        return tuple(
+            (column_name, QueryCompiler.get_shape_op(op, value))
+            for column_name, op, value in wheres
+        )
+
+    @staticmethod
+    def get_shape_op(op: str, value: Any) -> str:
+        return "is_null" if op == "==" and value is None else op
 
-        return query
+    @staticmethod
+    def bind_values(wheres: list) -> dict:
+        return {
+            f"where_{index}": BOUND_VALUES.get(op, lambda x: x)(value)
+            for index, (_, op, value) in enumerate(wheres)
+            if QueryCompiler.get_shape_op(op, value) != "is_null"
+        }
 
     @staticmethod
-    def build_where_filter(builder, table):
+    def build_where_filter(table: Table, shape: WhereShape):
         where_filter = None
 
-        for (column_name, op, value) in builder._wheres:
-            apply_op = SUPPORTED_OPS[op]
-            operator = apply_op(getattr(table.c, column_name), value)
+        for index, (column_name, op) in enumerate(shape):
+            column = getattr(table.c, column_name)
+            value_type = BOUND_VALUE_TYPES.get(op, lambda c: c.type)(column)
+            value = bindparam(f"where_{index}", type_=value_type)
+            operator = BOUND_OPS[op](column, value)
 
             if where_filter is None:
                 where_filter = operator
@@ -272,16 +471,13 @@ class QueryCompiler:
         return where_filter
 
     @staticmethod
-    def build_and_column_filter(table, fields: dict):
-        condition = None
+    def _apply_where(query, table: Table, shape: WhereShape):
+        where_filter = QueryCompiler.build_where_filter(table, shape)
 
-        for column_name, value in fields.items():
-            if condition is None:
-                condition = getattr(table.c, column_name) == value
-            else:
-                condition = and_(condition, getattr(table.c, column_name) == value)
+        if where_filter is None:
+            return query
 
-        return condition
+        return query.where(where_filter)
 
 
 Domain = TypeVar("Domain")
@@ -293,12 +489,15 @@ class PostgresTableService(InternalRepository[Domain]):
         self,
         meta: RepositoryMetadata,
         tables: Dict[Type, Table],
-        engine,
+        database: PostgresConnection,
         mapper: Mapper,
+        copy_threshold: int = COPY_THRESHOLD,
     ):
         self._domain = meta.domain
         self._mapper = mapper
-        self._database = engine
+        self._database = database
+        self._query_compiler = database.query_compiler
+        self._copy_threshold = copy_threshold
         self._table = tables.get(meta.dao)
         self._db_mapping = CollectionElementMapping(
             mapper,
@@ -323,6 +522,14 @@ class PostgresTableService(InternalRepository[Domain]):
     def batch_size(self) -> int:
         return 1000
 
+    @property
+    def pluck_batch_size(self) -> int:
+        return 5000
+
+    @property
+    def pluck_concurrency(self) -> int:
+        return 4
+
     @property
     def db(self) -> DbConnection:
         return self._database
@@ -336,6 +543,10 @@ class PostgresTableService(InternalRepository[Domain]):
     async def insert_many(self, domains: List[Domain]):
         dicts = self._db_mapping.map_many_domain_to_dict(domains)
 
+        if len(dicts) >= self._copy_threshold:
+            await self._copy_records(dicts)
+            return
+
         for dicts_batch in batch(dicts, BATCH_SIZE):
             query = pg_insert(self._table, dicts_batch)
             await self._execute(query)
@@ -347,6 +558,10 @@ class PostgresTableService(InternalRepository[Domain]):
         dicts = self._db_mapping.map_many_domain_to_dict(domains)
         constraint = f"{self._table.name}_pkey"
 
+        if len(dicts) >= self._copy_threshold:
+            await self._copy_upserts(dicts, constraint)
+            return
+
         for items in batch(dicts, BATCH_SIZE):
             query = pg_insert(self._table, items)
             set_ = {c.name: c for c in query.excluded if not c.primary_key}
@@ -358,21 +573,37 @@ class PostgresTableService(InternalRepository[Domain]):
             await self._execute(query=query)
 
     async def find_all(self, limit: int = 1000) -> List[Domain]:
-        query = self._table.select().limit(limit)
-        records = await self._fetch_all(query=query)
+        query, params = self._query_compiler.compile_select(
+            self._table, [], limit=limit
+        )
+        records = await self._fetch_all(query, params)
         results = self._db_mapping.map_many_record_to_domain(records)
         return results
 
     async def find_by(self, query_filter: WhereFilter) -> List[Domain]:
-        query = self._build_query(query_filter)
-        records = await self._fetch_all(query=query)
+        query, params = self._build_query(query_filter)
+        records = await self._fetch_all(query, params)
         results = self._db_mapping.map_many_record_to_domain(records)
 
         return results
 
+    async def stream_by(
+        self, query_filter: WhereFilter, chunk_size: int = 1000
+    ) -> AsyncIterator[List[Domain]]:
+        query, params = self._build_query(query_filter)
+
+        async with self._database.stream(query, params) as fetch_many:
+            while True:
+                records = await fetch_many(chunk_size)
+
+                if len(records) == 0:
+                    break
+
+                yield self._db_mapping.map_many_record_to_domain(records)
+
     async def find_one_by(self, query_filter: WhereFilter) -> Domain:
-        query = self._build_query(query_filter)
-        record = await self._fetch_one(query)
+        query, params = self._build_query(query_filter)
+        record = await self._fetch_one(query, params)
 
         if record is None:
             raise RecordNotFound()
@@ -382,40 +613,40 @@ class PostgresTableService(InternalRepository[Domain]):
         return result
 
     async def delete_by(self, query_filter: WhereFilter):
-        where_filter = self._build_filter(query_filter)
+        where_filter, params = self._build_filter(query_filter)
         query = self._table.delete().where(where_filter)
-        await self._execute(query)
+        await self._execute(query, params)
 
     async def count(self, query_filter: Optional[WhereFilter] = None) -> int:
-        query = select([func.count()]).select_from(self._table)
-
-        if not query_filter is None:
-            where_filter = self._build_filter(query_filter)
-            query = query.where(where_filter)
-
-        count = await self._fetch_val(query=query)
+        wheres = [] if query_filter is None else self._get_wheres(query_filter)
+        query, params = self._query_compiler.compile_count(self._table, wheres)
+        count = await self._fetch_val(query, params)
         return count
 
     async def delete_by_id(self, pk_id: Id):
-        where_filter = self._build_id_filter(pk_id)
+        where_filter, params = self._query_compiler.compile_where(
+            self._table, self._get_id_wheres(pk_id)
+        )
         query = self._table.delete().where(where_filter)
-        await self._execute(query=query)
+        await self._execute(query, params)
 
     async def exists(self, query_filter: WhereFilter) -> bool:
-        query = self._build_query(query_filter)
-        record = await self._fetch_one(query)
+        query, params = self._build_query(query_filter)
+        record = await self._fetch_one(query, params)
         return not record is None
 
     async def has(self, pk_id: Id) -> bool:
-        where_filter = self._build_id_filter(pk_id)
-        query = select(self.table_ids).where(where_filter)
-        value = await self._fetch_one(query=query)
+        query, params = self._query_compiler.compile_select(
+            self._table, self._get_id_wheres(pk_id), selections=self.table_id_names
+        )
+        value = await self._fetch_one(query, params)
         return not value is None
 
     async def find_by_id(self, pk_id: Id) -> Domain:
-        where_filter = self._build_id_filter(pk_id)
-        query = self._table.select().where(where_filter)
-        record = await self._fetch_one(query=query)
+        query, params = self._query_compiler.compile_select(
+            self._table, self._get_id_wheres(pk_id)
+        )
+        record = await self._fetch_one(query, params)
 
         if record is None:
             raise RecordNotFound()
@@ -424,10 +655,10 @@ class PostgresTableService(InternalRepository[Domain]):
         return result
 
     async def update(self, value_filter: QueryFilter, query_filter: WhereFilter):
-        where_filter = self._build_filter(query_filter)
+        where_filter, params = self._build_filter(query_filter)
         update_fields = self._mapper.map(value_filter, dict, value_filter.__class__)
         query = self._table.update().where(where_filter).values(update_fields)
-        await self._execute(query)
+        await self._execute(query, params)
 
     # Internal api
 
@@ -443,8 +674,8 @@ class PostgresTableService(InternalRepository[Domain]):
             name: mapping(self._mapper) for name, mapping in mappings.items()
         }
 
-        query = self._build_query(builder)
-        records = await self._fetch_all(query=query)
+        query, params = self._build_query(builder)
+        records = await self._fetch_all(query, params)
 
         return [
             {
@@ -455,65 +686,129 @@ class PostgresTableService(InternalRepository[Domain]):
         ]
 
     async def bulk_insert(self, daos: List[BaseModel]):
-        columns_name = [column.name for column in self._table.c]
-        records = []
+        await self._copy_records(list(self._db_mapping.map_many_dao_to_dict(daos)))
 
-        for d in self._db_mapping.map_many_dao_to_dict(daos):
-            records.append([d[column_name] for column_name in columns_name])
+    def _get_copy_columns(self, dicts: List[dict]) -> List[Column]:
+        return [column for column in self._table.c if column.name in dicts[0]]
 
-        async with self._database.connect() as connection:
+    def _to_copy_records(self, columns: List[Column], dicts: List[dict]) -> List[tuple]:
+        def encode_json(value: Any) -> Optional[str]:
+            if value is None:
+                return None
+
+            return JsonSerializer.encode(value).decode("utf8")
+
+        encoders = [
+            encode_json if isinstance(column.type, postgresql.JSON) else None
+            for column in columns
+        ]
+
+        return [
+            tuple(
+                d[column.name] if encode is None else encode(d[column.name])
+                for column, encode in zip(columns, encoders)
+            )
+            for d in dicts
+        ]
+
+    async def _copy_records(self, dicts: List[dict]) -> None:
+        if len(dicts) == 0:
+            return
+
+        columns = self._get_copy_columns(dicts)
+
+        async with self._database.checkout() as connection:
             conn = await connection.get_raw_connection()
             await conn.driver_connection.copy_records_to_table(
-                self._table.name, records=records, columns=columns_name
+                self._table.name,
+                records=self._to_copy_records(columns, dicts),
+                columns=[column.name for column in columns],
             )
 
+    async def _copy_upserts(self, dicts: List[dict], constraint: str) -> None:
+        columns = self._get_copy_columns(dicts)
+        # Inside a unit of work conn.transaction() is only a savepoint, so ON
+        # COMMIT DROP runs late; the name must be unique and the table dropped.
+        staging_table = f"upserts_{uuid4().hex}"
+        columns_names = ", ".join(f'"{column.name}"' for column in columns)
+        updates = ", ".join(
+            f'"{column.name}" = EXCLUDED."{column.name}"'
+            for column in columns
+            if not column.primary_key
+        )
+        on_conflict = (
+            "DO NOTHING" if len(updates) == 0 else f"DO UPDATE SET {updates}"
+        )
+
+        async with self._database.checkout() as connection:
+            conn = (await connection.get_raw_connection()).driver_connection
+
+            async with conn.transaction():
+                await conn.execute(
+                    f'CREATE TEMP TABLE "{staging_table}" '
+                    f'(LIKE "{self._table.name}" INCLUDING DEFAULTS) ON COMMIT DROP'
+                )
+                await conn.copy_records_to_table(
+                    staging_table,
+                    records=self._to_copy_records(columns, dicts),
+                    columns=[column.name for column in columns],
+                )
+                await conn.execute(
+                    f'INSERT INTO "{self._table.name}" ({columns_names}) '
+                    f'SELECT {columns_names} FROM "{staging_table}" '
+                    f'ON CONFLICT ON CONSTRAINT "{constraint}" {on_conflict}'
+                )
+                await conn.execute(f'DROP TABLE "{staging_table}"')
+
     def map_domain_to_dao(self, domain: Domain) -> BaseModel:
         return self._db_mapping.map_domain_to_dao(domain)
 
-    def _build_query(self, builder: WhereFilter):
+    def unpack_query(self, query_filter: QueryFilter) -> dict:
+        return self._mapper.map(query_filter, dict, query_filter.__class__)
+
+    def _build_query(self, builder: WhereFilter) -> Tuple[Any, dict]:
         if isinstance(builder, DbAgnotistQueryBuilder):
-            return QueryCompiler.compile_query(builder, self._table)
+            return self._query_compiler.compile_query(builder, self._table)
 
-        return self._table.select().where(self._build_filter(builder))
+        return self._query_compiler.compile_select(
+            self._table, self._get_wheres(builder)
+        )
 
-    def _build_filter(self, builder: WhereFilter):
+    def _build_filter(self, builder: WhereFilter) -> Tuple[Any, dict]:
+        return self._query_compiler.compile_where(
+            self._table, self._get_wheres(builder)
+        )
+
+    def _get_wheres(self, builder: WhereFilter) -> list:
         if isinstance(builder, DbAgnotistQueryBuilder):
-            return QueryCompiler.build_where_filter(builder, self._table)
+            return builder._wheres
 
         filter_fields = self._mapper.map(builder, dict, builder.__class__)
-        where_filter = QueryCompiler.build_and_column_filter(self._table, filter_fields)
-        return where_filter
+        return [(name, "==", value) for name, value in filter_fields.items()]
 
-    def _build_id_filter(self, pk_id):
+    def _get_id_wheres(self, pk_id) -> list:
         if len(self.table_ids) == 1:
-            return self.table_ids[0] == pk_id
+            return [(self.table_id_names[0], "==", pk_id)]
 
         identifier = self._mapper.map(pk_id, dict, pk_id.__class__)
-        name = self.table_id_names[0]
-        condition = getattr(self._table.c, name) == identifier[name]
-
-        for name in self.table_id_names:
-            comparaison = getattr(self._table.c, name) == identifier[name]
-            condition = and_(condition, comparaison)
-
-        return condition
+        return [(name, "==", identifier[name]) for name in self.table_id_names]
 
-    async def _fetch_all(self, query) -> List[dict]:
+    async def _fetch_all(self, query, params: Optional[dict] = None) -> List[dict]:
         async with self._database.begin() as conn:
-            result = await conn.execute(query)
+            result = await conn.execute(query, params)
             return result.fetchall()
 
-    async def _fetch_one(self, query) -> List[dict]:
+    async def _fetch_one(self, query, params: Optional[dict] = None) -> List[dict]:
         async with self._database.begin() as conn:
-            result = await conn.execute(query)
+            result = await conn.execute(query, params)
             return result.fetchone()
 
-    async def _fetch_val(self, query) -> List[dict]:
+    async def _fetch_val(self, query, params: Optional[dict] = None) -> List[dict]:
         async with self._database.begin() as conn:
-            result = await conn.execute(query)
+            result = await conn.execute(query, params)
             row = result.fetchone()
             return row if row is None else row[0]
 
-    async def _execute(self, query):
+    async def _execute(self, query, params: Optional[dict] = None):
         async with self._database.begin() as conn:
-            return await conn.execute(query)
+            return await conn.execute(query, params)
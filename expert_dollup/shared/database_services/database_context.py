@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar, List, Optional, Union
+from typing import Type, TypeVar, List, Optional, Union, Callable, Awaitable, Any
 from .adapter_interfaces import Repository, WhereFilter, QueryFilter
 
 Domain = TypeVar("Domain")
@@ -82,3 +82,7 @@ class DatabaseContext(ABC):
         self, domain_type: Type[Domain], query_filter: Optional[WhereFilter] = None
     ) -> int:
         pass
+
+    @abstractmethod
+    async def transaction(self, callback: Callable[[], Awaitable]) -> Any:
+        pass
@@ -1,7 +1,7 @@
-from typing import Type, TypeVar, List, Any, Optional, Type
+from typing import Type, TypeVar, List, Any, Optional, Type, Callable, Awaitable
 from .injector_interface import InjectorProtocol
 from .database_context import DatabaseContext
-from .adapter_interfaces import Repository, WhereFilter, QueryFilter
+from .adapter_interfaces import Repository, WhereFilter, QueryFilter, DbConnection
 
 Domain = TypeVar("Domain")
 Query = TypeVar("Query")
@@ -81,3 +81,12 @@ class DatabaseContextMultiplexer(DatabaseContext):
         self, domain_type: Type[Domain], query_filter: Optional[WhereFilter] = None
     ) -> int:
         return await self.get_repository(domain_type).has(query_filter)
+
+    async def transaction(self, callback: Callable[[], Awaitable]) -> Any:
+        async def run_within(databases: List[DbConnection]):
+            if len(databases) == 0:
+                return await callback()
+
+            return await databases[0].transaction(lambda: run_within(databases[1:]))
+
+        return await run_within(self.databases)
@@ -1,3 +1,4 @@
+from asyncio import Semaphore, gather
 from typing import Callable, Optional, TypeVar, Sequence, List
 from uuid import UUID
 from .adapter_interfaces import QueryFilter, InternalRepository
@@ -11,19 +12,13 @@ Domain = TypeVar("Domain")
 class PluckQuery(Plucker[Domain]):
     def __init__(self, repository: InternalRepository[Domain]):
         self._repository = repository
-        self._batch_size = 10
 
     async def plucks(
         self,
         build_pluck_filter: Callable[[Sequence[UUID]], QueryFilter],
         ids: Sequence[UUID],
     ) -> List[Domain]:
-        all_results = []
-
-        async for batch_results in self._pluck_by_batch(ids, build_pluck_filter):
-            all_results.extend(batch_results)
-
-        return all_results
+        return await self._pluck_by_batch(ids, build_pluck_filter)
 
     async def pluck_subressources(
         self,
@@ -31,28 +26,21 @@ class PluckQuery(Plucker[Domain]):
         build_pluck_filter: Callable[[Sequence[UUID]], QueryFilter],
         ids: Sequence[UUID],
     ) -> List[Domain]:
-
-        all_results = []
-
-        async for batch_results in self._pluck_by_batch(
-            ids, build_pluck_filter, ressource_filter
-        ):
-            all_results.extend(batch_results)
-
-        return all_results
+        return await self._pluck_by_batch(ids, build_pluck_filter, ressource_filter)
 
     async def _pluck_by_batch(
         self,
         ids: List[UUID],
         build_pluck_filter: Callable[[list], QueryFilter],
         ressource_filter: Optional[QueryFilter] = None,
-    ):
+    ) -> List[Domain]:
         ressource_dict = {}
+        semaphore = Semaphore(self._repository.pluck_concurrency)
 
         if not ressource_filter is None:
             ressource_dict = self._repository.unpack_query(ressource_filter)
 
-        for ids_batch in batch(ids, self._batch_size):
+        async def find_batch(ids_batch: List[UUID]) -> List[Domain]:
             pluck_filter = build_pluck_filter(ids_batch)
             pluck_filter_dict = self._repository.unpack_query(pluck_filter)
 
@@ -64,5 +52,14 @@ class PluckQuery(Plucker[Domain]):
             for name, values in pluck_filter_dict.items():
                 query = query.where(name, "in", values)
 
-            results = await self._repository.find_by(query)
-            yield results
+            async with semaphore:
+                return await self._repository.find_by(query)
+
+        batches_results = await gather(
+            *(
+                find_batch(ids_batch)
+                for ids_batch in batch(ids, self._repository.pluck_batch_size)
+            )
+        )
+
+        return [result for results in batches_results for result in results]
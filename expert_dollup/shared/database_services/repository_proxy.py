@@ -1,4 +1,14 @@
-from typing import Callable, TypeVar, List, Optional, Union, Type, Dict, Any
+from typing import (
+    Callable,
+    TypeVar,
+    List,
+    Optional,
+    Union,
+    Type,
+    Dict,
+    Any,
+    AsyncIterator,
+)
 from typing_extensions import TypeAlias
 from inspect import isclass
 from expert_dollup.shared.automapping import Mapper
@@ -46,6 +56,11 @@ class RepositoryProxy(Repository[Domain]):
     async def find_by(self, query_filter: WhereFilter) -> List[Domain]:
         return await self._impl.find_by(query_filter)
 
+    def stream_by(
+        self, query_filter: WhereFilter, chunk_size: int = 1000
+    ) -> AsyncIterator[List[Domain]]:
+        return self._impl.stream_by(query_filter, chunk_size)
+
     async def find_one_by(self, query_filter: WhereFilter) -> Domain:
         return await self._impl.find_one_by(query_filter)
 
@@ -1,4 +1,5 @@
-from typing import Type, Optional, List
+from typing import Type, Optional, List, Any
+from starlette.responses import StreamingResponse
 from ..interfaces import MappingChain
 from ....automapping import Mapper
 
@@ -61,6 +62,41 @@ class RequestHandler:
 
         return result
 
+    async def forward_stream(
+        self, usecase, params, mapping_chain: MappingChain, chunk_size: int = 512
+    ) -> StreamingResponse:
+        results = usecase(**params).__aiter__()
+
+        try:
+            first_result = await results.__anext__()
+        except StopAsyncIteration:
+            first_result = None
+
+        async def encode_lines():
+            if first_result is None:
+                return
+
+            lines = [self._encode_line(first_result, mapping_chain)]
+
+            async for result in results:
+                lines.append(self._encode_line(result, mapping_chain))
+
+                if len(lines) >= chunk_size:
+                    yield "".join(lines)
+                    lines.clear()
+
+            yield "".join(lines)
+
+        return StreamingResponse(encode_lines(), media_type="application/x-ndjson")
+
+    def _encode_line(self, result: Any, mapping_chain: MappingChain) -> str:
+        if not mapping_chain.out_dto is None:
+            result = self.mapper.map(
+                result, mapping_chain.out_dto, mapping_chain.out_domain
+            )
+
+        return result.json(by_alias=True) + "\n"
+
     async def forward_mapped(
         self, usecase, params, mapping_chain: MappingChain, map_keys={}
     ):
@@ -14,7 +14,7 @@ async def main():
     db = client.get_database(db_name)
     schemas = db.get_collection("schemas")
 
-    for module_name in listdir(path.dirname(__file__)):
+    for module_name in sorted(listdir(path.dirname(__file__))):
         if module_name.startswith("m") and module_name.endswith(".py"):
             module_content = import_module(module_name[:-3])
             schema_version = {"_id": module_content.version}
@@ -0,0 +1,5 @@
+version = "2"
+
+
+async def upgrade(db):
+    await db.create_collection("data_revision")
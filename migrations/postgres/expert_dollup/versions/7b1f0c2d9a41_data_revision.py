@@ -0,0 +1,29 @@
+"""Data revision stamps
+
+Revision ID: 7b1f0c2d9a41
+Revises: 2c47a3dd1b88
+Create Date: 2026-10-18 10:12:31.482913
+
+"""
+from sqlalchemy.dialects import postgresql
+from sqlalchemy import String, Column
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "7b1f0c2d9a41"
+down_revision = "2c47a3dd1b88"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "data_revision",
+        Column("id", String(64), nullable=False, primary_key=True),
+        Column("revision", postgresql.UUID(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("data_revision")
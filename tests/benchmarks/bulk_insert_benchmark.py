@@ -0,0 +1,76 @@
+import asyncio
+from time import perf_counter
+from typing import Awaitable, Callable, List
+from uuid import uuid4
+from dotenv import load_dotenv
+from expert_dollup.app.modules import build_container
+from expert_dollup.core.domains import *
+from expert_dollup.infra.expert_dollup_db import ExpertDollupDatabase
+from expert_dollup.shared.database_services import InternalRepository
+
+
+def make_nodes(count: int) -> List[ProjectNode]:
+    project_id = uuid4()
+    root_id = uuid4()
+
+    return [
+        ProjectNode(
+            id=uuid4(),
+            project_id=project_id,
+            type_path=[root_id],
+            type_id=uuid4(),
+            type_name=f"field{index}",
+            path=[root_id],
+            value=index,
+            label=f"field {index}",
+        )
+        for index in range(count)
+    ]
+
+
+async def measure(write: Callable[[List[ProjectNode]], Awaitable], count: int):
+    nodes = make_nodes(count)
+    before = perf_counter()
+    await write(nodes)
+    duration = perf_counter() - before
+
+    return nodes, duration
+
+
+async def main(count: int = 20000) -> None:
+    load_dotenv()
+    container = build_container()
+    database = container.get(ExpertDollupDatabase)
+    repository = container.get(InternalRepository[ProjectNode])
+    copy_threshold = repository._copy_threshold
+    project_ids = []
+
+    await database.connect()
+
+    try:
+        for name, threshold in [
+            ("insert ... values", count + 1),
+            ("copy", copy_threshold),
+        ]:
+            repository._copy_threshold = threshold
+            nodes, insert_duration = await measure(repository.insert_many, count)
+            _, upsert_duration = await measure(
+                lambda _: repository.upserts(nodes), count
+            )
+            project_ids.append(nodes[0].project_id)
+            print(
+                f"{name:<18} rows={count} "
+                f"insert rows/s={count / insert_duration:10.0f} "
+                f"upsert rows/s={count / upsert_duration:10.0f}"
+            )
+    finally:
+        repository._copy_threshold = copy_threshold
+
+        for project_id in project_ids:
+            await repository.delete_by(ProjectNodeFilter(project_id=project_id))
+
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
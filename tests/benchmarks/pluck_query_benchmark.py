@@ -0,0 +1,68 @@
+import asyncio
+from time import perf_counter
+from typing import List
+from dotenv import load_dotenv
+from expert_dollup.app.modules import build_container
+from expert_dollup.core.domains import *
+from expert_dollup.infra.expert_dollup_db import ExpertDollupDatabase
+from expert_dollup.shared.database_services import InternalRepository, PluckQuery
+from .staged_formula_cache_benchmark import make_formulas
+
+
+class PluckSettings:
+    def __init__(
+        self, repository: InternalRepository, batch_size: int, concurrency: int
+    ):
+        self._repository = repository
+        self.pluck_batch_size = batch_size
+        self.pluck_concurrency = concurrency
+
+    def __getattr__(self, name: str):
+        return getattr(self._repository, name)
+
+
+async def measure_plucks(plucker: PluckQuery, formulas: List[Formula]) -> float:
+    ids = [formula.id for formula in formulas]
+    before = perf_counter()
+    results = await plucker.plucks(lambda ids: FormulaPluckFilter(ids=ids), ids)
+    duration = perf_counter() - before
+    assert len(results) == len(formulas)
+
+    return duration
+
+
+async def main(count: int = 5000) -> None:
+    load_dotenv()
+    container = build_container()
+    database = container.get(ExpertDollupDatabase)
+    repository = container.get(InternalRepository[Formula])
+    formulas = make_formulas(count)
+
+    await database.connect()
+
+    try:
+        await repository.insert_many(formulas)
+
+        for name, settings in [
+            ("sequential batches of 10", PluckSettings(repository, 10, 1)),
+            (
+                f"{repository.pluck_concurrency} concurrent batches of "
+                f"{repository.pluck_batch_size}",
+                repository,
+            ),
+        ]:
+            duration = await measure_plucks(PluckQuery(settings), formulas)
+            print(
+                f"{name:<32} ids={count} "
+                f"duration={duration * 1000:8.1f} ms "
+                f"rows/s={count / duration:10.0f}"
+            )
+    finally:
+        await repository.delete_by(
+            FormulaFilter(project_definition_id=formulas[0].project_definition_id)
+        )
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+import gzip
+from io import BytesIO
+from time import perf_counter
+from datetime import datetime, timezone
+from typing import Callable, List
+from uuid import uuid4
+from expert_dollup.core.domains import *
+from expert_dollup.core.units import FormulaResolver
+from expert_dollup.infra.expert_dollup_storage import StagedFormulaDao
+from expert_dollup.infra.expert_dollup_db import FormulaDependencyGraphDao
+from expert_dollup.shared.database_services import JsonSerializer
+from expert_dollup.infra.storages.staged_formula_cache import (
+    encode_staged_formulas,
+    decode_staged_formulas,
+    COMPRESS_LEVEL,
+)
+
+
+def make_formulas(count: int) -> List[Formula]:
+    project_definition_id = uuid4()
+    creation_date_utc = datetime(2022, 1, 1, tzinfo=timezone.utc)
+
+    return [
+        Formula(
+            id=uuid4(),
+            project_definition_id=project_definition_id,
+            attached_to_type_id=uuid4(),
+            name=f"formula{index}",
+            expression=f"field{index} * 2.5 + formula{index - 1} / 3 + sum(x)",
+            path=[uuid4(), uuid4()],
+            creation_date_utc=creation_date_utc,
+            dependency_graph=FormulaDependencyGraph(
+                formulas=[FormulaDependency(uuid4(), f"formula{index - 1}")],
+                nodes=[FormulaDependency(uuid4(), f"field{index}")],
+            ),
+        )
+        for index in range(count)
+    ]
+
+
+def encode_legacy(staged_formulas: StagedFormulas) -> bytes:
+    fileobj = BytesIO()
+
+    with gzip.GzipFile(fileobj=fileobj, compresslevel=9, mode="wb") as f:
+        for formula in staged_formulas:
+            dao = StagedFormulaDao(
+                id=formula.id,
+                project_definition_id=formula.project_definition_id,
+                attached_to_type_id=formula.attached_to_type_id,
+                name=formula.name,
+                expression=formula.expression,
+                final_ast=formula.final_ast,
+                dependency_graph=FormulaDependencyGraphDao.parse_obj(
+                    JsonSerializer.decode(
+                        JsonSerializer.encode(formula.dependency_graph)
+                    )
+                ),
+            )
+            f.write(JsonSerializer.encode(dao.dict()))
+            f.write(b"\n")
+
+    return fileobj.getvalue()
+
+
+def decode_legacy(data: bytes) -> StagedFormulas:
+    with gzip.GzipFile(fileobj=BytesIO(data), mode="rb") as f:
+        daos = [
+            StagedFormulaDao.parse_obj(JsonSerializer.decode(line))
+            for line in f.readlines()
+        ]
+
+    return [
+        StagedFormula(
+            id=dao.id,
+            project_definition_id=dao.project_definition_id,
+            attached_to_type_id=dao.attached_to_type_id,
+            name=dao.name,
+            expression=dao.expression,
+            final_ast=dao.final_ast,
+            dependency_graph=FormulaDependencyGraph(
+                formulas=[
+                    FormulaDependency(d.target_type_id, d.name)
+                    for d in dao.dependency_graph.formulas
+                ],
+                nodes=[
+                    FormulaDependency(d.target_type_id, d.name)
+                    for d in dao.dependency_graph.nodes
+                ],
+            ),
+            path=[],
+            creation_date_utc=None,
+        )
+        for dao in daos
+    ]
+
+
+def encode_current(staged_formulas: StagedFormulas) -> bytes:
+    return gzip.compress(
+        encode_staged_formulas(staged_formulas), compresslevel=COMPRESS_LEVEL
+    )
+
+
+def decode_current(data: bytes) -> StagedFormulas:
+    return decode_staged_formulas(gzip.decompress(data))
+
+
+def measure(fn: Callable, *args, repeat: int = 3):
+    best = None
+
+    for _ in range(repeat):
+        before = perf_counter()
+        result = fn(*args)
+        duration = perf_counter() - before
+        best = duration if best is None else min(best, duration)
+
+    return best, result
+
+
+def main(count: int = 5000) -> None:
+    staged_formulas = FormulaResolver.stage_formulas(make_formulas(count))
+
+    for name, encode, decode in [
+        ("jsonl+pydantic gzip9", encode_legacy, decode_legacy),
+        (f"orjson arrays gzip{COMPRESS_LEVEL}", encode_current, decode_current),
+    ]:
+        encode_seconds, data = measure(encode, staged_formulas)
+        decode_seconds, decoded = measure(decode, data)
+        assert len(decoded) == count
+        print(
+            f"{name:<24} size={len(data):>9} bytes "
+            f"encode={encode_seconds * 1000:8.1f} ms "
+            f"decode={decode_seconds * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
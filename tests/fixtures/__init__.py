@@ -1,5 +1,5 @@
 from .mapping_helpers import map_dao_to_dto, make_sorter
-from .fake_db_helpers import FakeDb, DbFixtureHelper
+from .fake_db_helpers import FakeDb, DbFixtureHelper, InMemoryDataRevisions
 from .factories_domain import *
 from .factories_dto import *
 from .factories import *
@@ -7,6 +7,7 @@ from shutil import rmtree
 from pydantic.main import BaseModel
 from expert_dollup.shared.database_services import DbConnection
 from expert_dollup.shared.database_services.adapter_interfaces import Repository
+from expert_dollup.core.units.data_revisions import DataRevisions, NO_REVISION
 
 Domain = TypeVar("Domain")
 FakeDbLoader: TypeAlias = Callable[["FakeDb"], None]
@@ -117,3 +118,19 @@ class DbFixtureHelper:
         db = FakeDb.load_into(self.db, loaders)
         db = await self.init_db(db)
         return db
+
+
+class InMemoryDataRevisions(DataRevisions):
+    def __init__(self):
+        self.revisions: Dict[str, int] = {}
+
+    async def bump(self, *keys: str) -> str:
+        revision = max(self.revisions.values(), default=0) + 1
+
+        for key in keys:
+            self.revisions[key] = revision
+
+        return str(revision)
+
+    async def get_revision(self, key: str) -> str:
+        return str(self.revisions.get(key, NO_REVISION))
@@ -0,0 +1,28 @@
+import pytest
+from expert_dollup.core.domains import *
+from expert_dollup.core.usecases import ProjectUseCase
+from expert_dollup.shared.database_services import Repository
+from expert_dollup.shared.starlette_injection import Injector
+from ..fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_given_configured_databases_should_add_project(
+    container: Injector, db_helper: DbFixtureHelper
+):
+    db = await db_helper.load_fixtures(SuperUser(), SimpleProject())
+    user = db.get_only_one_matching(User, lambda u: u.oauth_id == SuperUser.oauth_id)
+    project_details = ProjectDetailsFactory(
+        project_definition_id=db.get_only_one(ProjectDefinition).id
+    )
+    usecase = container.get(ProjectUseCase)
+
+    assert await usecase.add(project_details, user) == project_details
+
+    project_service = container.get(Repository[ProjectDetails])
+    project_node_service = container.get(Repository[ProjectNode])
+    nodes = await project_node_service.find_by(
+        ProjectNodeFilter(project_id=project_details.id)
+    )
+    assert await project_service.find_by_id(project_details.id) == project_details
+    assert len(nodes) > 0
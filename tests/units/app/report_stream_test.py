@@ -0,0 +1,70 @@
+import pytest
+import json
+from uuid import UUID
+from expert_dollup.app.controllers.report.report import stream_project_report
+from expert_dollup.core.units.report_linking import iter_report_stream
+from expert_dollup.core.domains import *
+from expert_dollup.shared.starlette_injection import RequestHandler
+from tests.fixtures import *
+
+project_id = UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d")
+report_definition_id = UUID("6cb8eec4-0e80-2926-8813-79a4aca227cb")
+
+
+class StreamingReportUseCase:
+    def __init__(self, report: Report):
+        self.report = report
+
+    async def stream_report(self, project_id: UUID, report_definition_id: UUID):
+        for item in iter_report_stream(self.report):
+            yield item
+
+
+async def fetch_lines(container, report: Report) -> list:
+    response = await stream_project_report(
+        project_id,
+        report_definition_id,
+        usecase=StreamingReportUseCase(report),
+        handler=container.get(RequestHandler),
+    )
+    body = "".join([chunk async for chunk in response.body_iterator])
+
+    assert response.media_type == "application/x-ndjson"
+    assert body.endswith("\n")
+
+    return [json.loads(line) for line in body.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_given_report_should_stream_minimal_rows_as_ndjson(container):
+    report = ReportFactory(stages=[ReportStageFactory()])
+    lines = await fetch_lines(container, report)
+
+    assert [line["kind"] for line in lines] == [
+        "stage",
+        "row",
+        "row",
+        "row",
+        "stageSummary",
+        "report",
+    ]
+    assert set(lines[1].keys()) == {
+        "kind",
+        "nodeId",
+        "formulaId",
+        "elementDefId",
+        "childReferenceId",
+        "columns",
+    }
+    assert lines[1]["nodeId"] == str(report.stages[0].rows[0].node_id)
+    assert lines[-1]["name"] == report.name
+
+
+@pytest.mark.asyncio
+async def test_given_empty_report_should_stream_only_report_summary(container):
+    report = ReportFactory(stages=[])
+    lines = await fetch_lines(container, report)
+
+    assert len(lines) == 1
+    assert lines[0]["kind"] == "report"
+    assert lines[0]["name"] == report.name
@@ -0,0 +1,54 @@
+import pytest
+from uuid import UUID
+from expert_dollup.shared.database_services import Repository
+from expert_dollup.core.builders import ProjectBuilder
+from expert_dollup.core.domains import *
+from tests.fixtures.mock_interface_utils import StrictInterfaceSetup
+from tests.fixtures import *
+
+
+async def stream_chunks(*chunks: list):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_given_streamed_nodes_should_clone_paths_across_chunks():
+    project_details = ProjectDetailsFactory()
+    cloned_project = ProjectDetailsFactory()
+    root, child = [
+        ProjectNode(
+            id=UUID(int=index + 1),
+            project_id=project_details.id,
+            type_path=[UUID(int=10 + i) for i in range(index)],
+            type_id=UUID(int=10 + index),
+            type_name=f"node{index}",
+            path=[UUID(int=i + 1) for i in range(index)],
+            value=index,
+        )
+        for index in range(2)
+    ]
+    project_node_service = StrictInterfaceSetup(Repository)
+    project_node_service.setup(
+        lambda x: x.stream_by(ProjectNodeFilter(project_id=project_details.id)),
+        invoke=lambda *args: stream_chunks([child], [root]),
+    )
+    project_builder = ProjectBuilder(
+        project_node_service.object,
+        StrictInterfaceSetup(Repository).object,
+        StrictInterfaceSetup(Repository).object,
+        None,
+    )
+
+    chunks = [
+        chunk
+        async for chunk in project_builder.clone_project_nodes(
+            project_details.id, cloned_project
+        )
+    ]
+
+    [[cloned_child], [cloned_root]] = chunks
+    assert cloned_child.path == [cloned_root.id]
+    assert cloned_root.id != root.id
+    assert cloned_child.project_id == cloned_project.id
+    assert cloned_child.type_path == child.type_path
@@ -0,0 +1,56 @@
+from uuid import UUID
+from decimal import Decimal
+from dataclasses import replace
+from expert_dollup.core.domains import UnitInstance, UnitInstanceCache
+
+
+def test_given_unit_instances_should_expose_same_values_through_views():
+    unit_instances = [
+        UnitInstance(
+            formula_id=None,
+            node_id=UUID("941055cb-b2bc-0916-4182-4774e576c6eb"),
+            path=[
+                UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d"),
+                UUID("6cb8eec4-0e80-2926-8813-79a4aca227cb"),
+            ],
+            name="fieldA",
+            calculation_details="",
+            result=Decimal("5"),
+        ),
+        UnitInstance(
+            formula_id=UUID("f1f1e0ff-2344-48bc-e757-8c9dcd3c671e"),
+            node_id=UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d"),
+            path=[],
+            name="formulaA",
+            calculation_details="\n\n<final_result, 10> = 10",
+            result=Decimal("10"),
+        ),
+    ]
+
+    cache = UnitInstanceCache(unit_instances)
+
+    assert len(cache) == 2
+    assert cache == unit_instances
+    assert cache.materialize() == unit_instances
+    assert [view.report_dict for view in cache] == [
+        unit_instance.report_dict for unit_instance in unit_instances
+    ]
+    assert cache[1].formula_id == unit_instances[1].formula_id
+    assert not cache.has_formula(0)
+
+
+def test_given_untraced_unit_instance_should_keep_missing_calculation_details():
+    unit_instance = UnitInstance(
+        formula_id=UUID("f1f1e0ff-2344-48bc-e757-8c9dcd3c671e"),
+        node_id=UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d"),
+        path=[],
+        name="formulaA",
+        calculation_details=None,
+        result=Decimal("10"),
+    )
+
+    cache = UnitInstanceCache([unit_instance])
+
+    assert cache[0].calculation_details is None
+    assert cache[0].materialize() == unit_instance
+    assert replace(unit_instance, result=Decimal("2")).calculation_details is None
@@ -0,0 +1,40 @@
+from uuid import UUID
+from datetime import datetime, timezone
+from expert_dollup.core.domains import StagedFormula, FormulaDependencyGraph
+from expert_dollup.core.logits import serialize_post_processed_expression
+from expert_dollup.core.logits.formula_compiler import FormulaCompiler
+
+
+def make_staged_formula(index: int, expression: str) -> StagedFormula:
+    return StagedFormula(
+        id=UUID(int=index),
+        project_definition_id=UUID(int=0),
+        attached_to_type_id=UUID(int=0),
+        name=f"formula_{index}",
+        expression=expression,
+        path=[],
+        creation_date_utc=datetime(2000, 4, 3, 1, 1, 1, tzinfo=timezone.utc),
+        dependency_graph=FormulaDependencyGraph(formulas=[], nodes=[]),
+        final_ast=serialize_post_processed_expression(expression),
+    )
+
+
+def test_given_more_formulas_than_max_size_should_evict_least_recently_used():
+    compiler = FormulaCompiler(max_size=2)
+    first, second, third = [make_staged_formula(index, "1+2") for index in (1, 2, 3)]
+
+    compiled_first = compiler.compile(first)
+    compiled_second = compiler.compile(second)
+    compiler.compile(first)
+    compiler.compile(third)
+
+    assert compiler.compile(first) is compiled_first
+    assert not compiler.compile(second) is compiled_second
+    assert len(compiler._compiled_by_id) == 2
+
+
+def test_given_changed_expression_should_recompile_formula():
+    compiler = FormulaCompiler()
+    compiled = compiler.compile(make_staged_formula(1, "1+2"))
+
+    assert not compiler.compile(make_staged_formula(1, "1+3")) is compiled
@@ -0,0 +1,85 @@
+from uuid import UUID
+from decimal import Decimal
+from expert_dollup.core.domains import UnitInstance
+from expert_dollup.core.logits import (
+    FormulaInjector,
+    FrozenUnit,
+    FormulaUnit,
+    serialize_post_processed_expression,
+)
+from expert_dollup.core.logits.formula_processor import compile_flat_ast
+
+root_id = UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d")
+section_id = UUID("6cb8eec4-0e80-2926-8813-79a4aca227cb")
+other_section_id = UUID("8ceb58ac-94a7-0ae9-a6da-6b6fbb3e00e8")
+field_id = UUID("941055cb-b2bc-0916-4182-4774e576c6eb")
+other_field_id = UUID("a23ee02f-9bc1-0573-ed61-60ebffc6d4c8")
+
+
+def make_unit(node_id: UUID, path, name: str, value) -> FrozenUnit:
+    return FrozenUnit(
+        UnitInstance(
+            formula_id=None,
+            node_id=node_id,
+            path=path,
+            name=name,
+            calculation_details="",
+            result=Decimal(value),
+        )
+    )
+
+
+def test_given_units_should_resolve_node_then_ancestor_then_global_name():
+    field = make_unit(field_id, [root_id, section_id], "field", 1)
+    other_field = make_unit(other_field_id, [root_id, other_section_id], "field", 2)
+    section_formula = make_unit(section_id, [root_id], "section", 3)
+    injector = FormulaInjector().add_units([field, other_field, section_formula])
+
+    assert injector.get_unit(field_id, [root_id, section_id], "field") == [field]
+    assert injector.get_unit(section_id, [root_id], "field") == [field]
+    assert injector.get_unit(root_id, [], "field") == [field, other_field]
+    assert injector.get_unit(
+        other_field_id, [root_id, other_section_id], "section"
+    ) == [section_formula]
+    assert injector.get_unit(str(field_id), [root_id, section_id], "field") == [field]
+    assert injector.get_unit(field_id, [root_id, section_id], "missing") == []
+
+
+def test_given_units_added_with_str_ids_should_resolve_by_uuid():
+    field = make_unit(str(field_id), [str(root_id), str(section_id)], "field", 1)
+    other_field = make_unit(other_field_id, [root_id, other_section_id], "field", 2)
+    section_formula = make_unit(str(section_id), [str(root_id)], "section", 3)
+    other_section_formula = make_unit(other_section_id, [root_id], "section", 4)
+    injector = FormulaInjector().add_units(
+        [field, other_field, section_formula, other_section_formula]
+    )
+
+    assert injector.get_unit(field_id, [root_id, section_id], "field") == [field]
+    assert injector.get_unit(section_id, [root_id], "field") == [field]
+    assert injector.get_unit(str(other_section_id), [], "field") == [other_field]
+    assert injector.get_unit(field_id, [root_id, section_id], "section") == [
+        section_formula
+    ]
+
+
+def test_given_untraced_injector_should_compute_without_calculation_details():
+    field = make_unit(field_id, [root_id, section_id], "field", 2)
+    formula_instance = UnitInstance(
+        formula_id=UUID(int=1),
+        node_id=section_id,
+        path=[root_id],
+        name="formula",
+        calculation_details="stale",
+        result=None,
+    )
+    injector = FormulaInjector(trace_details=False)
+    formula = FormulaUnit(
+        formula_instance,
+        ["field"],
+        compile_flat_ast(serialize_post_processed_expression("field*3")),
+        injector,
+    )
+    injector.add_units([field, formula])
+
+    assert formula.computed.result == Decimal(6)
+    assert formula.computed.calculation_details is None
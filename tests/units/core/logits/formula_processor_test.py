@@ -1,5 +1,10 @@
+from uuid import UUID
 from decimal import Decimal
 from expert_dollup.core.logits import serialize_post_processed_expression
+from expert_dollup.core.logits.formula_processor import (
+    ComputationUnit,
+    compile_flat_ast,
+)
 
 
 def test_given_formula_expression_should_produce_correct_serialized_ast():
@@ -157,3 +162,53 @@ def test_given_formula_expression_when_expression_contain_function_should_produc
         ],
         "root_index": 13,
     }
+
+
+def test_given_compiled_formula_should_compute_result_and_details():
+    node_id = UUID("1f5d33d7-2b0c-4bcd-a6c3-a0d0e8ef6c63")
+    expression = "mdcfg*((sgcgm-sgcpm)/2)"
+    compiled = compile_flat_ast(serialize_post_processed_expression(expression))
+
+    def make_unit(name: str, value: Decimal) -> ComputationUnit:
+        return ComputationUnit(name, node_id, value, {})
+
+    result, details = compiled(
+        ComputationUnit(
+            "formula",
+            node_id,
+            None,
+            {
+                "mdcfg": [make_unit("mdcfg", Decimal(3))],
+                "sgcgm": [make_unit("sgcgm", Decimal(5))],
+                "sgcpm": [
+                    make_unit("sgcpm", Decimal(1)),
+                    make_unit("sgcpm", Decimal(2)),
+                ],
+            },
+        )
+    )
+
+    assert result == Decimal(3)
+    assert details == (
+        "\ntemp1(3) = sum(sgcpm)"
+        f"\ntemp2(2) = <sgcgm[{node_id}], 5> - temp1(3)"
+        "\ntemp3(1) = safe_div(temp2(2), 2)"
+        f"\ntemp4(3) = <mdcfg[{node_id}], 3> * temp3(1)"
+        "\n\n<final_result, 3> = temp4(3)"
+    )
+
+
+def test_given_compiled_formula_should_only_compile_requested_variant():
+    node_id = UUID("1f5d33d7-2b0c-4bcd-a6c3-a0d0e8ef6c63")
+    compiled = compile_flat_ast(serialize_post_processed_expression("a*2"))
+    unit = ComputationUnit(
+        "formula",
+        node_id,
+        None,
+        {"a": [ComputationUnit("a", node_id, Decimal(3), {})]},
+    )
+
+    assert compiled.evaluate(unit) == Decimal(6)
+    assert compiled._root is None
+    assert compiled(unit)[0] == Decimal(6)
+    assert not compiled._root is None
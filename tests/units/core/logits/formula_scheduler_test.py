@@ -0,0 +1,40 @@
+import pytest
+from dataclasses import dataclass, field
+from typing import List
+from expert_dollup.core.exceptions import FormulaCycleError
+from expert_dollup.core.logits import FormulaScheduler
+
+
+@dataclass
+class FakeUnit:
+    name: str
+    dependencies: List["FakeUnit"] = field(default_factory=list)
+
+
+def test_given_formula_dag_should_schedule_units_by_level():
+    a = FakeUnit("a")
+    b = FakeUnit("b", [a])
+    c = FakeUnit("c", [a])
+    d = FakeUnit("d", [b, c, a])
+
+    levels = FormulaScheduler([d, c, b, a], lambda u: u.dependencies).build_levels()
+
+    assert [[unit.name for unit in level] for level in levels] == [
+        ["a"],
+        ["c", "b"],
+        ["d"],
+    ]
+
+
+def test_given_formula_cycle_should_report_offending_formula_names():
+    a = FakeUnit("a")
+    b = FakeUnit("b", [a])
+    c = FakeUnit("c", [b])
+    a.dependencies.append(c)
+    d = FakeUnit("d", [a])
+
+    with pytest.raises(FormulaCycleError) as error:
+        FormulaScheduler([d, a, b, c], lambda u: u.dependencies).build_levels()
+
+    assert set(error.value.formula_names) == {"a", "b", "c"}
+    assert error.value.formula_names[0] == error.value.formula_names[-1]
@@ -0,0 +1,117 @@
+from uuid import UUID
+from decimal import Decimal
+from datetime import datetime, timezone
+from expert_dollup.core.domains import (
+    StagedFormula,
+    FormulaDependencyGraph,
+    FormulaDependency,
+    UnitInstance,
+    UnitInstanceCache,
+)
+from expert_dollup.core.logits import (
+    UnitDependencyIndex,
+    UnitDependencyIndexCache,
+    serialize_post_processed_expression,
+)
+
+root_id = UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d")
+section_id = UUID("6cb8eec4-0e80-2926-8813-79a4aca227cb")
+other_section_id = UUID("8ceb58ac-94a7-0ae9-a6da-6b6fbb3e00e8")
+field_id = UUID("941055cb-b2bc-0916-4182-4774e576c6eb")
+other_field_id = UUID("a23ee02f-9bc1-0573-ed61-60ebffc6d4c8")
+
+
+def make_staged_formula(index: int, name: str, dependencies) -> StagedFormula:
+    expression = "+".join(dependencies)
+    return StagedFormula(
+        id=UUID(int=index),
+        project_definition_id=UUID(int=0),
+        attached_to_type_id=UUID(int=0),
+        name=name,
+        expression=expression,
+        path=[],
+        creation_date_utc=datetime(2000, 4, 3, 1, 1, 1, tzinfo=timezone.utc),
+        dependency_graph=FormulaDependencyGraph(
+            formulas=[
+                FormulaDependency(target_type_id=UUID(int=0), name=name)
+                for name in dependencies
+            ],
+            nodes=[],
+        ),
+        final_ast=serialize_post_processed_expression(expression),
+    )
+
+
+def make_unit_instance(formula_id, node_id, path, name) -> UnitInstance:
+    return UnitInstance(
+        formula_id=formula_id,
+        node_id=node_id,
+        path=path,
+        name=name,
+        calculation_details="",
+        result=Decimal(0),
+    )
+
+
+def make_unit_instances(formulas) -> UnitInstanceCache:
+    section, total, other = formulas
+    return UnitInstanceCache(
+        [
+            make_unit_instance(None, field_id, [root_id, section_id], "field"),
+            make_unit_instance(
+                None, other_field_id, [root_id, other_section_id], "field"
+            ),
+            make_unit_instance(section.id, section_id, [root_id], section.name),
+            make_unit_instance(
+                section.id, other_section_id, [root_id], section.name
+            ),
+            make_unit_instance(total.id, root_id, [], total.name),
+            make_unit_instance(other.id, root_id, [], other.name),
+        ]
+    )
+
+
+def make_formulas():
+    return [
+        make_staged_formula(1, "section", ["field"]),
+        make_staged_formula(2, "total", ["section"]),
+        make_staged_formula(3, "other", ["missing"]),
+    ]
+
+
+def test_given_updated_field_should_find_scoped_dependents():
+    formulas = make_formulas()
+    index = UnitDependencyIndex.build(
+        make_unit_instances(formulas), {formula.id: formula for formula in formulas}
+    )
+
+    assert index.field_index_by_node_id == {field_id: 0, other_field_id: 1}
+    assert index.dependencies_by_index == {2: [0], 3: [1], 4: [2, 3], 5: []}
+    assert index.find_dependents([0]) == [2, 4]
+    assert index.find_dependents([1]) == [3, 4]
+    assert index.find_dependents([5]) == []
+
+
+def test_given_unknown_formula_should_not_build_index():
+    formulas = make_formulas()
+    unit_instances = make_unit_instances(formulas)
+
+    assert (
+        UnitDependencyIndex.build(
+            unit_instances, {formula.id: formula for formula in formulas[0:2]}
+        )
+        is None
+    )
+
+
+def test_given_other_revision_should_miss_cached_index():
+    index = UnitDependencyIndex({}, {})
+    cache = UnitDependencyIndexCache(max_size=1)
+    cache.set(root_id, ("1", "0"), index)
+
+    assert cache.get(root_id, ("1", "0")) is index
+    assert cache.get(root_id, ("2", "0")) is None
+
+    cache.set(section_id, ("1", "0"), index)
+
+    assert cache.get(root_id, ("1", "0")) is None
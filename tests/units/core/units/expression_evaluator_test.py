@@ -80,3 +80,15 @@ def test_expression_evaluator_simple_mul():
         },
     )
     assert result == Decimal("67.514590")
+
+
+def test_expression_evaluator_should_reuse_compiled_expression():
+    evaluator = ExpressionEvaluator()
+    expression = "row['columns']['quantity'] * row['columns']['cost_per_unit']"
+    compiled = evaluator.compile(expression)
+
+    assert evaluator.compile(expression) is compiled
+    assert evaluator.evaluate(
+        compiled,
+        {"row": {"columns": {"quantity": Decimal(3), "cost_per_unit": Decimal(2)}}},
+    ) == Decimal(6)
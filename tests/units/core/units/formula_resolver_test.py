@@ -1,13 +1,21 @@
 import pytest
+from asyncio import gather, sleep
+from copy import deepcopy
 from uuid import UUID
 from decimal import Decimal
-from tests.fixtures.mock_interface_utils import StrictInterfaceSetup
+from tests.fixtures.mock_interface_utils import StrictInterfaceSetup, compare_per_arg
 from expert_dollup.core.object_storage import ObjectStorage
 from expert_dollup.shared.database_services import Repository, Plucker
 from expert_dollup.core.repositories import *
 from expert_dollup.core.domains import *
 from expert_dollup.core.units import *
+from expert_dollup.core.units.single_flight import SingleFlight
 from expert_dollup.core.builders import *
+from expert_dollup.core.logits import (
+    FormulaCompiler,
+    UnitDependencyIndex,
+    UnitDependencyIndexCache,
+)
 from tests.fixtures import *
 
 
@@ -148,6 +156,11 @@ async def test_given_unit_instances_should_compute_collection(logger_factory):
         StrictInterfaceSetup(ProjectDefinitionNodeRepository).object,
         unit_instance_builder.object,
         stage_formulas_storage.object,
+        StrictInterfaceSetup(ObjectStorage).object,
+        FormulaCompiler(),
+        UnitDependencyIndexCache(),
+        SingleFlight(),
+        InMemoryDataRevisions(),
         logger_factory,
     )
 
@@ -156,3 +169,341 @@ async def test_given_unit_instances_should_compute_collection(logger_factory):
     )
 
     assert injector.unit_instances == expected_result
+
+
+@pytest.mark.asyncio
+async def test_given_updated_field_should_patch_cached_unit_instances(
+    logger_factory,
+):
+    project_node_service = StrictInterfaceSetup(ProjectNodeRepository)
+    unit_instance_builder = StrictInterfaceSetup(UnitInstanceBuilder)
+    stage_formulas_storage = StrictInterfaceSetup(ObjectStorage)
+    unit_instance_storage = StrictInterfaceSetup(ObjectStorage)
+
+    fixture = ProjectInstanceFactory.build(make_base_project_seed())
+    fields = [node for node in fixture.nodes if not node.value is None]
+    stages_formulas = FormulaResolver.stage_formulas(fixture.formulas)
+    saved_instances = []
+
+    stage_formulas_storage.setup(
+        lambda x: x.load(StagedFormulasKey(fixture.project_definition.id)),
+        returns_async=stages_formulas,
+    )
+
+    project_node_service.setup(
+        lambda x: x.get_all_fields(fixture.project.id), returns_async=fields
+    )
+
+    unit_instance_builder.setup(
+        lambda x: x.build_with_fields(stages_formulas, fields),
+        invoke=lambda *args: deepcopy(fixture.unit_instances),
+    )
+
+    formula_resolver = FormulaResolver(
+        StrictInterfaceSetup(Repository).object,
+        project_node_service.object,
+        StrictInterfaceSetup(ProjectDefinitionNodeRepository).object,
+        unit_instance_builder.object,
+        stage_formulas_storage.object,
+        unit_instance_storage.object,
+        FormulaCompiler(),
+        UnitDependencyIndexCache(),
+        SingleFlight(),
+        InMemoryDataRevisions(),
+        logger_factory,
+    )
+
+    injector = await formula_resolver.compute_all_project_formula(
+        fixture.project.id, fixture.project_definition.id
+    )
+    cached_instances = injector.unit_instances
+
+    async def save_instances(key, instances):
+        saved_instances.extend(instances)
+
+    unit_instance_storage.setup(
+        lambda x: x.load(UnitInstanceCacheKey(project_id=fixture.project.id)),
+        returns_async=UnitInstanceCache(cached_instances),
+    )
+    unit_instance_storage.setup(
+        lambda x: x.save(
+            UnitInstanceCacheKey(project_id=fixture.project.id), lambda _: True
+        ),
+        compare_method=compare_per_arg,
+        invoke=save_instances,
+    )
+
+    updated_field = next(node for node in fields if node.type_name == "fieldA")
+    updated_field.value = 7
+
+    patched_instances = await formula_resolver.update_project_formulas(
+        fixture.project.id, fixture.project_definition.id, [updated_field]
+    )
+    injector = await formula_resolver.compute_all_project_formula(
+        fixture.project.id, fixture.project_definition.id
+    )
+
+    assert patched_instances == injector.unit_instances
+    assert saved_instances == injector.unit_instances
+
+
+class InMemoryUnitInstanceStorage(ObjectStorage):
+    def __init__(self):
+        self.cache = None
+
+    async def load(self, ctx: UnitInstanceCacheKey) -> UnitInstanceCache:
+        await sleep(0)
+        return UnitInstanceCache(self.cache.materialize())
+
+    async def save(self, ctx: UnitInstanceCacheKey, cache: UnitInstanceCache):
+        await sleep(0)
+        self.cache = cache
+
+    def get_url(self, ctx: UnitInstanceCacheKey) -> str:
+        return str(ctx.project_id)
+
+
+@pytest.mark.asyncio
+async def test_given_concurrent_field_updates_should_keep_both_edits(
+    logger_factory,
+):
+    project_node_service = StrictInterfaceSetup(ProjectNodeRepository)
+    unit_instance_builder = StrictInterfaceSetup(UnitInstanceBuilder)
+    stage_formulas_storage = StrictInterfaceSetup(ObjectStorage)
+    unit_instance_storage = InMemoryUnitInstanceStorage()
+
+    fixture = ProjectInstanceFactory.build(make_base_project_seed())
+    fields = [node for node in fixture.nodes if not node.value is None]
+    stages_formulas = FormulaResolver.stage_formulas(fixture.formulas)
+
+    stage_formulas_storage.setup(
+        lambda x: x.load(StagedFormulasKey(fixture.project_definition.id)),
+        returns_async=stages_formulas,
+    )
+    project_node_service.setup(
+        lambda x: x.get_all_fields(fixture.project.id), returns_async=fields
+    )
+    unit_instance_builder.setup(
+        lambda x: x.build_with_fields(stages_formulas, fields),
+        invoke=lambda *args: deepcopy(fixture.unit_instances),
+    )
+
+    formula_resolver = FormulaResolver(
+        StrictInterfaceSetup(Repository).object,
+        project_node_service.object,
+        StrictInterfaceSetup(ProjectDefinitionNodeRepository).object,
+        unit_instance_builder.object,
+        stage_formulas_storage.object,
+        unit_instance_storage,
+        FormulaCompiler(),
+        UnitDependencyIndexCache(),
+        SingleFlight(),
+        InMemoryDataRevisions(),
+        logger_factory,
+    )
+
+    injector = await formula_resolver.compute_all_project_formula(
+        fixture.project.id, fixture.project_definition.id
+    )
+    unit_instance_storage.cache = UnitInstanceCache(injector.unit_instances)
+
+    field_a = next(node for node in fields if node.type_name == "fieldA")
+    field_b = next(node for node in fields if node.type_name == "fieldB")
+    field_a.value = 7
+    field_b.value = 3
+
+    await gather(
+        formula_resolver.update_project_formulas(
+            fixture.project.id, fixture.project_definition.id, [field_a]
+        ),
+        formula_resolver.update_project_formulas(
+            fixture.project.id, fixture.project_definition.id, [field_b]
+        ),
+    )
+    injector = await formula_resolver.compute_all_project_formula(
+        fixture.project.id, fixture.project_definition.id
+    )
+
+    assert unit_instance_storage.cache == injector.unit_instances
+
+
+def make_cached_formula_resolver(
+    fixture, unit_instance_storage, logger_factory
+) -> FormulaResolver:
+    project_node_service = StrictInterfaceSetup(ProjectNodeRepository)
+    unit_instance_builder = StrictInterfaceSetup(UnitInstanceBuilder)
+    stage_formulas_storage = StrictInterfaceSetup(ObjectStorage)
+    fields = [node for node in fixture.nodes if not node.value is None]
+    stages_formulas = FormulaResolver.stage_formulas(fixture.formulas)
+
+    stage_formulas_storage.setup(
+        lambda x: x.load(StagedFormulasKey(fixture.project_definition.id)),
+        returns_async=stages_formulas,
+    )
+    project_node_service.setup(
+        lambda x: x.get_all_fields(fixture.project.id), returns_async=fields
+    )
+    unit_instance_builder.setup(
+        lambda x: x.build_with_fields(stages_formulas, fields),
+        invoke=lambda *args: deepcopy(fixture.unit_instances),
+    )
+
+    return FormulaResolver(
+        StrictInterfaceSetup(Repository).object,
+        project_node_service.object,
+        StrictInterfaceSetup(ProjectDefinitionNodeRepository).object,
+        unit_instance_builder.object,
+        stage_formulas_storage.object,
+        unit_instance_storage,
+        FormulaCompiler(),
+        UnitDependencyIndexCache(),
+        SingleFlight(),
+        InMemoryDataRevisions(),
+        logger_factory,
+    )
+
+
+@pytest.mark.asyncio
+async def test_given_invalidated_unit_instances_should_skip_field_patch(
+    logger_factory,
+):
+    fixture = ProjectInstanceFactory.build(make_base_project_seed())
+    unit_instance_storage = InMemoryUnitInstanceStorage()
+    formula_resolver = make_cached_formula_resolver(
+        fixture, unit_instance_storage, logger_factory
+    )
+    unit_instance_cache = await formula_resolver.refresh_project_formulas(
+        fixture.project.id, fixture.project_definition.id
+    )
+    field = next(node for node in fixture.nodes if node.type_name == "fieldA")
+    field.value = 7
+
+    await formula_resolver.invalidate_project_formulas(fixture.project.id)
+    patched_instances = await formula_resolver.update_project_formulas(
+        fixture.project.id, fixture.project_definition.id, [field]
+    )
+
+    assert patched_instances is None
+    assert unit_instance_storage.cache is unit_instance_cache
+    assert await formula_resolver.load_unit_instances(fixture.project.id) is None
+
+
+@pytest.mark.asyncio
+async def test_given_patched_unit_instances_should_not_save_older_snapshot(
+    logger_factory,
+):
+    fixture = ProjectInstanceFactory.build(make_base_project_seed())
+    unit_instance_storage = InMemoryUnitInstanceStorage()
+    formula_resolver = make_cached_formula_resolver(
+        fixture, unit_instance_storage, logger_factory
+    )
+    snapshot = await formula_resolver.refresh_project_formulas(
+        fixture.project.id, fixture.project_definition.id
+    )
+    revision = await formula_resolver.get_unit_instances_revision(fixture.project.id)
+    field = next(node for node in fixture.nodes if node.type_name == "fieldA")
+    field.value = 7
+
+    patched_instances = await formula_resolver.update_project_formulas(
+        fixture.project.id, fixture.project_definition.id, [field]
+    )
+    saved = await formula_resolver.save_unit_instances(
+        fixture.project.id, revision, snapshot
+    )
+
+    assert saved is False
+    assert unit_instance_storage.cache is patched_instances
+    assert await formula_resolver.save_unit_instances(
+        fixture.project.id,
+        await formula_resolver.get_unit_instances_revision(fixture.project.id),
+        snapshot,
+    )
+
+
+@pytest.mark.asyncio
+async def test_given_successive_field_updates_should_reuse_dependency_index(
+    logger_factory, monkeypatch
+):
+    fixture = ProjectInstanceFactory.build(make_base_project_seed())
+    unit_instance_storage = InMemoryUnitInstanceStorage()
+    formula_resolver = make_cached_formula_resolver(
+        fixture, unit_instance_storage, logger_factory
+    )
+    build_index = UnitDependencyIndex.build
+    built_indexes = []
+
+    def build_and_count(*args):
+        index = build_index(*args)
+        built_indexes.append(index)
+        return index
+
+    monkeypatch.setattr(UnitDependencyIndex, "build", staticmethod(build_and_count))
+    await formula_resolver.refresh_project_formulas(
+        fixture.project.id, fixture.project_definition.id
+    )
+    field_a = next(node for node in fixture.nodes if node.type_name == "fieldA")
+    field_b = next(node for node in fixture.nodes if node.type_name == "fieldB")
+    field_a.value = 7
+    field_b.value = 3
+
+    await formula_resolver.update_project_formulas(
+        fixture.project.id, fixture.project_definition.id, [field_a]
+    )
+    patched_instances = await formula_resolver.update_project_formulas(
+        fixture.project.id, fixture.project_definition.id, [field_b]
+    )
+    injector = await formula_resolver.compute_all_project_formula(
+        fixture.project.id, fixture.project_definition.id
+    )
+
+    assert len(built_indexes) == 1
+    assert patched_instances == injector.unit_instances
+
+
+@pytest.mark.asyncio
+async def test_given_new_formulas_should_patch_staged_formulas(logger_factory):
+    stage_formulas_storage = StrictInterfaceSetup(ObjectStorage)
+
+    fixture = ProjectInstanceFactory.build(make_base_project_seed())
+    key = StagedFormulasKey(fixture.project_definition.id)
+    updated_formula, *other_formulas = fixture.formulas
+    staged_formulas = FormulaResolver.stage_formulas(other_formulas)
+    added_formulas = [updated_formula, *other_formulas[0:1]]
+    saved_formulas = []
+
+    async def save_formulas(key, formulas):
+        saved_formulas.extend(formulas)
+
+    stage_formulas_storage.setup(
+        lambda x: x.load(key),
+        returns_async=staged_formulas,
+    )
+    stage_formulas_storage.setup(
+        lambda x: x.save(key, lambda _: True),
+        compare_method=compare_per_arg,
+        invoke=save_formulas,
+    )
+
+    formula_resolver = FormulaResolver(
+        StrictInterfaceSetup(Repository).object,
+        StrictInterfaceSetup(ProjectNodeRepository).object,
+        StrictInterfaceSetup(ProjectDefinitionNodeRepository).object,
+        StrictInterfaceSetup(UnitInstanceBuilder).object,
+        stage_formulas_storage.object,
+        StrictInterfaceSetup(ObjectStorage).object,
+        FormulaCompiler(),
+        UnitDependencyIndexCache(),
+        SingleFlight(),
+        InMemoryDataRevisions(),
+        logger_factory,
+    )
+
+    patched_formulas = await formula_resolver.patch_staged_formulas(
+        fixture.project_definition.id, added_formulas
+    )
+
+    assert patched_formulas == saved_formulas
+    assert patched_formulas == [
+        *staged_formulas[1:],
+        *FormulaResolver.stage_formulas(added_formulas),
+    ]
@@ -1,8 +1,9 @@
 import pytest
 from datetime import datetime, timezone
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from decimal import Decimal
 from uuid import UUID
+from typing import List, Optional
 from expert_dollup.core.logits import FormulaInjector, FrozenUnit
 from expert_dollup.shared.starlette_injection.clock_provider import StaticClock
 from expert_dollup.shared.database_services import Repository, Plucker
@@ -10,9 +11,11 @@ from tests.fixtures.factories.datasheet_factory import CustomDatasheetInstancePa
 from tests.fixtures.factories.project_instance_factory import (
     CustomProjectInstancePackage,
 )
-from tests.fixtures.mock_interface_utils import StrictInterfaceSetup
+from tests.fixtures.mock_interface_utils import StrictInterfaceSetup, compare_per_arg
 from expert_dollup.app.dtos import *
 from expert_dollup.core.units import *
+from expert_dollup.core.units.report_plan import ReportPlanCache
+from expert_dollup.core.units.report_linking import ReportLinkingCache
 from expert_dollup.core.builders import *
 from expert_dollup.core.domains import *
 from expert_dollup.core.exceptions import *
@@ -205,6 +208,10 @@ async def test_given_row_cache_should_produce_correct_report(
         lambda x: x.refresh_cache(report_definition), returns_async=report_rows_cache
     )
 
+    formula_resolver.setup(
+        lambda x: x.get_unit_instances_revision(project_fixture.project.id),
+        returns_async="0",
+    )
     formula_resolver.setup(
         lambda x: x.compute_all_project_formula(
             project_fixture.project.id, report_definition.project_definition_id
@@ -233,6 +240,8 @@ async def test_given_row_cache_should_produce_correct_report(
         ExpressionEvaluator(),
         report_row_cache.object,
         formula_resolver.object,
+        ReportPlanCache(),
+        ReportLinkingCache(),
         clock,
         logger_factory,
     )
@@ -242,3 +251,200 @@ async def test_given_row_cache_should_produce_correct_report(
     )
 
     assert report == expected_report
+
+
+def make_report_rows_cache(report_seed: ReportSeed) -> ReportRowsCache:
+    return [
+        {
+            "abstractproduct": report_seed.element_def.report_dict,
+            "datasheet_element": report_seed.datasheet_element.report_dict,
+            "formula": report_seed.formula.report_dict,
+            "stage": {"name": "show_concrete"},
+            "substage": {
+                "id": UUID("6524c49c-93e7-0606-4d62-1ac982d40027"),
+                "name": "floor_label_0",
+                "order_index": 0,
+                "datasheet_element": report_seed.element_def.id,
+                "formula": report_seed.formula.id,
+            },
+        }
+    ]
+
+
+def make_report_linking(
+    report_seed: ReportSeed,
+    unit_instances: List[UnitInstance],
+    cached_unit_instances: Optional[UnitInstanceCache],
+    logger_factory,
+) -> ReportLinking:
+    project_fixture = report_seed.project_fixture
+    report_definition = report_seed.report_definition
+    datasheet_element_service = StrictInterfaceSetup(Repository)
+    report_row_cache = StrictInterfaceSetup(ReportRowCache)
+    formula_resolver = StrictInterfaceSetup(FormulaResolver)
+
+    report_row_cache.setup(
+        lambda x: x.refresh_cache(report_definition),
+        returns_async=make_report_rows_cache(report_seed),
+    )
+    formula_resolver.setup(
+        lambda x: x.get_unit_instances_revision(project_fixture.project.id),
+        returns_async="1",
+    )
+    formula_resolver.setup(
+        lambda x: x.compute_all_project_formula(
+            project_fixture.project.id, report_definition.project_definition_id
+        ),
+        returns_async=FormulaInjector().add_units(
+            FrozenUnit(i) for i in unit_instances
+        ),
+    )
+    formula_resolver.setup(
+        lambda x: x.save_unit_instances(
+            project_fixture.project.id, "1", lambda cache: True
+        ),
+        returns_async=True,
+        compare_method=compare_per_arg,
+    )
+    formula_resolver.setup(
+        lambda x: x.load_unit_instances(project_fixture.project.id),
+        returns_async=cached_unit_instances,
+    )
+    datasheet_element_service.setup(
+        lambda x: x.find_by(
+            DatasheetElementFilter(
+                datasheet_id=report_seed.datasheet_fixture.datasheet.id,
+                ordinal=0,
+            )
+        ),
+        returns_async=[
+            datasheet_element
+            for datasheet_element in report_seed.datasheet_fixture.datasheet_elements
+            if datasheet_element.ordinal == 0
+        ],
+    )
+
+    return ReportLinking(
+        datasheet_element_service.object,
+        ExpressionEvaluator(),
+        report_row_cache.object,
+        formula_resolver.object,
+        ReportPlanCache(),
+        ReportLinkingCache(),
+        StaticClock(datetime(2000, 4, 3, 1, 1, 1, 0, timezone.utc)),
+        logger_factory,
+    )
+
+
+@pytest.mark.asyncio
+async def test_given_changed_unit_instances_should_patch_linked_report(
+    report_seed: ReportSeed, logger_factory
+):
+    project = report_seed.project_fixture.project
+    unit_instances = report_seed.project_fixture.unit_instances
+    changed_unit_instances = [
+        replace(unit_instance, result=unit_instance.result * 2)
+        if unit_instance.name == "formulaA"
+        else unit_instance
+        for unit_instance in unit_instances
+    ]
+    cached_unit_instances = UnitInstanceCache(changed_unit_instances)
+
+    report_linking = make_report_linking(
+        report_seed, unit_instances, cached_unit_instances, logger_factory
+    )
+    report = await report_linking.refresh_report(report_seed.report_definition, project)
+    assert report.stages[0].summary.value == Decimal("24.24")
+
+    patched_report = await report_linking.refresh_report(
+        report_seed.report_definition, project
+    )
+    expected_report = await make_report_linking(
+        report_seed, changed_unit_instances, cached_unit_instances, logger_factory
+    ).link_report(report_seed.report_definition, project)
+
+    assert patched_report.stages[0].summary.value == Decimal("48.48")
+    assert patched_report == expected_report
+
+
+@pytest.mark.asyncio
+async def test_given_row_cache_should_stream_report_items(
+    report_seed: ReportSeed, logger_factory
+):
+    project = report_seed.project_fixture.project
+    unit_instances = report_seed.project_fixture.unit_instances
+    report_linking = make_report_linking(
+        report_seed, unit_instances, None, logger_factory
+    )
+
+    items = [
+        item
+        async for item in report_linking.stream_report(
+            report_seed.report_definition, project
+        )
+    ]
+    expected_report = await report_linking.link_report(
+        report_seed.report_definition, project
+    )
+    expected_stage = expected_report.stages[0]
+
+    assert items == [
+        ReportStageHeader(expected_stage.summary.label, expected_stage.columns),
+        *expected_stage.rows,
+        ReportStageSummary(expected_stage.summary),
+        ReportStreamSummary(
+            name=expected_report.name,
+            datasheet_id=expected_report.datasheet_id,
+            summaries=expected_report.summaries,
+            creation_date_utc=expected_report.creation_date_utc,
+        ),
+    ]
+
+
+@dataclass
+class SizedLinkedReport:
+    report_key: ReportKey
+    row_count: int
+
+
+def test_given_linked_reports_over_row_budget_should_evict_oldest():
+    cache = ReportLinkingCache(max_size=16, max_rows=10)
+    first, second, third, too_big = [
+        SizedLinkedReport(
+            ReportKey(project_id=UUID(int=index), report_definition_id=UUID(int=0)),
+            row_count,
+        )
+        for index, row_count in enumerate([4, 4, 4, 11])
+    ]
+
+    for linked_report in [first, second, third, too_big]:
+        cache.set(linked_report)
+
+    assert cache.get(first.report_key) is None
+    assert cache.get(second.report_key) is second
+    assert cache.get(third.report_key) is third
+    assert cache.get(too_big.report_key) is None
+    assert cache.row_count == 8
+
+
+@pytest.mark.asyncio
+async def test_given_stream_closed_early_should_still_save_unit_instances(
+    report_seed: ReportSeed, logger_factory
+):
+    project = report_seed.project_fixture.project
+    unit_instances = report_seed.project_fixture.unit_instances
+    report_linking = make_report_linking(
+        report_seed, unit_instances, None, logger_factory
+    )
+    saved_revisions = []
+
+    async def save_unit_instances(project_id, revision, unit_instance_cache):
+        saved_revisions.append(revision)
+        return True
+
+    report_linking.formula_resolver.save_unit_instances = save_unit_instances
+    stream = report_linking.stream_report(report_seed.report_definition, project)
+
+    assert isinstance(await stream.__anext__(), ReportStageHeader)
+    await stream.aclose()
+    assert saved_revisions == ["1"]
@@ -0,0 +1,35 @@
+from dataclasses import replace
+from expert_dollup.core.units import ExpressionEvaluator
+from expert_dollup.core.units.report_plan import ReportPlanCache
+from tests.fixtures import *
+
+
+def test_report_plan_cache_reuse_plan_until_definition_change():
+    expression_evaluator = ExpressionEvaluator()
+    report_plan_cache = ReportPlanCache(max_size=1)
+    report_definition = ReportDefinitionFactory()
+
+    plan = report_plan_cache.get(report_definition, expression_evaluator)
+    assert report_plan_cache.get(report_definition, expression_evaluator) is plan
+
+    updated_columns = [
+        replace(column, expression=f"({column.expression})")
+        for column in report_definition.structure.columns
+    ]
+    updated_definition = replace(
+        report_definition,
+        structure=replace(report_definition.structure, columns=updated_columns),
+    )
+    updated_plan = report_plan_cache.get(updated_definition, expression_evaluator)
+    assert updated_plan is not plan
+    assert updated_plan.version != plan.version
+
+    report_plan_cache.invalidate(report_definition.id)
+    recompiled_plan = report_plan_cache.get(updated_definition, expression_evaluator)
+    assert recompiled_plan is not updated_plan
+
+    report_plan_cache.get(ReportDefinitionFactory(), expression_evaluator)
+    assert (
+        report_plan_cache.get(updated_definition, expression_evaluator)
+        is not recompiled_plan
+    )
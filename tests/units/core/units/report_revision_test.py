@@ -0,0 +1,63 @@
+import pytest
+from uuid import UUID
+from expert_dollup.shared.database_services import Repository, RecordNotFound
+from expert_dollup.core.units import *
+from expert_dollup.core.units.data_revisions import DataRevisionKey
+from expert_dollup.core.domains import *
+from tests.fixtures.mock_interface_utils import StrictInterfaceSetup, raise_async
+from tests.fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_report_revision_change_when_a_source_revision_is_bumped():
+    project_seed = make_base_project_seed()
+    project_fixture = ProjectInstanceFactory.build(project_seed)
+    project_details = project_fixture.project
+    report_definition = ReportDefinitionFactory(
+        project_definition_id=project_fixture.project_definition.id
+    )
+    keys = [
+        DataRevisionKey.project(project_details.id),
+        DataRevisionKey.project_definition(project_details.project_definition_id),
+        DataRevisionKey.labels(project_details.project_definition_id),
+        DataRevisionKey.datasheet(project_details.datasheet_id),
+        DataRevisionKey.report_rows(report_definition.id),
+    ]
+
+    def make_report_revision(revisions):
+        data_revisions = StrictInterfaceSetup(DataRevisions)
+        data_revisions.setup(lambda x: x.get_revisions(keys), returns_async=revisions)
+        return ReportRevision(data_revisions.object)
+
+    revision = await make_report_revision(["0", "a", "b", "c", "d"]).compute(
+        report_definition, project_details
+    )
+    same_revision = await make_report_revision(["0", "a", "b", "c", "d"]).compute(
+        report_definition, project_details
+    )
+    bumped_revision = await make_report_revision(["0", "a", "e", "c", "d"]).compute(
+        report_definition, project_details
+    )
+
+    assert revision == same_revision
+    assert revision != bumped_revision
+
+
+@pytest.mark.asyncio
+async def test_data_revisions_should_default_missing_revision():
+    data_revision = DataRevision(
+        id="project:1", revision=UUID("8b2d4f4c-3b8e-4b39-9d0e-2f8f1bb0c7a2")
+    )
+    data_revision_service = StrictInterfaceSetup(Repository)
+    data_revision_service.setup(
+        lambda x: x.find_by_id("project:1"), returns_async=data_revision
+    )
+    data_revision_service.setup(
+        lambda x: x.find_by_id("labels:1"), invoke=raise_async(RecordNotFound())
+    )
+
+    revisions = await DataRevisions(data_revision_service.object).get_revisions(
+        ["project:1", "labels:1"]
+    )
+
+    assert revisions == [data_revision.revision.hex, "0"]
@@ -0,0 +1,27 @@
+from expert_dollup.core.units.report_row_batch import ReportRowBatch
+
+
+def test_given_batch_buckets_should_materialize_rows_like_dict_merges():
+    base_rows = [
+        {"a": {"id": 1}, "formula": {"id": "old"}},
+        {"a": {"id": 2}, "formula": {"id": "old"}},
+    ]
+    batch = ReportRowBatch(base_rows).take([1, 0, 1])
+    batch.set_bucket("columns", [{"x": 1}, {"x": 2}, {"x": 3}])
+    batch.set_bucket("formula", [{"id": "f1"}, {"id": "f2"}, {"id": "f3"}])
+
+    assert batch.row(0)["a"] == {"id": 2}
+    assert dict(batch.row(2)) == {
+        "a": {"id": 2},
+        "formula": {"id": "f3"},
+        "columns": {"x": 3},
+    }
+
+    rows = batch.take([2, 1]).materialize()
+
+    assert rows == [
+        {**base_rows[1], "columns": {"x": 3}, "formula": {"id": "f3"}},
+        {**base_rows[0], "columns": {"x": 2}, "formula": {"id": "f2"}},
+    ]
+    assert [list(row.keys()) for row in rows] == [["a", "formula", "columns"]] * 2
+    assert base_rows[0]["formula"] == {"id": "old"}
@@ -0,0 +1,170 @@
+import pytest
+from datetime import datetime, timezone
+from uuid import UUID
+from expert_dollup.shared.database_services import Repository, Plucker
+from expert_dollup.core.object_storage import ObjectStorage
+from expert_dollup.core.units import ReportRowCache, DataRevisions
+from expert_dollup.core.units.single_flight import SingleFlight
+from expert_dollup.core.domains import *
+from tests.fixtures.mock_interface_utils import StrictInterfaceSetup, compare_per_arg
+from tests.fixtures import *
+
+
+def make_formula(project_definition_id: UUID, name: str) -> Formula:
+    return Formula(
+        id=UUID(int=len(name) + sum(map(ord, name))),
+        project_definition_id=project_definition_id,
+        attached_to_type_id=UUID(int=0),
+        name=name,
+        expression="1",
+        path=[],
+        creation_date_utc=datetime(2000, 4, 3, 1, 1, 1, tzinfo=timezone.utc),
+        dependency_graph=FormulaDependencyGraph(formulas=[], nodes=[]),
+    )
+
+
+async def stream_chunks(*chunks: list):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_build_cache_join_labels_and_keep_first_distinct_rows(logger_factory):
+    project_definition = ProjectDefinitionFactory()
+    element_a, element_b = [
+        DatasheetDefinitionElementFactory(
+            project_definition_id=project_definition.id,
+            unit_id="m",
+            is_collection=False,
+            order_index=index,
+            name=name,
+        )
+        for index, name in enumerate(["element_a", "element_b"])
+    ]
+    formula_a = make_formula(project_definition.id, "formula_a")
+    formula_b = make_formula(project_definition.id, "formula_b")
+    stage_collection = LabelCollection(
+        id=UUID(int=1), project_definition_id=project_definition.id, name="stage"
+    )
+    substage_collection = LabelCollection(
+        id=UUID(int=2),
+        project_definition_id=project_definition.id,
+        name="substage",
+        attributes_schema={
+            "element": CollectionAggregate("abstractproduct"),
+            "formula": FormulaAggregate("formula"),
+            "stage": CollectionAggregate("stage"),
+        },
+    )
+    stage = Label(
+        id=UUID(int=3),
+        label_collection_id=stage_collection.id,
+        order_index=0,
+        name="stage",
+    )
+    substages = [
+        Label(
+            id=UUID(int=10 + index),
+            label_collection_id=substage_collection.id,
+            order_index=index,
+            name=f"substage_{index}",
+            attributes={
+                "element": element.id,
+                "formula": formula.id,
+                "stage": stage.id,
+            },
+        )
+        for index, (element, formula) in enumerate(
+            [(element_a, formula_a), (element_a, formula_b), (element_b, formula_a)]
+        )
+    ]
+    report_definition = ReportDefinitionFactory(
+        project_definition_id=project_definition.id,
+        structure=ReportStructureFactory(
+            joins_cache=[
+                ReportJoin(
+                    from_object_name="abstractproduct",
+                    from_property_name="id",
+                    join_on_collection="substage",
+                    join_on_attribute="element",
+                    alias_name="substage",
+                ),
+                ReportJoin(
+                    from_object_name="substage",
+                    from_property_name="stage",
+                    join_on_collection="stage",
+                    join_on_attribute="id",
+                    alias_name="stage",
+                    same_cardinality=True,
+                ),
+            ]
+        ),
+    )
+
+    project_definition_service = StrictInterfaceSetup(Repository)
+    datasheet_definition_element_service = StrictInterfaceSetup(Repository)
+    label_collection_service = StrictInterfaceSetup(Repository)
+    label_service = StrictInterfaceSetup(Repository)
+    formula_plucker = StrictInterfaceSetup(Plucker)
+
+    project_definition_service.setup(
+        lambda x: x.find_by_id(project_definition.id),
+        returns_async=project_definition,
+    )
+    datasheet_definition_element_service.setup(
+        lambda x: x.stream_by(
+            DatasheetDefinitionElementFilter(
+                project_definition_id=project_definition.id
+            )
+        ),
+        invoke=lambda *args: stream_chunks([element_a, element_b], [element_a]),
+    )
+    label_collection_service.setup(
+        lambda x: x.find_by(
+            LabelCollectionFilter(project_definition_id=project_definition.id)
+        ),
+        returns_async=[stage_collection, substage_collection],
+    )
+    label_service.setup(
+        lambda x: x.find_by(LabelFilter(label_collection_id=stage_collection.id)),
+        returns_async=[stage],
+    )
+    label_service.setup(
+        lambda x: x.find_by(LabelFilter(label_collection_id=substage_collection.id)),
+        returns_async=substages,
+    )
+    formula_plucker.setup(
+        lambda x: x.plucks(
+            lambda _: True, lambda ids: ids == {formula_a.id, formula_b.id}
+        ),
+        returns_async=[formula_a, formula_b],
+        compare_method=compare_per_arg,
+    )
+
+    report_row_cache = ReportRowCache(
+        project_definition_service.object,
+        datasheet_definition_element_service.object,
+        label_collection_service.object,
+        label_service.object,
+        formula_plucker.object,
+        StrictInterfaceSetup(ObjectStorage).object,
+        SingleFlight(),
+        StrictInterfaceSetup(DataRevisions).object,
+        logger_factory,
+    )
+
+    rows = await report_row_cache.build_cache(report_definition)
+
+    assert rows == [
+        {
+            "abstractproduct": element.report_dict,
+            "substage": substage.report_dict,
+            "stage": stage.report_dict,
+            "formula": formula.report_dict,
+        }
+        for element, substage, formula in [
+            (element_a, substages[0], formula_a),
+            (element_a, substages[1], formula_b),
+            (element_b, substages[2], formula_a),
+        ]
+    ]
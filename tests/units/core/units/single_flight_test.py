@@ -0,0 +1,163 @@
+import pytest
+import os
+import fcntl
+from contextvars import ContextVar
+from asyncio import Event, ensure_future, gather, sleep, wait_for
+from expert_dollup.core.units.single_flight import SingleFlight, FileLease
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_share_one_build():
+    single_flight = SingleFlight()
+    release = Event()
+    builds = []
+
+    async def build():
+        builds.append(len(builds))
+        await release.wait()
+        return len(builds)
+
+    async def unblock():
+        await sleep(0)
+        release.set()
+
+    *results, _ = await gather(
+        *(single_flight.run("key", build) for _ in range(5)), unblock()
+    )
+
+    assert results == [1] * 5
+    assert len(builds) == 1
+    assert not single_flight.is_running("key")
+
+
+@pytest.mark.asyncio
+async def test_run_fresh_waits_for_running_build_then_coalesce():
+    single_flight = SingleFlight()
+    release = Event()
+    builds = []
+
+    async def build():
+        builds.append(len(builds))
+        await release.wait()
+        return len(builds)
+
+    async def unblock():
+        await sleep(0)
+        release.set()
+
+    first, *fresh_results, _ = await gather(
+        single_flight.run("key", build),
+        *(single_flight.run_fresh("key", build) for _ in range(3)),
+        unblock(),
+    )
+
+    assert first == 1
+    assert fresh_results == [2] * 3
+    assert len(builds) == 2
+
+
+@pytest.mark.asyncio
+async def test_file_lease_serialize_holders(tmp_path):
+    lease = FileLease(str(tmp_path), poll_interval=0.001)
+    holders = []
+
+    async def hold(name: str):
+        async with lease.hold("key"):
+            holders.append(name)
+            await sleep(0.01)
+            assert holders[-1] == name
+
+    await gather(hold("a"), hold("b"))
+
+    assert sorted(holders) == ["a", "b"]
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_file_lease_should_keep_lock_of_long_holder(tmp_path):
+    lease = FileLease(str(tmp_path), poll_interval=0.001)
+    events = []
+
+    async def hold(name: str, delay: float, duration: float):
+        await sleep(delay)
+
+        async with lease.hold("key"):
+            events.append(f"enter {name}")
+            await sleep(duration)
+            events.append(f"exit {name}")
+
+    await gather(hold("a", 0, 0.1), hold("b", 0.01, 0))
+
+    assert events == ["enter a", "exit a", "enter b", "exit b"]
+
+
+@pytest.mark.asyncio
+async def test_file_lease_should_be_released_when_holder_closes_lock(tmp_path):
+    lease = FileLease(str(tmp_path), poll_interval=0.001)
+
+    async with lease.hold("key"):
+        (lock_path,) = tmp_path.iterdir()
+
+    events = []
+    fd = os.open(lock_path, os.O_RDWR)
+    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    async def hold():
+        async with lease.hold("key"):
+            events.append("enter")
+
+    waiting = ensure_future(hold())
+    await sleep(0.01)
+
+    assert events == []
+
+    os.close(fd)
+    await wait_for(waiting, 1)
+
+    assert events == ["enter"]
+
+
+@pytest.mark.asyncio
+async def test_run_after_serialize_each_build_behind_running_flights():
+    single_flight = SingleFlight()
+    release = Event()
+    builds = []
+
+    def make_build(name: str):
+        async def build():
+            builds.append(name)
+            await release.wait()
+            return name
+
+        return build
+
+    async def unblock():
+        await sleep(0)
+        release.set()
+
+    results = await gather(
+        single_flight.run("key", make_build("a")),
+        single_flight.run_fresh("key", make_build("b")),
+        single_flight.run_after("key", make_build("c")),
+        single_flight.run_after("key", make_build("d")),
+        unblock(),
+    )
+
+    assert results[0:4] == ["a", "b", "c", "d"]
+    assert builds == ["a", "b", "c", "d"]
+    assert not single_flight.is_running("key")
+
+
+@pytest.mark.asyncio
+async def test_flight_should_not_inherit_caller_context():
+    single_flight = SingleFlight()
+    pinned = ContextVar("pinned", default=None)
+
+    async def build():
+        return pinned.get()
+
+    async def run_pinned():
+        pinned.set("connection")
+        return await single_flight.run("key", build)
+
+    assert await run_pinned() is None
@@ -0,0 +1,51 @@
+import pytest
+from expert_dollup.shared.database_services import Repository
+from expert_dollup.core.units import *
+from expert_dollup.core.units.report_linking import ReportLinkingCache
+from expert_dollup.core.units.data_revisions import DataRevisionKey
+from expert_dollup.core.builders import *
+from expert_dollup.core.repositories import *
+from expert_dollup.core.domains import *
+from expert_dollup.core.usecases import ProjectNodeUseCase
+from tests.fixtures.mock_interface_utils import StrictInterfaceSetup
+from tests.fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_given_removed_collection_should_only_invalidate_unit_instances():
+    fixture = ProjectInstanceFactory.build(make_base_project_seed())
+    project = fixture.project
+    node = fixture.nodes[0]
+    project_node_service = StrictInterfaceSetup(ProjectNodeRepository)
+    formula_resolver = StrictInterfaceSetup(FormulaResolver)
+    data_revisions = StrictInterfaceSetup(DataRevisions)
+
+    project_node_service.setup(
+        lambda x: x.find_one_by(ProjectNodeFilter(project_id=project.id, id=node.id)),
+        returns_async=node,
+    )
+    project_node_service.setup(lambda x: x.remove_collection(node), returns_async=None)
+    project_node_service.setup(lambda x: x.delete_by_id(node.id), returns_async=None)
+    formula_resolver.setup(
+        lambda x: x.invalidate_project_formulas(project.id), returns_async=None
+    )
+    data_revisions.setup(
+        lambda x: x.bump(DataRevisionKey.project(project.id)), returns_async=None
+    )
+
+    usecase = ProjectNodeUseCase(
+        StrictInterfaceSetup(Repository).object,
+        project_node_service.object,
+        StrictInterfaceSetup(NodeEventDispatcher).object,
+        StrictInterfaceSetup(NodeValueValidation).object,
+        StrictInterfaceSetup(ProjectNodeSliceBuilder).object,
+        StrictInterfaceSetup(ProjectTreeBuilder).object,
+        StrictInterfaceSetup(ProjectNodeMetaRepository).object,
+        ReportLinkingCache(),
+        formula_resolver.object,
+        data_revisions.object,
+    )
+
+    assert await usecase.remove_collection(project.id, node.id) == node
+    formula_resolver.assert_all_setup_called_in_order()
+    data_revisions.assert_all_setup_called_in_order()
@@ -0,0 +1,123 @@
+import pytest
+from uuid import UUID
+from expert_dollup.core.domains import *
+from expert_dollup.core.exceptions import RessourceNotFound
+from expert_dollup.core.object_storage import ObjectStorage
+from expert_dollup.infra.storages.object_cache import ObjectCache
+from expert_dollup.infra.storages.memory_cached_storage import MemoryCachedStorage
+
+project_definition_id = UUID("4303a404-1c3e-7aca-1261-9b6544363a3e")
+other_project_definition_id = UUID("941055cb-b2bc-0916-4182-4774e576c6eb")
+
+
+class CountingStorage(ObjectStorage[list, StagedFormulasKey]):
+    def __init__(self):
+        self.objects = {}
+        self.loads = 0
+
+    async def save(self, ctx: StagedFormulasKey, data: list) -> None:
+        self.objects[ctx.project_definition_id] = list(data)
+
+    async def load(self, ctx: StagedFormulasKey) -> list:
+        self.loads += 1
+
+        if not ctx.project_definition_id in self.objects:
+            raise RessourceNotFound()
+
+        return list(self.objects[ctx.project_definition_id])
+
+    def get_url(self, ctx: StagedFormulasKey) -> str:
+        return str(ctx.project_definition_id)
+
+
+class FakeClock:
+    def __init__(self):
+        self.seconds = 0.0
+
+    def __call__(self) -> float:
+        return self.seconds
+
+
+@pytest.mark.asyncio
+async def test_memory_cached_storage_serve_loads_from_memory_until_invalidated():
+    clock = FakeClock()
+    object_cache = ObjectCache(ttl_seconds=10, now=clock)
+    storage = CountingStorage()
+    storage.objects[project_definition_id] = ["a", "b"]
+    storage.objects[other_project_definition_id] = ["c"]
+    cached_storage = MemoryCachedStorage(storage, object_cache, "staged_formulas")
+    key = StagedFormulasKey(project_definition_id)
+    other_key = StagedFormulasKey(other_project_definition_id)
+
+    first = await cached_storage.load(key)
+    first.append("mutated")
+    assert await cached_storage.load(key) == ["a", "b"]
+    await cached_storage.load(other_key)
+    assert storage.loads == 2
+
+    stats = object_cache.stats("staged_formulas")
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+    assert stats.size_bytes == object_cache.size_bytes > 0
+
+    await cached_storage.save(key, ["d"])
+    assert await cached_storage.load(key) == ["d"]
+    assert storage.loads == 2
+
+    object_cache.invalidate_project_definition(project_definition_id)
+    assert await cached_storage.load(key) == ["d"]
+    assert await cached_storage.load(other_key) == ["c"]
+    assert storage.loads == 3
+
+    clock.seconds = 11
+    await cached_storage.load(other_key)
+    assert storage.loads == 4
+    assert object_cache.stats("staged_formulas").expirations == 1
+
+    with pytest.raises(RessourceNotFound):
+        await cached_storage.load(StagedFormulasKey(UUID(int=0)))
+
+
+def test_object_cache_evict_least_recently_used_entries_over_budget():
+    object_cache = ObjectCache(max_bytes=1000, ttl_seconds=10)
+    value = "x" * 400
+
+    object_cache.set("rows", "a", value)
+    object_cache.set("rows", "b", "w" * 400)
+    object_cache.get("rows", "a")
+    object_cache.set("rows", "c", "y" * 400)
+
+    assert object_cache.get("rows", "a") == value
+    assert object_cache.get("rows", "b") is None
+    assert object_cache.stats("rows").evictions == 1
+    assert object_cache.size_bytes <= 1000
+
+    object_cache.set("rows", "huge", "z" * 2000)
+    assert object_cache.get("rows", "huge") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_cached_storage_without_ttl_should_always_load_from_storage():
+    storage = CountingStorage()
+    storage.objects[project_definition_id] = ["a"]
+    object_cache = ObjectCache(ttl_seconds=0)
+    cached_storage = MemoryCachedStorage(storage, object_cache, "staged_formulas")
+    key = StagedFormulasKey(project_definition_id)
+
+    await cached_storage.load(key)
+    await cached_storage.load(key)
+
+    assert storage.loads == 2
+    assert object_cache.size_bytes == 0
+
+
+def test_object_cache_should_report_stats_of_every_namespace():
+    object_cache = ObjectCache()
+    object_cache.set("rows", "a", ["x"])
+    object_cache.get("rows", "a")
+    object_cache.get("staged_formulas", "b")
+
+    stats = object_cache.all_stats()
+
+    assert list(stats.keys()) == ["rows", "staged_formulas"]
+    assert (stats["rows"].hits, stats["rows"].entries) == (1, 1)
+    assert stats["staged_formulas"].misses == 1
@@ -0,0 +1,72 @@
+import gzip
+import pytest
+from uuid import UUID
+from decimal import Decimal
+from expert_dollup.core.domains import *
+from expert_dollup.infra.expert_dollup_storage import ReportRowDictDao
+from expert_dollup.infra.storages.report_definition_row_cache_cloud_object import (
+    ReportDefinitionRowCacheCloudObject,
+    RootRowsDao,
+    FORMAT_MAGIC,
+)
+from .unit_instance_cloud_object_test import InMemoryStorage
+
+element_id = UUID("941055cb-b2bc-0916-4182-4774e576c6eb")
+label_id = UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d")
+tag_id = UUID("6cb8eec4-0e80-2926-8813-79a4aca227cb")
+key = ReportRowKey(
+    project_definition_id=UUID("4303a404-1c3e-7aca-1261-9b6544363a3e"),
+    report_definition_id=UUID("f1f1e0ff-2344-48bc-e757-8c9dcd3c671e"),
+)
+rows = [
+    {
+        "abstractproduct": {
+            "id": element_id,
+            "unit_id": "m2",
+            "is_collection": False,
+            "order_index": 3,
+            "tags": [tag_id, label_id],
+        },
+        "substage": {"id": label_id, "price": Decimal("10.25"), "note": None},
+    },
+    {
+        "abstractproduct": {
+            "id": label_id,
+            "unit_id": "m2",
+            "is_collection": True,
+            "order_index": -2,
+            "tags": [],
+        },
+        "substage": {"id": element_id, "price": Decimal("10.25")},
+    },
+]
+
+
+@pytest.mark.asyncio
+async def test_given_report_rows_should_round_trip_through_binary_format():
+    storage = InMemoryStorage()
+    cloud_object = ReportDefinitionRowCacheCloudObject(storage, None)
+
+    await cloud_object.save(key, rows)
+    data = gzip.decompress(storage.blobs[cloud_object.get_url(key)])
+    loaded = await cloud_object.load(key)
+
+    assert data[0 : len(FORMAT_MAGIC)] == FORMAT_MAGIC
+    assert loaded == rows
+    assert list(loaded[1]["substage"].keys()) == ["id", "price"]
+
+
+@pytest.mark.asyncio
+async def test_given_legacy_json_blob_should_load_rows(mapper):
+    storage = InMemoryStorage()
+    cloud_object = ReportDefinitionRowCacheCloudObject(storage, mapper)
+    legacy_rows = [
+        {name: dict(bucket) for name, bucket in row.items()} for row in rows
+    ]
+    del legacy_rows[0]["substage"]["note"]
+    daos = mapper.map_many(legacy_rows, ReportRowDictDao, ReportRowDict)
+    storage.blobs[cloud_object.get_url(key)] = (
+        RootRowsDao(__root__=daos).json().encode("utf8")
+    )
+
+    assert await cloud_object.load(key) == legacy_rows
@@ -0,0 +1,34 @@
+import gzip
+import pytest
+from expert_dollup.core.domains import *
+from expert_dollup.core.exceptions import RessourceNotFound
+from expert_dollup.core.units import FormulaResolver
+from expert_dollup.shared.database_services import JsonSerializer
+from expert_dollup.infra.storages.staged_formula_cache import StagedFormulaCache
+from .unit_instance_cloud_object_test import InMemoryStorage
+from tests.fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_given_staged_formulas_should_round_trip_without_mapper():
+    project_fixture = ProjectInstanceFactory.build(make_base_project_seed())
+    staged_formulas = FormulaResolver.stage_formulas(project_fixture.formulas)
+    storage = InMemoryStorage()
+    cache = StagedFormulaCache(storage, None)
+    key = StagedFormulasKey(project_fixture.project_definition.id)
+
+    await cache.save(key, staged_formulas)
+    loaded = await cache.load(key)
+
+    assert JsonSerializer.encode(loaded) == JsonSerializer.encode(staged_formulas)
+
+
+@pytest.mark.asyncio
+async def test_given_legacy_jsonl_blob_should_be_reported_missing():
+    storage = InMemoryStorage()
+    cache = StagedFormulaCache(storage, None)
+    key = StagedFormulasKey(project_definition_id=ProjectDefinitionFactory().id)
+    storage.blobs[cache.get_url(key)] = gzip.compress(b'{"name": "legacy"}\n')
+
+    with pytest.raises(RessourceNotFound):
+        await cache.load(key)
@@ -0,0 +1,115 @@
+import gzip
+import struct
+import pytest
+from uuid import UUID
+from decimal import Decimal
+from expert_dollup.core.domains import *
+from expert_dollup.infra.expert_dollup_storage import ExpertDollupStorage
+from expert_dollup.infra.storages.unit_instance_cloud_object import (
+    UnitInstanceCloudObject,
+)
+
+project_id = UUID("4303a404-1c3e-7aca-1261-9b6544363a3e")
+unit_instances = [
+    UnitInstance(
+        formula_id=None,
+        node_id=UUID("941055cb-b2bc-0916-4182-4774e576c6eb"),
+        path=[
+            UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d"),
+            UUID("6cb8eec4-0e80-2926-8813-79a4aca227cb"),
+        ],
+        name="fieldA",
+        calculation_details="",
+        result="text",
+    ),
+    UnitInstance(
+        formula_id=UUID("f1f1e0ff-2344-48bc-e757-8c9dcd3c671e"),
+        node_id=UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d"),
+        path=[],
+        name="formulaA",
+        calculation_details="\n\n<final_result, 10.5> = 10.5",
+        result=Decimal("10.5"),
+    ),
+]
+
+
+class InMemoryStorage(ExpertDollupStorage):
+    def __init__(self):
+        self.blobs = {}
+
+    async def upload_binary(self, path: str, data: bytes) -> None:
+        self.blobs[path] = data
+
+    async def download_binary(self, path: str) -> bytes:
+        return self.blobs[path]
+
+
+def dump_v1(instances) -> bytes:
+    null_uuid = UUID(int=0)
+    chunks = [struct.pack("H", len(instances))]
+
+    for instance in instances:
+        chunks.append((instance.formula_id or null_uuid).bytes)
+        chunks.append(instance.node_id.bytes)
+        chunks.extend(
+            (instance.path[i] if i < len(instance.path) else null_uuid).bytes
+            for i in range(0, 5)
+        )
+        name = instance.name.encode("utf8")
+        chunks.append(struct.pack("H", len(name)) + name)
+
+        if not instance.formula_id is None:
+            details = instance.calculation_details.encode("utf8")
+            chunks.append(struct.pack("L", len(details)) + details)
+
+        result = str(instance.result).encode("utf8")
+        value_type = "D" if isinstance(instance.result, Decimal) else "S"
+        chunks.append(struct.pack("B", ord(value_type)))
+        chunks.append(struct.pack("L", len(result)) + result)
+
+    return gzip.compress(b"".join(chunks))
+
+
+@pytest.mark.asyncio
+async def test_given_unit_instances_should_round_trip_through_v2_format():
+    storage = InMemoryStorage()
+    cloud_object = UnitInstanceCloudObject(storage)
+    key = UnitInstanceCacheKey(project_id=project_id)
+
+    await cloud_object.save(key, UnitInstanceCache(unit_instances))
+    loaded = await cloud_object.load(key)
+
+    assert gzip.decompress(storage.blobs[cloud_object.get_url(key)])[0:4] == b"EDUI"
+    assert loaded == unit_instances
+
+
+@pytest.mark.asyncio
+async def test_given_v1_blob_should_still_be_readable():
+    storage = InMemoryStorage()
+    cloud_object = UnitInstanceCloudObject(storage)
+    key = UnitInstanceCacheKey(project_id=project_id)
+    storage.blobs[cloud_object.get_url(key)] = dump_v1(unit_instances)
+
+    loaded = await cloud_object.load(key)
+
+    assert loaded == unit_instances
+
+
+@pytest.mark.asyncio
+async def test_given_untraced_formula_should_keep_missing_calculation_details():
+    storage = InMemoryStorage()
+    cloud_object = UnitInstanceCloudObject(storage)
+    key = UnitInstanceCacheKey(project_id=project_id)
+    untraced = UnitInstance(
+        formula_id=UUID("f1f1e0ff-2344-48bc-e757-8c9dcd3c671e"),
+        node_id=UUID("3e9245a2-855a-eca6-ebba-ce294ba5575d"),
+        path=[],
+        name="formulaA",
+        calculation_details=None,
+        result=Decimal("10.5"),
+    )
+
+    await cloud_object.save(key, UnitInstanceCache([unit_instances[0], untraced]))
+    loaded = await cloud_object.load(key)
+
+    assert loaded == [unit_instances[0], untraced]
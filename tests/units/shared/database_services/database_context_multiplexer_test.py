@@ -0,0 +1,45 @@
+import pytest
+from expert_dollup.shared.database_services import DatabaseContextMultiplexer
+
+
+class FakeDatabase:
+    def __init__(self, name: str, events: list):
+        self.name = name
+        self.events = events
+
+    async def transaction(self, callback):
+        self.events.append(f"begin {self.name}")
+        result = await callback()
+        self.events.append(f"commit {self.name}")
+
+        return result
+
+
+class FakeInjector:
+    def __init__(self, databases: dict):
+        self.databases = databases
+
+    def get(self, name: str):
+        return self.databases[name]
+
+
+@pytest.mark.asyncio
+async def test_transaction_should_run_callback_within_every_database():
+    events = []
+    injector = FakeInjector(
+        {name: FakeDatabase(name, events) for name in ["auth", "expert_dollup"]}
+    )
+    db_context = DatabaseContextMultiplexer(injector, ["auth", "expert_dollup"])
+
+    async def write():
+        events.append("write")
+        return 42
+
+    assert await db_context.transaction(write) == 42
+    assert events == [
+        "begin auth",
+        "begin expert_dollup",
+        "write",
+        "commit expert_dollup",
+        "commit auth",
+    ]
@@ -0,0 +1,84 @@
+import pytest
+from contextlib import asynccontextmanager
+from expert_dollup.shared.database_services.database_adapters.mongo_adapter import (
+    MongoConnection,
+)
+
+
+class FakeSession:
+    def __init__(self, events: list):
+        self.events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.events.append("end session")
+
+    @asynccontextmanager
+    async def start_transaction(self):
+        self.events.append("begin")
+        yield
+        self.events.append("commit")
+
+
+class FakeAdmin:
+    def __init__(self, hello: dict, events: list):
+        self.hello = hello
+        self.events = events
+
+    async def command(self, name: str):
+        self.events.append(name)
+        return self.hello
+
+
+class FakeClient:
+    def __init__(self, hello: dict):
+        self.events = []
+        self.admin = FakeAdmin(hello, self.events)
+
+    async def start_session(self):
+        self.events.append("start session")
+        return FakeSession(self.events)
+
+
+def make_connection(hello: dict) -> MongoConnection:
+    connection = MongoConnection("mongodb://localhost/db")
+    connection._client = FakeClient(hello)
+
+    return connection
+
+
+@pytest.mark.asyncio
+async def test_given_standalone_server_should_run_without_transaction():
+    connection = make_connection({"ismaster": True})
+
+    async def write():
+        connection._client.events.append(connection.session)
+        return 42
+
+    assert await connection.transaction(write) == 42
+    assert await connection.transaction(write) == 42
+    assert connection._client.events == ["ismaster", None, None]
+
+
+@pytest.mark.asyncio
+async def test_given_replica_set_should_pin_session_in_transaction():
+    connection = make_connection({"ismaster": True, "setName": "rs0"})
+
+    async def write():
+        connection._client.events.append(connection.session)
+        return 42
+
+    assert await connection.transaction(write) == 42
+    session = connection._client.events[3]
+    assert isinstance(session, FakeSession)
+    assert connection._client.events == [
+        "ismaster",
+        "start session",
+        "begin",
+        session,
+        "commit",
+        "end session",
+    ]
+    assert connection.session is None
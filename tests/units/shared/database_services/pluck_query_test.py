@@ -0,0 +1,49 @@
+import pytest
+from asyncio import sleep
+from uuid import UUID
+from expert_dollup.shared.database_services import PluckQuery
+from expert_dollup.shared.database_services.db_agnotist_query_builder import (
+    DbAgnotistQueryBuilder,
+)
+
+
+class FakePluckRepository:
+    pluck_batch_size = 2
+    pluck_concurrency = 2
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.queries = []
+
+    def get_builder(self):
+        return DbAgnotistQueryBuilder()
+
+    def unpack_query(self, query_filter: dict) -> dict:
+        return query_filter
+
+    async def find_by(self, query: DbAgnotistQueryBuilder):
+        self.queries.append(query._wheres)
+        self.running = self.running + 1
+        self.max_running = max(self.max_running, self.running)
+        _, _, ids = query._wheres[-1]
+        await sleep(0.001 * (10 - ids[0].int))
+        self.running = self.running - 1
+
+        return [id.int for id in ids]
+
+
+@pytest.mark.asyncio
+async def test_given_many_ids_should_pluck_batches_concurrently_in_order():
+    repository = FakePluckRepository()
+    plucker = PluckQuery(repository)
+    ids = [UUID(int=index) for index in range(1, 8)]
+
+    results = await plucker.pluck_subressources(
+        {"project_id": 1}, lambda ids_batch: {"id": ids_batch}, ids
+    )
+
+    assert results == list(range(1, 8))
+    assert len(repository.queries) == 4
+    assert repository.queries[0] == [("project_id", "==", 1), ("id", "in", ids[0:2])]
+    assert repository.max_running == 2
@@ -0,0 +1,60 @@
+from uuid import UUID
+from sqlalchemy import MetaData, Table, Column, String, Integer
+from expert_dollup.shared.database_services.database_adapters.postgres_adapter import (
+    QueryCompiler,
+    UUIDWrap,
+)
+
+table = Table(
+    "project_node",
+    MetaData(),
+    Column("id", UUIDWrap(), primary_key=True),
+    Column("path", String),
+    Column("level", Integer),
+    Column("label", String),
+)
+
+
+def test_given_same_query_shape_should_reuse_statement_and_bind_values():
+    compiler = QueryCompiler()
+
+    first_query, first_params = compiler.compile_select(
+        table,
+        [
+            ("id", "in", {UUID(int=1)}),
+            ("path", "startwiths", "a"),
+            ("label", "==", None),
+        ],
+        orders=[("level", "asc")],
+        limit=10,
+    )
+    second_query, second_params = compiler.compile_select(
+        table,
+        [
+            ("id", "in", [UUID(int=2)]),
+            ("path", "startwiths", "b"),
+            ("label", "==", None),
+        ],
+        orders=[("level", "asc")],
+        limit=10,
+    )
+
+    assert first_query is second_query
+    assert first_params == {"where_0": [UUID(int=1)], "where_1": "a%"}
+    assert second_params == {"where_0": [UUID(int=2)], "where_1": "b%"}
+    assert "project_node.label IS NULL" in str(first_query)
+
+
+def test_given_full_cache_should_evict_least_recently_used_shape():
+    compiler = QueryCompiler(cache_size=2)
+    by_id = lambda: compiler.compile_select(table, [("id", "==", UUID(int=1))])[0]
+    by_level = lambda: compiler.compile_select(table, [("level", "<", 2)])[0]
+    count = lambda: compiler.compile_count(table, [])[0]
+
+    first_by_id = by_id()
+    first_by_level = by_level()
+    by_id()
+    count()
+
+    assert by_id() is first_by_id
+    assert not by_level() is first_by_level